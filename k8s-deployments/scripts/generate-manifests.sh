@@ -25,6 +25,16 @@ MANIFEST_DIR="${PROJECT_ROOT}/manifests"
 DETECTED_ENV=$(git -C "${PROJECT_ROOT}" rev-parse --abbrev-ref HEAD 2>/dev/null || echo "")
 ENVIRONMENT=${1:-${DETECTED_ENV:-dev}}
 
+# Single-export generator (generate-manifests.py, shipped with the demo
+# tooling): two cue exports and one yq pass for the whole environment instead
+# of per app, writing the same files. Used when GENERATE_MANIFESTS_PY points
+# to it; GENERATE_MANIFESTS_INCREMENTAL=1 only regenerates apps whose inputs
+# changed.
+if [[ -n "${GENERATE_MANIFESTS_PY:-}" && -f "${GENERATE_MANIFESTS_PY}" ]] && command -v python3 &> /dev/null; then
+    exec python3 "${GENERATE_MANIFESTS_PY}" "${ENVIRONMENT}" --project-root "${PROJECT_ROOT}" \
+        ${GENERATE_MANIFESTS_INCREMENTAL:+--incremental}
+fi
+
 # Colors
 RED='\033[0;31m'
 GREEN='\033[0;32m'
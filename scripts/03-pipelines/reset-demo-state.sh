@@ -43,6 +43,7 @@ log_step() { echo -e "\n${BLUE}[->]${NC} $*"; }
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 REPO_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
 BASELINES_DIR="$SCRIPT_DIR/baselines"
+CUE_EDIT="$REPO_ROOT/scripts/demo/lib/cue-edit.py"
 
 # Parse command-line arguments
 BRANCHES="dev,stage,prod"  # Default: all branches
@@ -515,6 +516,13 @@ convert_stage_image_to_prod_format() {
     echo "${registry}:${base_version}-${git_hash}"
 }
 
+# Print exampleApp's image from env.cue content on stdin (empty if not set),
+# read from the file's structure by cue-edit.py without evaluating the module
+env_cue_example_app_image() {
+    local env="$1"
+    python3 "$CUE_EDIT" get - "$env" exampleApp appConfig.deployment.image 2>/dev/null || true
+}
+
 # Extract image tags from current env.cue on a branch
 # Note: If EXAMPLE_APP_IMAGE_OVERRIDE is set, it will be used instead of
 # extracting from the branch. This handles version alignment (e.g., when
@@ -530,17 +538,7 @@ extract_images_from_env_cue() {
     else
         local content=$("$gitlab_cli" file get "$DEPLOYMENTS_REPO_PATH" env.cue --ref "$env" 2>/dev/null)
 
-        # Extract exampleApp image - look for image in the exampleApp block
-        # Pattern: after "exampleApp:" find the first "image:" line
-        EXAMPLE_APP_IMAGE=$(echo "$content" | awk '
-            /exampleApp:.*\{/ { in_example=1 }
-            in_example && /image:/ {
-                gsub(/.*image:[[:space:]]*"/, "")
-                gsub(/".*/, "")
-                print
-                exit
-            }
-        ')
+        EXAMPLE_APP_IMAGE=$(echo "$content" | env_cue_example_app_image "$env")
 
         # Fallback to seed placeholder if extraction failed (first run before any CI/CD build)
         if [[ -z "$EXAMPLE_APP_IMAGE" ]]; then
@@ -764,27 +762,11 @@ reset_cue_config() {
 
         # Extract stage image
         local stage_content=$("$gitlab_cli" file get "$DEPLOYMENTS_REPO_PATH" env.cue --ref "stage" 2>/dev/null)
-        local stage_image=$(echo "$stage_content" | awk '
-            /exampleApp:.*\{/ { in_example=1 }
-            in_example && /image:/ {
-                gsub(/.*image:[[:space:]]*"/, "")
-                gsub(/".*/, "")
-                print
-                exit
-            }
-        ')
+        local stage_image=$(echo "$stage_content" | env_cue_example_app_image "stage")
 
         # Extract prod image
         local prod_content=$("$gitlab_cli" file get "$DEPLOYMENTS_REPO_PATH" env.cue --ref "prod" 2>/dev/null)
-        local prod_image=$(echo "$prod_content" | awk '
-            /exampleApp:.*\{/ { in_example=1 }
-            in_example && /image:/ {
-                gsub(/.*image:[[:space:]]*"/, "")
-                gsub(/".*/, "")
-                print
-                exit
-            }
-        ')
+        local prod_image=$(echo "$prod_content" | env_cue_example_app_image "prod")
 
         local stage_hash=$(extract_git_hash_from_image "$stage_image")
         local prod_hash=$(extract_git_hash_from_image "$prod_image")
@@ -26,6 +26,7 @@
 # Prerequisites:
 # - Environment branches (dev/stage/prod) exist in GitLab
 # - Pipeline infrastructure running (Jenkins, ArgoCD)
+# - python3 with PyYAML (pip install pyyaml), to check the MR's manifests offline
 # - Run from deployment-pipeline root
 
 set -euo pipefail
@@ -90,6 +91,13 @@ if ! kubectl cluster-info &>/dev/null; then
 fi
 demo_verify "Connected to Kubernetes cluster"
 
+demo_action "Checking PyYAML (offline manifest assertions)..."
+if ! python3 -c 'import yaml' &>/dev/null; then
+    demo_fail "PyYAML not installed (pip install pyyaml)"
+    exit 1
+fi
+demo_verify "PyYAML available"
+
 demo_action "Checking ArgoCD applications..."
 for env in "$TARGET_ENV" "${OTHER_ENVS[@]}"; do
     if kubectl get application "${DEMO_APP}-${env}" -n "${ARGOCD_NAMESPACE}" &>/dev/null; then
@@ -240,7 +248,23 @@ wait_for_mr_pipeline "$mr_iid" || exit 1
 # Verify MR contains expected changes
 demo_action "Verifying MR contains expected changes..."
 assert_mr_contains_diff "$mr_iid" "env.cue" "$DEMO_KEY" || exit 1
-assert_mr_contains_diff "$mr_iid" "manifests/.*\\.yaml" "$DEMO_KEY" || exit 1
+
+# Check the manifest Jenkins regenerated offline, before anything is merged
+# (assert_all answers from the files in ASSERT_MANIFEST_DIR, not the cluster)
+demo_action "Checking the regenerated manifest on $FEATURE_BRANCH..."
+MANIFEST_PATH="manifests/${DEMO_APP_CUE}/${DEMO_APP_CUE}.yaml"
+MANIFEST_DIR=$(mktemp -d)
+if ! get_file_from_branch "$FEATURE_BRANCH" "$MANIFEST_PATH" > "$MANIFEST_DIR/${DEMO_APP_CUE}.yaml"; then
+    rm -rf "$MANIFEST_DIR"
+    demo_fail "Could not fetch $MANIFEST_PATH from $FEATURE_BRANCH"
+    exit 1
+fi
+assert_add configmap_entry "$(get_namespace "$TARGET_ENV")" "$DEMO_CONFIGMAP" "$DEMO_KEY" "$DEMO_VALUE"
+manifest_status=0
+ASSERT_MANIFEST_DIR="$MANIFEST_DIR" ASSERT_DEFAULT_NAMESPACE="$(get_namespace "$TARGET_ENV")" assert_all \
+    || manifest_status=1
+rm -rf "$MANIFEST_DIR"
+[[ $manifest_status -eq 0 ]] || exit 1
 demo_verify "MR contains CUE change and regenerated manifests"
 
 # Capture ArgoCD baseline before merge
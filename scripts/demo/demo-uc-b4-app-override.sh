@@ -432,17 +432,17 @@ demo_step 8 "Final Verification - Override Only Affects Prod"
 
 demo_info "Verifying final state across all environments..."
 
+demo_action "Checking dev, stage and prod..."
 # Dev should still have app default
-demo_action "Checking dev..."
-assert_configmap_entry "$(get_namespace "dev")" "$DEMO_CONFIGMAP" "$DEMO_KEY" "$APP_DEFAULT_VALUE" || exit 1
+assert_add configmap_entry "$(get_namespace "dev")" "$DEMO_CONFIGMAP" "$DEMO_KEY" "$APP_DEFAULT_VALUE"
 
 # Stage should still have app default
-demo_action "Checking stage..."
-assert_configmap_entry "$(get_namespace "stage")" "$DEMO_CONFIGMAP" "$DEMO_KEY" "$APP_DEFAULT_VALUE" || exit 1
+assert_add configmap_entry "$(get_namespace "stage")" "$DEMO_CONFIGMAP" "$DEMO_KEY" "$APP_DEFAULT_VALUE"
 
 # Prod should have the override
-demo_action "Checking prod..."
-assert_configmap_entry "$(get_namespace "prod")" "$DEMO_CONFIGMAP" "$DEMO_KEY" "$PROD_OVERRIDE_VALUE" || exit 1
+assert_add configmap_entry "$(get_namespace "prod")" "$DEMO_CONFIGMAP" "$DEMO_KEY" "$PROD_OVERRIDE_VALUE"
+
+assert_all || exit 1
 
 demo_verify "VERIFIED: Override hierarchy works correctly!"
 demo_info "  - dev:   $DEMO_KEY = $APP_DEFAULT_VALUE (app default)"
@@ -442,17 +442,17 @@ demo_step 8 "Final Verification - Override Only Affects Prod"
 
 demo_info "Verifying final state across all environments..."
 
+demo_action "Checking dev, stage and prod..."
 # Dev should still have app default
-demo_action "Checking dev..."
-assert_readiness_probe_timeout "$(get_namespace "dev")" "$DEMO_APP" "$APP_DEFAULT_TIMEOUT" || exit 1
+assert_add readiness_probe_timeout "$(get_namespace "dev")" "$DEMO_APP" "$APP_DEFAULT_TIMEOUT"
 
 # Stage should still have app default
-demo_action "Checking stage..."
-assert_readiness_probe_timeout "$(get_namespace "stage")" "$DEMO_APP" "$APP_DEFAULT_TIMEOUT" || exit 1
+assert_add readiness_probe_timeout "$(get_namespace "stage")" "$DEMO_APP" "$APP_DEFAULT_TIMEOUT"
 
 # Prod should have the override
-demo_action "Checking prod..."
-assert_readiness_probe_timeout "$(get_namespace "prod")" "$DEMO_APP" "$PROD_OVERRIDE_TIMEOUT" || exit 1
+assert_add readiness_probe_timeout "$(get_namespace "prod")" "$DEMO_APP" "$PROD_OVERRIDE_TIMEOUT"
+
+assert_all || exit 1
 
 demo_verify "VERIFIED: Override hierarchy works correctly!"
 demo_info "  - dev:   readinessProbe.timeoutSeconds = $APP_DEFAULT_TIMEOUT (app default)"
@@ -435,16 +435,16 @@ demo_info "Verifying final state across all environments..."
 # With #MergeEnvVars, env vars are merged by name and later values win
 # So dev should have LOG_LEVEL=DEBUG (override), stage/prod have LOG_LEVEL=INFO
 
-demo_action "Checking dev env var (override should work)..."
-assert_deployment_env_var "$(get_namespace "dev")" "$DEMO_APP" "$ENV_VAR_NAME" "$DEV_OVERRIDE_VALUE" || exit 1
+demo_action "Checking dev, stage and prod..."
+assert_add deployment_env_var "$(get_namespace "dev")" "$DEMO_APP" "$ENV_VAR_NAME" "$DEV_OVERRIDE_VALUE"
 
 # Stage should have only app default
-demo_action "Checking stage (should have app default)..."
-assert_deployment_env_var "$(get_namespace "stage")" "$DEMO_APP" "$ENV_VAR_NAME" "$APP_DEFAULT_VALUE" || exit 1
+assert_add deployment_env_var "$(get_namespace "stage")" "$DEMO_APP" "$ENV_VAR_NAME" "$APP_DEFAULT_VALUE"
 
 # Prod should have only app default
-demo_action "Checking prod (should have app default)..."
-assert_deployment_env_var "$(get_namespace "prod")" "$DEMO_APP" "$ENV_VAR_NAME" "$APP_DEFAULT_VALUE" || exit 1
+assert_add deployment_env_var "$(get_namespace "prod")" "$DEMO_APP" "$ENV_VAR_NAME" "$APP_DEFAULT_VALUE"
+
+assert_all || exit 1
 
 demo_verify "Override works correctly!"
 demo_info "  - dev:   $ENV_VAR_NAME = $DEV_OVERRIDE_VALUE (override applied)"
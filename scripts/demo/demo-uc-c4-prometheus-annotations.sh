@@ -58,7 +58,7 @@ add_prometheus_annotations() {
     demo_action "Adding Prometheus scrape-interval annotation using cue-edit.py..."
 
     # Add prometheus.io/scrape-interval annotation
-    if ! python3 "${CUE_EDIT}" platform-annotation add "$DEMO_ANNOTATION_KEY" "$DEMO_ANNOTATION_VALUE"; then
+    if ! demo_cue_edit platform-annotation add "$DEMO_ANNOTATION_KEY" "$DEMO_ANNOTATION_VALUE"; then
         demo_fail "Failed to add $DEMO_ANNOTATION_KEY annotation"
         return 1
     fi
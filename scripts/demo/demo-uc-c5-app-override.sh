@@ -52,7 +52,7 @@ CUE_EDIT="${SCRIPT_DIR}/lib/cue-edit.py"
 add_app_annotation_override() {
     demo_action "Adding app-level annotation override to postgres.cue..."
 
-    if ! python3 "${CUE_EDIT}" app-annotation add \
+    if ! demo_cue_edit app-annotation add \
         templates/apps/postgres.cue postgres \
         "$DEMO_ANNOTATION_KEY" "$APP_OVERRIDE_VALUE"; then
         demo_fail "Failed to add app annotation override"
@@ -57,7 +57,7 @@ CUE_EDIT="${SCRIPT_DIR}/lib/cue-edit.py"
 add_platform_label() {
     demo_action "Adding platform label using cue-edit.py..."
 
-    if ! python3 "${CUE_EDIT}" platform-label add "$DEMO_LABEL_KEY" "$PLATFORM_LABEL_VALUE"; then
+    if ! demo_cue_edit platform-label add "$DEMO_LABEL_KEY" "$PLATFORM_LABEL_VALUE"; then
         demo_fail "Failed to add platform label"
         return 1
     fi
@@ -260,7 +260,7 @@ TEMP_ENV_CUE="${K8S_DEPLOYMENTS_DIR}/.tmp-env-cue-$$.cue"
 echo "$PROD_ENV_CUE" > "$TEMP_ENV_CUE"
 
 # Use cue-edit.py to add the label
-if ! python3 "${CUE_EDIT}" env-label add "$TEMP_ENV_CUE" "prod" "$DEMO_APP_CUE" "$DEMO_LABEL_KEY" "$PROD_OVERRIDE_VALUE"; then
+if ! demo_cue_edit env-label add "$TEMP_ENV_CUE" "prod" "$DEMO_APP_CUE" "$DEMO_LABEL_KEY" "$PROD_OVERRIDE_VALUE"; then
     demo_fail "Failed to add label override to env.cue"
     rm -f "$TEMP_ENV_CUE"
     exit 1
@@ -323,17 +323,17 @@ demo_step 7 "Final Verification - Override Only Affects Prod"
 
 demo_info "Verifying final state across all environments..."
 
+demo_action "Checking dev, stage and prod..."
 # Dev should still have platform default
-demo_action "Checking dev..."
-assert_pod_label_equals "$(get_namespace dev)" "$DEMO_APP" "$DEMO_LABEL_KEY" "$PLATFORM_LABEL_VALUE" || exit 1
+assert_add pod_label_equals "$(get_namespace dev)" "$DEMO_APP" "$DEMO_LABEL_KEY" "$PLATFORM_LABEL_VALUE"
 
 # Stage should still have platform default
-demo_action "Checking stage..."
-assert_pod_label_equals "$(get_namespace stage)" "$DEMO_APP" "$DEMO_LABEL_KEY" "$PLATFORM_LABEL_VALUE" || exit 1
+assert_add pod_label_equals "$(get_namespace stage)" "$DEMO_APP" "$DEMO_LABEL_KEY" "$PLATFORM_LABEL_VALUE"
 
 # Prod should have the override
-demo_action "Checking prod..."
-assert_pod_label_equals "$(get_namespace prod)" "$DEMO_APP" "$DEMO_LABEL_KEY" "$PROD_OVERRIDE_VALUE" || exit 1
+assert_add pod_label_equals "$(get_namespace prod)" "$DEMO_APP" "$DEMO_LABEL_KEY" "$PROD_OVERRIDE_VALUE"
+
+assert_all || exit 1
 
 demo_verify "VERIFIED: Environment isolation works correctly!"
 demo_info "  - dev:   $DEMO_LABEL_KEY = $PLATFORM_LABEL_VALUE (platform default)"
@@ -164,7 +164,7 @@ demo_info "Scenario: API timeouts in prod, need to increase timeout immediately"
 TEMP_CUE="${K8S_DEPLOYMENTS_DIR}/.temp-env-cue.cue"
 echo "$PROD_ENV_CUE" > "$TEMP_CUE"
 
-python3 "${CUE_EDIT}" env-configmap add "$TEMP_CUE" "$TARGET_ENV" "$DEMO_APP_CUE" \
+demo_cue_edit env-configmap add "$TEMP_CUE" "$TARGET_ENV" "$DEMO_APP_CUE" \
     "$DEMO_KEY" "$DEMO_VALUE"
 
 MODIFIED_ENV_CUE=$(cat "$TEMP_CUE")
@@ -336,7 +336,7 @@ HOTFIX_ENV_CUE=$(get_file_from_branch "$TARGET_ENV" "env.cue")
 TEMP_CUE="${K8S_DEPLOYMENTS_DIR}/.temp-env-cue.cue"
 echo "$HOTFIX_ENV_CUE" > "$TEMP_CUE"
 
-python3 "${CUE_EDIT}" env-configmap remove "$TEMP_CUE" "$TARGET_ENV" "$DEMO_APP_CUE" "$DEMO_KEY"
+demo_cue_edit env-configmap remove "$TEMP_CUE" "$TARGET_ENV" "$DEMO_APP_CUE" "$DEMO_KEY"
 
 REVERTED_ENV_CUE=$(cat "$TEMP_CUE")
 rm -f "$TEMP_CUE"
@@ -154,7 +154,7 @@ demo_action "Adding ConfigMap entry..."
 TEMP_CUE="${K8S_DEPLOYMENTS_DIR}/.temp-env-cue.cue"
 echo "$STAGE_ENV_CUE" > "$TEMP_CUE"
 
-python3 "${CUE_EDIT}" env-configmap add "$TEMP_CUE" "$TARGET_ENV" "exampleApp" \
+demo_cue_edit env-configmap add "$TEMP_CUE" "$TARGET_ENV" "exampleApp" \
     "$BAD_CONFIGMAP_KEY" "$BAD_CONFIGMAP_VALUE"
 
 MODIFIED_ENV_CUE=$(cat "$TEMP_CUE")
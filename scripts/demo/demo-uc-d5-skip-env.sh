@@ -164,7 +164,7 @@ demo_action "Adding ConfigMap entry: $DEMO_KEY=$DEMO_VALUE"
 TEMP_CUE="${K8S_DEPLOYMENTS_DIR}/.temp-env-cue.cue"
 echo "$DEV_ENV_CUE" > "$TEMP_CUE"
 
-python3 "${CUE_EDIT}" env-configmap add "$TEMP_CUE" "$SOURCE_ENV" "$DEMO_APP_CUE" \
+demo_cue_edit env-configmap add "$TEMP_CUE" "$SOURCE_ENV" "$DEMO_APP_CUE" \
     "$DEMO_KEY" "$DEMO_VALUE"
 
 MODIFIED_DEV_CUE=$(cat "$TEMP_CUE")
@@ -272,7 +272,7 @@ demo_action "Adding ConfigMap entry to prod: $DEMO_KEY=$DEMO_VALUE"
 TEMP_CUE="${K8S_DEPLOYMENTS_DIR}/.temp-env-cue.cue"
 echo "$PROD_ENV_CUE" > "$TEMP_CUE"
 
-python3 "${CUE_EDIT}" env-configmap add "$TEMP_CUE" "$TARGET_ENV" "$DEMO_APP_CUE" \
+demo_cue_edit env-configmap add "$TEMP_CUE" "$TARGET_ENV" "$DEMO_APP_CUE" \
     "$DEMO_KEY" "$DEMO_VALUE"
 
 MODIFIED_PROD_CUE=$(cat "$TEMP_CUE")
@@ -442,7 +442,7 @@ demo_action "Cleaning up $SOURCE_ENV..."
 DEV_CLEANUP_CUE=$(get_file_from_branch "$SOURCE_ENV" "env.cue")
 TEMP_CUE="${K8S_DEPLOYMENTS_DIR}/.temp-env-cue.cue"
 echo "$DEV_CLEANUP_CUE" > "$TEMP_CUE"
-python3 "${CUE_EDIT}" env-configmap remove "$TEMP_CUE" "$SOURCE_ENV" "$DEMO_APP_CUE" "$DEMO_KEY"
+demo_cue_edit env-configmap remove "$TEMP_CUE" "$SOURCE_ENV" "$DEMO_APP_CUE" "$DEMO_KEY"
 DEV_CLEANED_CUE=$(cat "$TEMP_CUE")
 rm -f "$TEMP_CUE"
 
@@ -465,7 +465,7 @@ demo_action "Cleaning up $TARGET_ENV..."
 PROD_CLEANUP_CUE=$(get_file_from_branch "$TARGET_ENV" "env.cue")
 TEMP_CUE="${K8S_DEPLOYMENTS_DIR}/.temp-env-cue.cue"
 echo "$PROD_CLEANUP_CUE" > "$TEMP_CUE"
-python3 "${CUE_EDIT}" env-configmap remove "$TEMP_CUE" "$TARGET_ENV" "$DEMO_APP_CUE" "$DEMO_KEY"
+demo_cue_edit env-configmap remove "$TEMP_CUE" "$TARGET_ENV" "$DEMO_APP_CUE" "$DEMO_KEY"
 PROD_CLEANED_CUE=$(cat "$TEMP_CUE")
 rm -f "$TEMP_CUE"
 
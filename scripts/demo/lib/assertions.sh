@@ -6,6 +6,8 @@
 # Prerequisites:
 #   - kubectl configured for target cluster
 #   - demo-helpers.sh sourced (for demo_verify, demo_fail, etc.)
+#   - python3 (k8s-assert.py, for assert_all)
+#   - PyYAML (pip install pyyaml) for assert_all with ASSERT_MANIFEST_DIR
 
 # ============================================================================
 # CONFIGURATION
@@ -15,6 +17,50 @@
 ASSERT_TIMEOUT="${ASSERT_TIMEOUT:-30}"
 ASSERT_POLL_INTERVAL="${ASSERT_POLL_INTERVAL:-5}"
 
+ASSERTIONS_LIB_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+K8S_ASSERT="${ASSERTIONS_LIB_DIR}/k8s-assert.py"
+
+# ============================================================================
+# BATCHED ASSERTIONS
+# ============================================================================
+
+# Assertions queued by assert_add, as "<word count>" "<words>..." groups
+_ASSERT_QUEUE=()
+
+# Queue an assertion for assert_all
+# Usage: assert_add <assertion> <args...>
+#   assertion: an assert_* function below without the prefix, with the same
+#   arguments, e.g. assert_add configmap_entry "$ns" "$cm" "$key" "$value"
+assert_add() {
+    _ASSERT_QUEUE+=("$#" "$@")
+}
+
+# Check the queued assertions and clear the queue
+# Usage: assert_all
+# Returns: 0 if all hold, 1 otherwise
+#
+# Fetches each namespace once (Deployments, ConfigMaps, Services and Pods in
+# one kubectl call, namespaces concurrently) and evaluates every assertion
+# against that snapshot, instead of one kubectl call per assertion and
+# retry. Retried assertions (those built on assert_field_equals) re-fetch
+# only what they read. Prints the same lines as the individual functions.
+#
+# With ASSERT_MANIFEST_DIR set, the assertions are checked offline against
+# the manifests below that directory (see k8s-assert.py --manifests), with
+# ASSERT_DEFAULT_NAMESPACE for resources that do not set their namespace.
+assert_all() {
+    local status=0
+    local source_args=()
+    if [[ -n "${ASSERT_MANIFEST_DIR:-}" ]]; then
+        source_args=(--manifests "$ASSERT_MANIFEST_DIR" --default-namespace "${ASSERT_DEFAULT_NAMESPACE:-}")
+    fi
+    if [[ ${#_ASSERT_QUEUE[@]} -gt 0 ]]; then
+        printf '%s\0' "${_ASSERT_QUEUE[@]}" | "$K8S_ASSERT" "${source_args[@]}" --null || status=1
+    fi
+    _ASSERT_QUEUE=()
+    return $status
+}
+
 # ============================================================================
 # RESOURCE EXISTENCE
 # ============================================================================
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+check-pipeline-client.py - Check pipeline_client's HTTP client against a stand-in server
+
+Starts an asyncio HTTP/1.1 server on 127.0.0.1 that records every request
+and connection, points pipeline_client's HttpClient (and its Jenkins and
+poll helpers) at it, and checks the transport behaviour the demo scripts
+rely on without GitLab or Jenkins running:
+
+  pooling    sequential requests share one keep-alive connection; gather()
+             opens at most max_connections
+  cookies    the Jenkins crumb request's session cookie is sent back with
+             the crumb on the scan POST
+  stale      a GET on a pooled connection the server drops is sent again on
+             a new one; so is a POST the server dropped without answering
+  no-resend  a POST whose response breaks off mid-way fails with
+             TransportError and reaches the server exactly once
+  backoff    poll() retries HTTP 5xx with growing delays and gives up at
+             once on 4xx
+
+Usage:
+  check-pipeline-client.py [--verbose]
+
+Exit status: 0 if every check passes, 1 otherwise.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import sys
+import time
+import traceback
+
+from pipeline_client.client import HttpClient, HttpError, TransportError
+from pipeline_client.jenkins import Jenkins
+from pipeline_client.poll import Backoff, poll
+
+RED = '\033[0;31m'
+GREEN = '\033[0;32m'
+NC = '\033[0m'
+
+
+class StandInServer:
+    """Keep-alive HTTP server answering from routes and queued faults.
+
+    routes maps a path (without query) to a function of the request
+    returning (status, JSON body, extra headers). A fault queued for a path
+    with fail() applies to the next request for it instead:
+
+      drop      close the connection without answering, as a server does
+                with an idle keep-alive connection (the request is not
+                counted as handled)
+      truncate  handle the request, send part of the response and close
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.faults = {}
+        self.requests = []  # (connection number, method, target, headers) of handled requests
+        self.connections = 0
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f'http://{host}:{port}'
+
+    async def __aenter__(self) -> 'StandInServer':
+        self._server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._server.close()
+        await self._server.wait_closed()
+
+    def fail(self, path: str, *faults: str):
+        self.faults.setdefault(path, []).extend(faults)
+
+    def handled(self, method: str, path: str) -> list:
+        return [r for r in self.requests if r[1] == method and r[2].split('?', 1)[0] == path]
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        number = self.connections
+        try:
+            while line := await reader.readline():
+                method, target, _ = line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while header := (await reader.readline()).decode('latin-1').rstrip('\r\n'):
+                    name, _, value = header.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                await reader.readexactly(int(headers.get('content-length', 0)))
+
+                path = target.split('?', 1)[0]
+                fault = self.faults[path].pop(0) if self.faults.get(path) else None
+                if fault == 'drop':
+                    break
+                self.requests.append((number, method, target, headers))
+                route = self.routes.get(path)
+                status, body, extra = route(headers) if route else (404, {'message': 'Not found'}, {})
+                payload = json.dumps(body).encode()
+                head = f'HTTP/1.1 {status} X\r\nContent-Type: application/json\r\nContent-Length: {len(payload)}\r\n'
+                head += ''.join(f'{name}: {value}\r\n' for name, value in extra.items())
+                response = head.encode('latin-1') + b'\r\n' + payload
+                if fault == 'truncate':
+                    writer.write(response[:len(response) - len(payload) // 2 - 1])
+                    await writer.drain()
+                    break
+                writer.write(response)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def _ok(headers: dict):
+    return 200, {'ok': True}, {}
+
+
+async def check_pooling(server: StandInServer):
+    async with HttpClient(max_connections=4) as http:
+        for _ in range(5):
+            (await http.get(f'{server.url}/ok')).raise_for_status()
+        assert http.stats == {'requests': 5, 'connections': 1}, f"sequential requests: {http.stats}"
+        await asyncio.gather(*(http.get(f'{server.url}/ok') for _ in range(12)))
+        assert http.stats['connections'] <= 4, f"gather() opened {http.stats['connections']} connections"
+        assert server.connections == http.stats['connections'], \
+            f"server saw {server.connections} connections, client opened {http.stats['connections']}"
+
+
+async def check_cookies(server: StandInServer):
+    async with HttpClient() as http:
+        jenkins = Jenkins(http, server.url, 'admin', 'token')
+        with contextlib.redirect_stderr(io.StringIO()):
+            status = await jenkins.trigger_scan('k8s-deployments')
+    assert status == 201, f"scan returned {status}"
+    (_, _, _, headers), = server.handled('POST', '/job/k8s-deployments/build')
+    assert headers.get('jenkins-crumb') == 'c0ffee', f"crumb header: {headers.get('jenkins-crumb')}"
+    assert headers.get('cookie') == 'JSESSIONID=s1', f"cookie header: {headers.get('cookie')}"
+    assert headers.get('authorization', '').startswith('Basic '), "no basic auth"
+
+
+async def check_stale(server: StandInServer):
+    async with HttpClient() as http:
+        (await http.get(f'{server.url}/ok')).raise_for_status()
+        server.fail('/ok', 'drop')
+        (await http.get(f'{server.url}/ok')).raise_for_status()
+        server.fail('/ok', 'truncate')
+        (await http.get(f'{server.url}/ok')).raise_for_status()
+        server.fail('/mr', 'drop')
+        (await http.post(f'{server.url}/mr', json_body={'title': 't'})).raise_for_status()
+        assert http.stats == {'requests': 4, 'connections': 4}, f"client: {http.stats}"
+    assert len(server.handled('GET', '/ok')) == 4, f"GETs handled: {len(server.handled('GET', '/ok'))}"
+    assert len(server.handled('POST', '/mr')) == 1, f"POSTs handled: {len(server.handled('POST', '/mr'))}"
+
+
+async def check_no_resend(server: StandInServer):
+    async with HttpClient() as http:
+        (await http.get(f'{server.url}/ok')).raise_for_status()
+        server.fail('/mr', 'truncate')
+        try:
+            await http.post(f'{server.url}/mr', json_body={'title': 't'})
+        except TransportError:
+            pass
+        else:
+            raise AssertionError("truncated POST response did not raise TransportError")
+        assert http.stats['connections'] == 1, f"POST was retried on a new connection: {http.stats}"
+    assert len(server.handled('POST', '/mr')) == 1, f"POST handled {len(server.handled('POST', '/mr'))} times"
+
+
+async def check_backoff(server: StandInServer):
+    backoff = Backoff(interval=0.02, max_interval=0.08, factor=2, jitter=0)
+    delays = list(itertools.islice(backoff.delays(), 5))
+    assert delays == [0.02, 0.04, 0.08, 0.08, 0.08], f"delays: {delays}"
+
+    answers = iter([503, 502, 200])
+    server.routes['/flaky'] = lambda headers: (next(answers), {'message': 'busy'}, {})
+    async with HttpClient() as http:
+        async def check(elapsed):
+            response = (await http.get(f'{server.url}/flaky')).raise_for_status()
+            return response.status
+
+        warnings = io.StringIO()
+        start = time.monotonic()
+        with contextlib.redirect_stderr(warnings):
+            result = await poll(check, 5, backoff, 'flaky')
+        elapsed = time.monotonic() - start
+        assert result == 200, f"poll returned {result}"
+        assert warnings.getvalue().count('HTTP 50') == 2, f"warnings: {warnings.getvalue()!r}"
+        assert elapsed >= 0.06, f"retried after {elapsed:.3f}s, expected the 0.02s + 0.04s backoff"
+
+        calls = 0
+
+        async def forbidden(elapsed):
+            nonlocal calls
+            calls += 1
+            return (await http.get(f'{server.url}/missing')).raise_for_status()
+
+        try:
+            await poll(forbidden, 5, backoff, 'missing')
+        except HttpError as e:
+            assert e.response.status == 404 and calls == 1, f"HTTP {e.response.status} after {calls} calls"
+        else:
+            raise AssertionError("poll did not fail on HTTP 404")
+
+
+CHECKS = {
+    'pooling': check_pooling,
+    'cookies': check_cookies,
+    'stale': check_stale,
+    'no-resend': check_no_resend,
+    'backoff': check_backoff,
+}
+
+
+async def run_checks(verbose: bool) -> int:
+    failures = 0
+    for name, check in CHECKS.items():
+        async with StandInServer() as server:
+            server.routes.update({
+                '/ok': _ok,
+                '/mr': lambda headers: (201, {'iid': 1}, {}),
+                '/crumbIssuer/api/json': lambda headers: (
+                    200, {'crumbRequestField': 'Jenkins-Crumb', 'crumb': 'c0ffee'},
+                    {'Set-Cookie': 'JSESSIONID=s1; Path=/; HttpOnly'}),
+                '/job/k8s-deployments/build': lambda headers: (
+                    201 if 'jenkins-crumb' in headers else 403, {}, {}),
+            })
+            try:
+                await asyncio.wait_for(check(server), 10)
+                print(f"{GREEN}✓{NC} {name}")
+            except Exception as e:
+                failures += 1
+                print(f"{RED}✗{NC} {name}: {e or type(e).__name__}")
+                if verbose:
+                    traceback.print_exc()
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check pipeline_client's HTTP client against a stand-in server",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--verbose', action='store_true', help='Print tracebacks of failed checks')
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run_checks(args.verbose)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+cue-edit-bench.py - Benchmark cue-edit.py operations on synthetic env.cue files
+
+Generates env.cue files shaped like k8s-deployments/seed-env.cue (every app in
+every environment gets labels, a deployment block and configMap data) and
+times cue-edit.py operations against them as the file grows.
+
+Usage:
+  cue-edit-bench.py [--scales 10,1000,10000] [--envs 3] [--configmap-keys 3]
+                    [--labels 2] [--iterations 30] [--modes edit,stub,cue]
+                    [--save baseline.json] [--compare baseline.json]
+  cue-edit-bench.py --startup [--startup-budget-ms 50] [--iterations 30]
+
+Modes:
+  edit  Call the edit function on in-memory content (no I/O, no validation).
+        find_block_end is only measured in this mode.
+  stub  Run the full command path (read, edit, shadow tree, atomic write) in a
+        copy of the module, with the cue step stubbed out.
+  cue   Same as stub, but running the real cue validation. Skipped when cue
+        is not installed.
+
+For each scale/operation/mode the report shows ops/sec, p50/p99 latency and
+the peak memory allocated by one traced run (tracemalloc).
+
+Startup (--startup):
+  Runs cue-edit.py as a fresh process, the way shell scripts call it:
+  'cue-edit.py --help' and a no-op edit (env-field set to the current value,
+  which reads, edits and compares but writes nothing and runs no cue); peak
+  memory is not measured. A bare 'python3 -c pass' is measured as the
+  baseline, and the run fails (exit 1) if either command's p50 exceeds it
+  by more than --startup-budget-ms. The slowest imports of the no-op edit
+  (python3 -X importtime) are listed on stderr.
+
+Baselines:
+  # Record a baseline
+  cue-edit-bench.py --scales 10,1000 --save /tmp/cue-edit-baseline.json
+
+  # Compare against it; exits 1 if any p50 regressed by more than --threshold
+  cue-edit-bench.py --scales 10,1000 --compare /tmp/cue-edit-baseline.json
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import cue_edit
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_MODULE = SCRIPT_DIR.parents[2] / "k8s-deployments"
+CUE_EDIT = SCRIPT_DIR / "cue-edit.py"
+
+OPERATIONS = ['add_env_configmap_entry', 'set_env_field', 'add_env_label', 'remove_env_label', 'find_block_end']
+MODES = ['edit', 'stub', 'cue']
+
+
+# ============================================================================
+# SYNTHETIC env.cue GENERATOR
+# ============================================================================
+
+ENV_NAMES = ['dev', 'stage', 'prod']
+
+
+def env_names(count: int) -> list[str]:
+    return ENV_NAMES[:count] + [f'env{i}' for i in range(len(ENV_NAMES), count)]
+
+
+def app_names(count: int) -> list[str]:
+    width = len(str(max(count - 1, 0)))
+    return [f'app{i:0{width}d}' for i in range(count)]
+
+
+def _app_block(env: str, app: str, configmap_keys: int, labels: int) -> str:
+    label_lines = ''.join(f'\t\t\t"label-{i}": "value-{i}"\n' for i in range(labels))
+    data_lines = ''.join(f'\t\t\t\t"key-{i}": "{env}-{app}-value-{i}"\n' for i in range(configmap_keys))
+    return f'''// {app} in {env}
+{env}: {app}: apps.exampleApp & {{
+\tappConfig: {{
+\t\tnamespace: "{env}"
+
+\t\tlabels: {{
+\t\t\tenvironment: "{env}"
+\t\t\tmanaged_by:  "argocd"
+{label_lines}\t\t}}
+
+\t\tdebug: true
+
+\t\tdeployment: {{
+\t\t\timage: "REGISTRY_URL_NOT_SET/p2c/{app}:IMAGE_TAG_NOT_SET"
+
+\t\t\treplicas: 1
+
+\t\t\tresources: {{
+\t\t\t\trequests: {{
+\t\t\t\t\tcpu:    "100m"
+\t\t\t\t\tmemory: "256Mi"
+\t\t\t\t}}
+\t\t\t\tlimits: {{
+\t\t\t\t\tcpu:    "500m"
+\t\t\t\t\tmemory: "512Mi"
+\t\t\t\t}}
+\t\t\t}}
+
+\t\t\tadditionalEnv: [
+\t\t\t\t{{
+\t\t\t\t\tname:  "ENVIRONMENT"
+\t\t\t\t\tvalue: "{env}"
+\t\t\t\t}},
+\t\t\t]
+\t\t}}
+
+\t\tconfigMap: {{
+\t\t\tdata: {{
+{data_lines}\t\t\t}}
+\t\t}}
+\t}}
+}}
+
+'''
+
+
+def generate_env_cue(apps: int, envs: int = 3, configmap_keys: int = 3, labels: int = 2) -> str:
+    """Generate an env.cue with apps x envs app blocks shaped like seed-env.cue."""
+    parts = ['''// Synthetic environment configuration generated by cue-edit-bench.py
+package envs
+
+import (
+\t"deployments.local/k8s-deployments/templates/apps"
+)
+
+''']
+    for env in env_names(envs):
+        for app in app_names(apps):
+            parts.append(_app_block(env, app, configmap_keys, labels))
+    return ''.join(parts)
+
+
+# ============================================================================
+# OPERATIONS
+# ============================================================================
+
+def operation_cases(name: str, env: str, app: str, i: int) -> tuple[list, dict]:
+    """Return (setup operations, timed operation) for iteration i of an operation.
+
+    Operations use the 'apply' plan format; setup operations are applied
+    untimed so that removals always have something to remove.
+    """
+    base = {'file': 'env.cue', 'env': env, 'app': app}
+    if name == 'add_env_configmap_entry':
+        return [], {'command': 'env-configmap', 'action': 'add', **base,
+                    'key': f'bench-key-{i}', 'value': f'bench-value-{i}'}
+    if name == 'set_env_field':
+        return [], {'command': 'env-field', 'action': 'set', **base, 'field': 'replicas', 'value': str(i % 5 + 1)}
+    if name == 'add_env_label':
+        return [], {'command': 'env-label', 'action': 'add', **base, 'key': f'bench-{i}', 'value': 'x'}
+    if name == 'remove_env_label':
+        add = {'command': 'env-label', 'action': 'add', **base, 'key': f'bench-rm-{i}', 'value': 'x'}
+        return [add], {'command': 'env-label', 'action': 'remove', **base, 'key': f'bench-rm-{i}'}
+    raise ValueError(f"Unknown operation: {name}")
+
+
+class EditRunner:
+    """Run operations as in-memory edit function calls."""
+
+    def __init__(self, cue_edit, content: str):
+        self.cue_edit = cue_edit
+        self.content = content
+
+    def _apply(self, op: dict) -> str:
+        func, fields = self.cue_edit.FILE_OPERATIONS[(op['command'], op['action'])]
+        return func(self.content, *(op[field] for field in fields))
+
+    def setup(self, operations: list):
+        for op in operations:
+            self.content = self._apply(op)
+
+    def run(self, op: dict):
+        self.content = self._apply(op)
+
+    def close(self):
+        pass
+
+
+class BlockEndRunner(EditRunner):
+    """Time find_block_end on the opening brace of an app block."""
+
+    def run(self, op: dict):
+        start = self.content.index(f"{op['env']}: {op['app']}:")
+        self.cue_edit.find_block_end(self.content, self.content.index('{', start))
+
+
+class CommandRunner:
+    """Run operations through the cue_edit API (apply, then commit) in a module copy."""
+
+    def __init__(self, cue_edit, content: str, module: Path, stub_cue: bool):
+        self.cue_edit = cue_edit
+        self.root = Path(tempfile.mkdtemp(prefix='cue-edit-bench-'))
+        for rel_path in cue_edit.module_cue_files(str(module)):
+            dst = self.root / rel_path
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(module / rel_path, dst)
+        (self.root / 'env.cue').write_text(content)
+
+        self.module = cue_edit.open_module(str(self.root))
+        self.original_run_cue_cached = cue_edit.validation.run_cue_cached
+        if stub_cue:
+            cue_edit.validation.run_cue_cached = self._stub_run_cue_cached
+
+    @staticmethod
+    def _stub_run_cue_cached(args, project_root, cache=None, digest=None, run_dir=None):
+        if run_dir is not None:
+            run_dir()  # build the shadow tree cue would have run in
+        return True, ''
+
+    def _commit(self, operations: list):
+        self.module.apply(operations).commit(use_cache=False)
+
+    def setup(self, operations: list):
+        if operations:
+            self._commit(operations)
+
+    def run(self, op: dict):
+        self._commit([op])
+
+    def close(self):
+        self.cue_edit.validation.run_cue_cached = self.original_run_cue_cached
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(runner, name: str, envs: list[str], apps: list[str], iterations: int, max_seconds: float) -> dict:
+    """Time iterations of an operation, spreading targets over the file.
+
+    Stops early (after at least 3 samples) once max_seconds have been spent.
+    Peak memory comes from one extra run under tracemalloc, so tracing does
+    not skew the timings.
+    """
+    def case(i):
+        env = envs[i % len(envs)]
+        app = apps[(i * 7919) % len(apps)]  # stride across the file
+        if name == 'find_block_end':
+            return [], {'env': env, 'app': app}
+        return operation_cases(name, env, app, i)
+
+    samples = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        setup, op = case(i)
+        runner.setup(setup)
+        t0 = time.perf_counter()
+        runner.run(op)
+        samples.append(time.perf_counter() - t0)
+        if len(samples) >= 3 and time.perf_counter() - started > max_seconds:
+            break
+
+    setup, op = case(iterations)
+    runner.setup(setup)
+    tracemalloc.start()
+    runner.run(op)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'samples': len(samples),
+        'ops_per_sec': len(samples) / sum(samples) if sum(samples) else 0.0,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'peak_kib': peak / 1024,
+    }
+
+
+def run_benchmarks(cue_edit, args) -> dict:
+    results = {}
+    envs = env_names(args.envs)
+    modes = args.modes
+    if 'cue' in modes and shutil.which('cue') is None:
+        print("cue not found in PATH - skipping 'cue' mode", file=sys.stderr)
+        modes = [m for m in modes if m != 'cue']
+
+    for scale in args.scales:
+        apps = app_names(scale)
+        content = generate_env_cue(scale, args.envs, args.configmap_keys, args.labels)
+        print(f"# {scale} apps x {args.envs} envs: {len(content) / 1024:.0f} KiB", file=sys.stderr)
+
+        for mode in modes:
+            for name in args.operations:
+                if name == 'find_block_end' and mode != 'edit':
+                    continue
+                if mode == 'edit':
+                    runner = (BlockEndRunner if name == 'find_block_end' else EditRunner)(cue_edit, content)
+                else:
+                    runner = CommandRunner(cue_edit, content, args.module, stub_cue=(mode == 'stub'))
+                try:
+                    result = measure(runner, name, envs, apps, args.iterations, args.max_seconds)
+                finally:
+                    runner.close()
+                key = f"{scale}/{name}/{mode}"
+                results[key] = result
+                print(f"  {key}: {format_result(result)}", file=sys.stderr)
+    return results
+
+
+# ============================================================================
+# STARTUP
+# ============================================================================
+
+# Allowed p50 startup over a bare interpreter, in milliseconds (--startup-budget-ms)
+STARTUP_BUDGET_MS = 50.0
+
+# Startup case -> interpreter arguments; 'python' is the baseline
+STARTUP_CASES = {
+    'python': ['-c', 'pass'],
+    'help': [str(CUE_EDIT), '--help'],
+    'noop-edit': [str(CUE_EDIT), 'env-field', 'set', 'env.cue', 'dev', 'app0', 'replicas', '1'],
+}
+
+
+def run_process(argv: list[str], cwd: Path) -> float:
+    """Run argv to completion and return its wall time in seconds."""
+    t0 = time.perf_counter()
+    result = subprocess.run(argv, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - t0
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(argv)} exited with status {result.returncode}:\n{result.stderr}")
+    return elapsed
+
+
+def slowest_imports(argv: list[str], cwd: Path, count: int = 10) -> list[tuple[int, str]]:
+    """Return the count largest cumulative import times (microseconds, module) of argv."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', *argv], cwd=cwd,
+                            capture_output=True, text=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        fields = line.removeprefix('import time:').split('|')
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            imports.append((int(fields[1]), fields[2].strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def run_startup(args) -> dict:
+    """Time fresh cue-edit.py processes (see STARTUP_CASES) in a copy of the module."""
+    root = Path(tempfile.mkdtemp(prefix='cue-edit-bench-'))
+    try:
+        for rel_path in cue_edit.module_cue_files(str(args.module)):
+            dst = root / rel_path
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(args.module / rel_path, dst)
+        (root / 'env.cue').write_text(generate_env_cue(10, args.envs, args.configmap_keys, args.labels))
+
+        results = {}
+        for name, argv in STARTUP_CASES.items():
+            run_process([sys.executable, *argv], root)  # warm up (page cache, .pyc files)
+            samples = [run_process([sys.executable, *argv], root) for _ in range(args.iterations)]
+            results[f'startup/{name}'] = {
+                'samples': len(samples),
+                'ops_per_sec': len(samples) / sum(samples),
+                'p50_ms': percentile(samples, 50) * 1000,
+                'p99_ms': percentile(samples, 99) * 1000,
+                'peak_kib': 0.0,
+            }
+            print(f"  startup/{name}: {format_result(results[f'startup/{name}'])}", file=sys.stderr)
+
+        print("# slowest imports of the no-op edit (cumulative):", file=sys.stderr)
+        for micros, module in slowest_imports(STARTUP_CASES['noop-edit'], root):
+            print(f"  {micros / 1000:8.1f} ms  {module}", file=sys.stderr)
+        return results
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def check_startup(results: dict, budget_ms: float) -> list[str]:
+    """Return a description of every startup case over budget_ms above the bare interpreter."""
+    baseline = results['startup/python']['p50_ms']
+    over = []
+    for key, result in results.items():
+        if key == 'startup/python':
+            continue
+        overhead = result['p50_ms'] - baseline
+        status = 'OVER BUDGET' if overhead > budget_ms else 'ok'
+        print(f"{key}: {overhead:.1f} ms over the interpreter (budget {budget_ms:.0f} ms) {status}")
+        if overhead > budget_ms:
+            over.append(f"{key}: {overhead:.1f} ms")
+    return over
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def format_result(result: dict) -> str:
+    return (f"{result['ops_per_sec']:10.1f} ops/s  p50 {result['p50_ms']:9.3f} ms  "
+            f"p99 {result['p99_ms']:9.3f} ms  peak {result['peak_kib']:10.1f} KiB  (n={result['samples']})")
+
+
+def print_report(results: dict):
+    width = max((len(key) for key in results), default=0)
+    print(f"{'scale/operation/mode':<{width}}  {'ops/s':>10}  {'p50 ms':>10}  {'p99 ms':>10}  {'peak KiB':>10}")
+    for key, result in results.items():
+        print(f"{key:<{width}}  {result['ops_per_sec']:10.1f}  {result['p50_ms']:10.3f}  "
+              f"{result['p99_ms']:10.3f}  {result['peak_kib']:10.1f}")
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a description of every p50 regression beyond threshold (a fraction)."""
+    regressions = []
+    for key, result in results.items():
+        old = baseline.get('results', {}).get(key)
+        if not old or not old.get('p50_ms'):
+            continue
+        change = result['p50_ms'] / old['p50_ms'] - 1
+        status = 'REGRESSION' if change > threshold else 'ok'
+        print(f"{key}: p50 {old['p50_ms']:.3f} -> {result['p50_ms']:.3f} ms ({change:+.1%}) {status}")
+        if change > threshold:
+            regressions.append(f"{key}: p50 {change:+.1%}")
+    return regressions
+
+
+def _csv(value: str) -> list[str]:
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description='Benchmark cue-edit.py operations on synthetic env.cue files',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--scales', type=lambda v: [int(s) for s in _csv(v)], default=[10, 1000, 10000],
+                        help='Comma-separated app counts (default: 10,1000,10000)')
+    parser.add_argument('--envs', type=int, default=3, help='Environments per file (default: 3)')
+    parser.add_argument('--configmap-keys', type=int, default=3, help='ConfigMap keys per app (default: 3)')
+    parser.add_argument('--labels', type=int, default=2, help='Extra labels per app (default: 2)')
+    parser.add_argument('--operations', type=_csv, default=OPERATIONS,
+                        help=f"Comma-separated operations (default: {','.join(OPERATIONS)})")
+    parser.add_argument('--modes', type=_csv, default=MODES,
+                        help=f"Comma-separated modes (default: {','.join(MODES)})")
+    parser.add_argument('--iterations', type=int, default=30, help='Timed runs per case (default: 30)')
+    parser.add_argument('--max-seconds', type=float, default=10.0,
+                        help='Stop a case early after this many seconds (default: 10)')
+    parser.add_argument('--module', type=Path, default=DEFAULT_MODULE,
+                        help='CUE module copied for stub/cue modes (default: k8s-deployments)')
+    parser.add_argument('--save', metavar='FILE', help='Write results as a JSON baseline')
+    parser.add_argument('--compare', metavar='FILE', help='Compare results with a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed p50 slowdown before --compare fails (default: 0.25 = 25%%)')
+    parser.add_argument('--startup', action='store_true',
+                        help='Time cue-edit.py process startup instead of the operations')
+    parser.add_argument('--startup-budget-ms', type=float, default=STARTUP_BUDGET_MS,
+                        help=f'Allowed startup over a bare interpreter before --startup fails '
+                             f'(default: {STARTUP_BUDGET_MS:.0f})')
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+
+    for name in args.operations:
+        if name not in OPERATIONS:
+            print(f"Error: Unknown operation: {name}", file=sys.stderr)
+            sys.exit(1)
+    for mode in args.modes:
+        if mode not in MODES:
+            print(f"Error: Unknown mode: {mode}", file=sys.stderr)
+            sys.exit(1)
+
+    results = run_startup(args) if args.startup else run_benchmarks(cue_edit, args)
+    print_report(results)
+
+    if args.save:
+        baseline = {
+            'meta': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'envs': args.envs,
+                'configmap_keys': args.configmap_keys,
+                'labels': args.labels,
+                'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            },
+            'results': results,
+        }
+        Path(args.save).write_text(json.dumps(baseline, indent=2) + '\n')
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Error: {len(regressions)} regression(s) beyond {args.threshold:.0%}:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            sys.exit(1)
+
+    if args.startup:
+        over = check_startup(results, args.startup_budget_ms)
+        if over:
+            print(f"Error: {len(over)} startup case(s) over the {args.startup_budget_ms:.0f} ms budget:",
+                  file=sys.stderr)
+            for case in over:
+                print(f"  {case}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
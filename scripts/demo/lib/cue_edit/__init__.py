@@ -0,0 +1,82 @@
+"""
+cue_edit - Safely edit CUE configuration files from Python
+
+The library behind cue-edit.py, for tooling that makes many edits in one
+process (promotion bots, benchmarks, manifest generation) without spawning
+the CLI for each of them:
+
+  import cue_edit   # with scripts/demo/lib on sys.path
+
+  module = cue_edit.open_module('k8s-deployments')
+  changes = module.apply([
+      {"command": "env-field", "action": "set", "file": "env.cue",
+       "env": "dev", "app": "exampleApp", "field": "replicas", "value": "2"},
+      {"command": "env-label", "action": "add", "file": "env.cue",
+       "env": "dev", "app": "exampleApp", "key": "team", "value": "payments"},
+  ])
+  print(changes.diff())           # what would change (like --dry-run)
+  changes.commit()                # lock, validate with cue, write all files or none
+
+  module.get('env.cue', 'dev', 'exampleApp', 'appConfig.deployment.image')
+
+Operations are the objects accepted by 'cue-edit.py apply'; relative paths
+resolve against the directory passed to open_module. Module.apply only edits
+in memory; Changes.apply layers more operations on top, Changes.validate runs
+the same scoped, cached cue checks as the CLI, and Changes.commit validates
+and writes under the same file locks. It raises ValidationError (a
+ValueError) with cue's output when validation fails.
+
+RevisionModule(path, rev=...) is a Module read from a git revision instead of
+the checkout; its Changes store written files as git blobs and commit_to
+commits them onto a branch without touching the working tree.
+
+File contents, structural indexes and validation results are cached for the
+life of the process and reused only while a file's mtime, size and inode are
+unchanged. The edit functions (add_env_configmap_entry, set_env_field, ...)
+can also be called directly on file contents.
+"""
+
+import importlib
+
+# Public names by submodule. They are imported on first use (PEP 562), so the
+# CLI and light callers only pay for the modules they need.
+_EXPORTS = {
+    'api': ('Changes', 'Module', 'ValidationError', 'open_module'),
+    'edits': (
+        'IMPORT_MODES', 'add_app_configmap_entry', 'add_app_pod_annotation', 'add_env_configmap_entry',
+        'add_env_label', 'add_platform_annotation', 'add_platform_label', 'import_app_configmap',
+        'import_app_configmap_file', 'import_env_configmap', 'import_env_configmap_file',
+        'load_configmap_entries', 'remove_app_configmap_entry', 'remove_app_pod_annotation',
+        'remove_env_configmap_entry', 'remove_env_field', 'remove_env_label', 'remove_platform_annotation',
+        'remove_platform_label', 'set_env_field',
+    ),
+    'files': (
+        'CACHE_DIR_NAME', 'find_project_root', 'lock_files', 'module_cue_files', 'read_project_file', 'write_files',
+    ),
+    'index': ('Block', 'CueIndex', 'EditBuffer', 'Field', 'find_block_end', 'index_content'),
+    'operations': (
+        'DIFF_FORMATS', 'FILE_OPERATIONS', 'PLATFORM_OPERATIONS', 'apply_operations', 'load_plan',
+        'operation_paths', 'render_diff',
+    ),
+    'query': ('get_value', 'list_keys', 'parse_query_path'),
+    'revision': ('RevisionChanges', 'RevisionModule'),
+    'trace': ('TRACE',),
+    'validation': ('commit_changes', 'plan_validation', 'run_cue', 'validate_changes'),
+}
+_SOURCES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_SOURCES)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return importlib.import_module(f'{__name__}.{name}')
+    if name not in _SOURCES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'{__name__}.{_SOURCES[name]}'), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_SOURCES))
@@ -0,0 +1,146 @@
+"""Module and Changes: open a module, apply operations, validate, commit."""
+
+from pathlib import Path
+
+from .files import find_project_root, lock_files, read_project_file, write_files
+from .operations import apply_operations, operation_paths, render_diff
+from .query import get_value, list_keys
+from .validation import validate_changes
+
+
+class ValidationError(ValueError):
+    """cue rejected the edited files; output holds its messages."""
+
+    def __init__(self, output: str):
+        super().__init__(f"CUE validation failed:\n{output}")
+        self.output = output
+
+
+class Module:
+    """A CUE module on disk.
+
+    Relative file paths in operations and queries are resolved against
+    base_dir, and platform operations edit the module containing it.
+    """
+
+    # Directory whose .cue-edit-cache/ holds validation results (None: the project root)
+    cache_root = None
+
+    def __init__(self, base_dir: str = '.'):
+        self.base_dir = str(Path(base_dir).resolve())
+        self.root = find_project_root(self.base_dir)
+
+    def __repr__(self) -> str:
+        return f'Module({self.base_dir!r})'
+
+    def path(self, file: str) -> str:
+        """Return the absolute path of file (relative to base_dir)."""
+        return str(Path(self.base_dir, file).resolve())
+
+    def read(self, file: str) -> str:
+        """Return the current content of file on disk."""
+        return read_project_file(Path(self.path(file)))
+
+    def paths(self, operations: list) -> set[str]:
+        """Return the absolute paths of the files operations will edit (see lock_files)."""
+        return operation_paths(operations, self.base_dir)
+
+    def apply(self, operations: list) -> 'Changes':
+        """Apply operations in memory; nothing is validated or written yet."""
+        return Changes(self).apply(operations)
+
+    def get(self, file: str, env: str, app: str, path: str, export: bool = False):
+        """Return the value at <env>.<app>.<path> in file (see get_value)."""
+        return get_value(self._query_file(file), env, app, path, export=export)[0]
+
+    def list(self, file: str, env: str, app: str | None = None, path: str = '',
+             export: bool = False) -> list[str]:
+        """Return the field names of the struct at <env>[.<app>[.<path>]] in file (see list_keys)."""
+        return list_keys(self._query_file(file), env, app, path, export=export)[0]
+
+    def _query_file(self, file: str) -> str:
+        return file if file == '-' else self.path(file)
+
+
+class Changes:
+    """Edits of a module's files, held in memory until written.
+
+    files maps absolute paths to their new contents and originals to the
+    contents they were edited from; validations are the checks recorded by
+    apply_operations (see plan_validation).
+    """
+
+    def __init__(self, module: Module):
+        self.module = module
+        self.files = {}
+        self.originals = {}
+        self.validations = set()
+
+    def apply(self, operations: list) -> 'Changes':
+        """Apply more operations on top of the pending contents.
+
+        Operations are the dicts accepted by 'cue-edit.py apply'. If one
+        fails (ValueError), none of them are kept.
+        """
+        files, validations = apply_operations(operations, dict(self.files), self.module.base_dir)
+        for path in files:
+            if path not in self.originals:
+                self.originals[path] = read_project_file(Path(path))
+        self.files = files
+        self.validations |= validations
+        return self
+
+    @property
+    def changed(self) -> dict:
+        """Files whose new content differs from the original: path -> content."""
+        return {path: content for path, content in self.files.items() if content != self.originals[path]}
+
+    @property
+    def unchanged(self) -> list[str]:
+        """Edited files whose new content equals the original."""
+        return [path for path, content in self.files.items() if content == self.originals[path]]
+
+    def diff(self, fmt: str = 'unified'):
+        """Render the changes as a unified diff, or a list of JSON patches for 'json' (see render_diff)."""
+        return render_diff(self.changed, self.originals, fmt)
+
+    def validate(self, full_vet: bool = False, use_cache: bool = True) -> tuple[bool, str]:
+        """Validate the changed files with cue in shadow trees; returns (success, output).
+
+        Unchanged files are not validated, and cue does not run at all when
+        nothing changed.
+        """
+        changed = self.changed
+        validations = {v for v in self.validations if v[2] in changed}
+        return validate_changes(changed, validations, full_vet=full_vet, use_cache=use_cache,
+                                cache_root=self.module.cache_root)
+
+    def write(self) -> list[str]:
+        """Write the changed files together without validating them; returns their paths."""
+        changed = self.changed
+        write_files(changed)
+        self.originals.update(changed)
+        return list(changed)
+
+    def commit(self, full_vet: bool = False, use_cache: bool = True) -> list[str]:
+        """Validate and write the changed files under exclusive locks; returns their paths.
+
+        Raises ValueError if a file changed on disk since it was edited and
+        ValidationError if cue rejects the changes; nothing is written then.
+        Callers already holding the files' locks (lock_files) call validate()
+        and write() instead.
+        """
+        changed = self.changed
+        with lock_files(exclusive=changed):
+            for path in changed:
+                if read_project_file(Path(path)) != self.originals[path]:
+                    raise ValueError(f"{path} changed on disk since it was edited")
+            valid, output = self.validate(full_vet=full_vet, use_cache=use_cache)
+            if not valid:
+                raise ValidationError(output)
+            return self.write()
+
+
+def open_module(path: str = '.') -> Module:
+    """Open the CUE module containing path (a directory, default: the current directory)."""
+    return Module(path)
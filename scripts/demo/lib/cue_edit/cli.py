@@ -0,0 +1,710 @@
+"""
+cue-edit.py - Safely add/remove entries in CUE configuration files
+
+This tool provides safe manipulation of CUE files for demo purposes.
+It always validates changes with 'cue vet' before writing: edits are checked in
+a shadow copy of the module, and the real files are replaced atomically only
+once validation passes.
+
+Usage:
+  cue-edit.py env-configmap add <file> <env> <app> <key> <value>
+  cue-edit.py env-configmap remove <file> <env> <app> <key>
+  cue-edit.py app-configmap add <file> <app> <key> <value>
+  cue-edit.py app-configmap remove <file> <app> <key>
+  cue-edit.py env-field set <file> <env> <app> <field> <value>
+  cue-edit.py env-field remove <file> <env> <app> <field>
+
+Examples:
+  # Add redis-url to dev environment's ConfigMap
+  cue-edit.py env-configmap add env.cue dev exampleApp redis-url "redis://redis.dev:6379"
+
+  # Add cache-ttl to app's default ConfigMap (propagates to all envs)
+  cue-edit.py app-configmap add templates/apps/example-app.cue exampleApp cache-ttl "300"
+
+  # Set replicas for an app in an environment
+  cue-edit.py env-field set env.cue dev exampleApp replicas 2
+
+Bulk ConfigMap import (one pass over configMap.data, one validation):
+  cue-edit.py env-configmap import <file> <env> <app> --from <data.env|data.json|data.yaml> [--mode merge|replace|prune]
+  cue-edit.py app-configmap import <file> <app> --from <path> [--mode merge|replace|prune]
+
+  merge (default) adds and updates keys, replace makes configMap.data exactly
+  the imported keys, prune removes the imported keys.
+
+Note: App names use CUE identifiers (e.g., "exampleApp" not "example-app")
+
+Platform-level changes:
+  cue-edit.py platform-annotation add <key> <value>
+  cue-edit.py platform-annotation remove <key>
+  cue-edit.py platform-label add <key> <value>
+  cue-edit.py platform-label remove <key>
+
+Environment-level labels (appConfig.labels in env.cue):
+  cue-edit.py env-label add <file> <env> <app> <key> <value>
+  cue-edit.py env-label remove <file> <env> <app> <key>
+
+Examples:
+  # Add Prometheus scraping annotation to all deployments
+  cue-edit.py platform-annotation add prometheus.io/scrape true
+
+  # Remove the annotation
+  cue-edit.py platform-annotation remove prometheus.io/scrape
+
+  # Add cost-center label to all resources
+  cue-edit.py platform-label add cost-center platform-shared
+
+  # Remove the label
+  cue-edit.py platform-label remove cost-center
+
+  # Override cost-center label for prod environment
+  cue-edit.py env-label add env.cue prod exampleApp cost-center production-critical
+
+  # Remove environment-specific label override
+  cue-edit.py env-label remove env.cue prod exampleApp cost-center
+
+App-level pod annotation overrides:
+  cue-edit.py app-annotation add <file> <app> <key> <value>
+  cue-edit.py app-annotation remove <file> <app> <key>
+
+Examples:
+  # Disable Prometheus scraping for postgres (overrides platform default)
+  cue-edit.py app-annotation add templates/apps/postgres.cue postgres prometheus.io/scrape false
+
+  # Remove the override (restore platform default behavior)
+  cue-edit.py app-annotation remove templates/apps/postgres.cue postgres prometheus.io/scrape
+
+Validation scope:
+  Edits are validated only where they can have an effect: platform and
+  app-annotation changes vet the edited package and every package importing it
+  (cue vet -c=false), and env-configmap/env-field/env-label changes export just
+  the edited <env>.<app>. Add --full-vet to any command to vet the whole module
+  (./...) or file instead.
+
+  Results are cached in .cue-edit-cache/ (or $CUE_EDIT_CACHE_DIR), keyed by the
+  contents of every .cue file, the cue version and the cue arguments, so
+  re-validating an identical tree does not run cue again. The cache is bounded
+  by $CUE_EDIT_CACHE_MAX_BYTES (default 8 MiB, least recently used entries are
+  evicted). Add --no-cache to any command to bypass it.
+
+Unchanged results:
+  An edit that leaves every file as it was (setting a field to its current
+  value, removing a key that is not there) writes nothing and runs no cue
+  command; the tool prints "Unchanged <file>" and exits 0. Add
+  --exit-unchanged to exit with status 3 instead, so callers can skip
+  follow-up work such as git commits.
+
+Concurrency:
+  Runs on the same checkout take advisory locks (.cue-edit-cache/locks/): an
+  exclusive lock on each file being edited, held from reading it until the new
+  content is written, in sorted path order. Edits to different files proceed in
+  parallel, overlapping ones wait for each other. Multi-file changes are staged
+  in .cue-edit-cache/staging/ before the real files are replaced.
+
+Dry run:
+  Add --dry-run (or --diff) to any edit command, including apply, to print
+  what it would change as a unified diff (git apply compatible), without
+  running cue or writing anything. --diff-format json prints a JSON patch
+  instead: per file, the changed line hunks with their old and new lines.
+
+Timings:
+  Add --timings to any command to print one JSON record to stderr with
+  monotonic spans per phase (read, index, edit, shadow, digest, write, ...),
+  byte sizes, each cue command line with its exit code and cache hit/miss.
+  Set CUE_EDIT_TRACE=<path> to append the same record (one JSON line per
+  invocation) to a file instead, e.g. to aggregate timings across a pipeline.
+
+Queries (read-only, answered from the file without running cue when possible):
+  cue-edit.py get <file> <env> <app> <path> [--json] [--export]
+  cue-edit.py list <file> <env> [<app> [<path>]] [--json] [--export]
+
+  get prints the value at a dotted path below the app, e.g.
+  appConfig.deployment.image or appConfig.configMap.data.redis-url (quote
+  labels that contain dots: appConfig.configMap.data."log.level"). Scalars
+  written in the file are read directly; inherited values, expressions,
+  structs and lists fall back to 'cue export'. list prints the fields written
+  in the file, or those of the evaluated struct when it is not in the file.
+  --export always evaluates with cue. A file of '-' reads stdin (no fallback).
+
+Batch mode (apply many operations, validate once, write all files or none):
+  cue-edit.py apply --plan edits.json
+  cue-edit.py apply < edits.jsonl
+
+  Each operation is an object with the subcommand's arguments, e.g.:
+    {"command": "env-configmap", "action": "add", "file": "env.cue",
+     "env": "dev", "app": "exampleApp", "key": "redis-url", "value": "redis://redis:6379"}
+    {"command": "platform-label", "action": "add", "key": "cost-center", "value": "shared"}
+
+Git revisions (edit another branch without checking it out):
+  cue-edit.py env-field set env.cue dev exampleApp replicas 2 --rev origin/dev > env.cue.new
+  cue-edit.py env-field set env.cue dev exampleApp replicas 2 --rev dev --commit-to dev [-m MESSAGE]
+  cue-edit.py get env.cue dev exampleApp appConfig.deployment.image --rev dev
+
+  --rev reads the module's files at REV from git objects (one git cat-file
+  --batch) into a temporary snapshot, edits and validates it like a checkout,
+  and stores the result as git blobs: a single edited file is printed to
+  stdout, several as "<blob> <path>" lines. --commit-to REF also commits them
+  on top of REV (commit-tree with a temporary index) and moves REF there,
+  refusing if REF has moved away from REV or is the checked-out branch, and
+  prints "Committed <sha> to <REF>", or "Unchanged <path>" when the edit
+  changes nothing (exit 3 with --exit-unchanged). The working tree, index
+  and HEAD are never touched. File paths are checkout
+  paths; fetch first when REV is a remote branch.
+
+Co-process mode (keep files and indexes warm across many edits):
+  cue-edit.py serve --stdio
+
+  Reads one JSON request per line and writes one JSON response per line:
+    {"id": 1, "argv": ["env-field", "set", "env.cue", "dev", "exampleApp", "replicas", "2"]}
+    {"id": 1, "ok": true, "status": "modified", "files": ["/path/to/env.cue"], "unchanged": []}
+  Requests may also carry a plan ("operations") or a single operation object,
+  a "cwd" to resolve relative paths from, and "rev", "commit_to", "message". Cached contents are reused only
+  while the file's mtime, size and inode are unchanged.
+
+Python API (in-process, no interpreter or argparse cost per edit):
+  import cue_edit   # with scripts/demo/lib on sys.path
+
+  changes = cue_edit.open_module('k8s-deployments').apply(operations)
+  changes.commit()
+
+  Operations are the objects accepted by 'apply'; see cue_edit/__init__.py.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+
+from .trace import TRACE, emit_trace
+
+# The rest of the package is imported by the code paths that use it, so a
+# query or --help does not load the edit and validation modules.
+
+
+QUERY_COMMANDS = {'get', 'list'}
+
+# Global option dests, excluded when turning CLI arguments into an operation
+OPTION_NAMES = {'full_vet', 'no_cache', 'timings', 'exit_unchanged', 'dry_run', 'diff_format',
+                'rev', 'commit_to', 'message'}
+
+# Exit status for --exit-unchanged when no file content changed
+EXIT_UNCHANGED = 3
+
+
+def _add_common_options(parser: argparse.ArgumentParser):
+    """Options shared by every edit subcommand (accepted after the subcommand's arguments)."""
+    from .files import CACHE_DIR_NAME
+    from .operations import DIFF_FORMATS
+
+    parser.add_argument('--full-vet', action='store_true',
+                        help="Validate the whole module/file instead of only what the edit affects")
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f"Always run cue instead of reusing results from {CACHE_DIR_NAME}/")
+    parser.add_argument('--timings', action='store_true',
+                        help='Print a JSON timing record to stderr (also appended to $CUE_EDIT_TRACE if set)')
+    parser.add_argument('--exit-unchanged', action='store_true',
+                        help=f'Exit with status {EXIT_UNCHANGED} when the edit leaves every file unchanged')
+    parser.add_argument('--dry-run', '--diff', dest='dry_run', action='store_true',
+                        help='Print the changes as a diff instead of validating and writing them')
+    parser.add_argument('--diff-format', choices=DIFF_FORMATS, default='unified',
+                        help='Dry-run output: unified diff (default) or JSON patch')
+    parser.add_argument('--rev', metavar='REV',
+                        help='Edit the files as of a git revision instead of the checkout; '
+                             'prints the new content (see --commit-to)')
+    parser.add_argument('--commit-to', metavar='REF',
+                        help='With --rev: commit the edit on top of REV and point branch/ref REF at it')
+    parser.add_argument('--message', '-m', help='Commit message for --commit-to')
+
+
+def _add_import_options(parser: argparse.ArgumentParser):
+    """Options of the configmap import actions."""
+    from .edits import IMPORT_MODES
+
+    parser.add_argument('--from', dest='source', required=True, metavar='PATH',
+                        help="Entries to import: .env, .json, .yaml/.yml ('-' reads stdin)")
+    parser.add_argument('--mode', choices=IMPORT_MODES, default='merge',
+                        help='merge: add/update keys (default); replace: make data exactly the '
+                             'imported keys; prune: remove the imported keys')
+    parser.add_argument('--format', choices=('env', 'json', 'yaml'),
+                        help='Input format (default: from the file extension, else .env)')
+
+
+def _add_query_options(parser: argparse.ArgumentParser):
+    """Options of the get / list queries."""
+    parser.add_argument('--export', action='store_true',
+                        help='Always evaluate with cue export instead of reading the file')
+    parser.add_argument('--json', action='store_true', help='Print the result as JSON')
+    parser.add_argument('--rev', metavar='REV', help='Read the file as of a git revision')
+    parser.add_argument('--timings', action='store_true',
+                        help='Print a JSON timing record to stderr (also appended to $CUE_EDIT_TRACE if set)')
+
+
+def _add_action(actions, name: str, help_text: str) -> argparse.ArgumentParser:
+    action = actions.add_parser(name, help=help_text)
+    _add_common_options(action)
+    return action
+
+
+def _env_configmap_arguments(parser: argparse.ArgumentParser):
+    actions = parser.add_subparsers(dest='action', required=True)
+
+    add = _add_action(actions, 'add', 'Add a ConfigMap entry')
+    add.add_argument('file', help='CUE file to modify')
+    add.add_argument('env', help='Environment name (dev/stage/prod)')
+    add.add_argument('app', help='App name (CUE identifier, e.g., exampleApp)')
+    add.add_argument('key', help='ConfigMap key')
+    add.add_argument('value', help='ConfigMap value')
+
+    remove = _add_action(actions, 'remove', 'Remove a ConfigMap entry')
+    remove.add_argument('file', help='CUE file to modify')
+    remove.add_argument('env', help='Environment name')
+    remove.add_argument('app', help='App name (CUE identifier)')
+    remove.add_argument('key', help='ConfigMap key to remove')
+
+    import_ = _add_action(actions, 'import', 'Import ConfigMap entries from a .env, JSON or YAML file')
+    _add_import_options(import_)
+    import_.add_argument('file', help='CUE file to modify')
+    import_.add_argument('env', help='Environment name')
+    import_.add_argument('app', help='App name (CUE identifier)')
+
+
+def _app_configmap_arguments(parser: argparse.ArgumentParser):
+    actions = parser.add_subparsers(dest='action', required=True)
+
+    add = _add_action(actions, 'add', 'Add a ConfigMap entry')
+    add.add_argument('file', help='CUE file to modify')
+    add.add_argument('app', help='App name (CUE identifier)')
+    add.add_argument('key', help='ConfigMap key')
+    add.add_argument('value', help='ConfigMap value')
+
+    remove = _add_action(actions, 'remove', 'Remove a ConfigMap entry')
+    remove.add_argument('file', help='CUE file to modify')
+    remove.add_argument('app', help='App name (CUE identifier)')
+    remove.add_argument('key', help='ConfigMap key to remove')
+
+    import_ = _add_action(actions, 'import', 'Import ConfigMap entries from a .env, JSON or YAML file')
+    _add_import_options(import_)
+    import_.add_argument('file', help='CUE file to modify')
+    import_.add_argument('app', help='App name (CUE identifier)')
+
+
+def _env_field_arguments(parser: argparse.ArgumentParser):
+    actions = parser.add_subparsers(dest='action', required=True)
+
+    set_ = _add_action(actions, 'set', 'Set a field value')
+    set_.add_argument('file', help='CUE file to modify')
+    set_.add_argument('env', help='Environment name')
+    set_.add_argument('app', help='App name (CUE identifier)')
+    set_.add_argument('field', help='Field name')
+    set_.add_argument('value', help='Field value')
+
+    remove = _add_action(actions, 'remove', 'Remove a field')
+    remove.add_argument('file', help='CUE file to modify')
+    remove.add_argument('env', help='Environment name')
+    remove.add_argument('app', help='App name (CUE identifier)')
+    remove.add_argument('field', help='Field name to remove')
+
+
+def _platform_annotation_arguments(parser: argparse.ArgumentParser):
+    actions = parser.add_subparsers(dest='action', required=True)
+
+    add = _add_action(actions, 'add', 'Add a default pod annotation')
+    add.add_argument('key', help='Annotation key (e.g., prometheus.io/scrape)')
+    add.add_argument('value', help='Annotation value (e.g., true)')
+
+    remove = _add_action(actions, 'remove', 'Remove a default pod annotation')
+    remove.add_argument('key', help='Annotation key to remove')
+
+
+def _platform_label_arguments(parser: argparse.ArgumentParser):
+    actions = parser.add_subparsers(dest='action', required=True)
+
+    add = _add_action(actions, 'add', 'Add a default label')
+    add.add_argument('key', help='Label key (e.g., cost-center)')
+    add.add_argument('value', help='Label value (e.g., platform-shared)')
+
+    remove = _add_action(actions, 'remove', 'Remove a default label')
+    remove.add_argument('key', help='Label key to remove')
+
+
+def _env_label_arguments(parser: argparse.ArgumentParser):
+    actions = parser.add_subparsers(dest='action', required=True)
+
+    add = _add_action(actions, 'add', 'Add a label to environment config')
+    add.add_argument('file', help='CUE file to modify (env.cue)')
+    add.add_argument('env', help='Environment name (dev/stage/prod)')
+    add.add_argument('app', help='App name (CUE identifier, e.g., exampleApp)')
+    add.add_argument('key', help='Label key (e.g., cost-center)')
+    add.add_argument('value', help='Label value')
+
+    remove = _add_action(actions, 'remove', 'Remove a label from environment config')
+    remove.add_argument('file', help='CUE file to modify (env.cue)')
+    remove.add_argument('env', help='Environment name')
+    remove.add_argument('app', help='App name (CUE identifier)')
+    remove.add_argument('key', help='Label key to remove')
+
+
+def _app_annotation_arguments(parser: argparse.ArgumentParser):
+    actions = parser.add_subparsers(dest='action', required=True)
+
+    add = _add_action(actions, 'add', 'Add a pod annotation override to app config')
+    add.add_argument('file', help='CUE file to modify (templates/apps/*.cue)')
+    add.add_argument('app', help='App name (CUE identifier)')
+    add.add_argument('key', help='Annotation key (e.g., prometheus.io/scrape)')
+    add.add_argument('value', help='Annotation value (e.g., false)')
+
+    remove = _add_action(actions, 'remove', 'Remove a pod annotation override')
+    remove.add_argument('file', help='CUE file to modify')
+    remove.add_argument('app', help='App name (CUE identifier)')
+    remove.add_argument('key', help='Annotation key to remove')
+
+
+def _apply_arguments(parser: argparse.ArgumentParser):
+    _add_common_options(parser)
+    parser.add_argument('--plan', default='-',
+                        help='JSON plan file (array, {"operations": [...]} or JSON lines); default: stdin')
+
+
+def _get_arguments(parser: argparse.ArgumentParser):
+    _add_query_options(parser)
+    parser.add_argument('file', help="CUE file (e.g., env.cue; '-' reads stdin)")
+    parser.add_argument('env', help='Environment name (e.g., dev, stage, prod)')
+    parser.add_argument('app', help='App name (CUE identifier, e.g., exampleApp)')
+    parser.add_argument('path', help='Dotted path below the app (e.g., appConfig.deployment.image)')
+
+
+def _list_arguments(parser: argparse.ArgumentParser):
+    _add_query_options(parser)
+    parser.add_argument('file', help="CUE file (e.g., env.cue; '-' reads stdin)")
+    parser.add_argument('env', help='Environment name (e.g., dev, stage, prod)')
+    parser.add_argument('app', nargs='?', help='App name (lists the apps of env when omitted)')
+    parser.add_argument('path', nargs='?', help='Dotted path of a struct below the app')
+
+
+def _serve_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--stdio', action='store_true', required=True,
+                        help='Read requests from stdin and write responses to stdout')
+
+
+# Subcommand -> (help, function adding its arguments and actions)
+SUBCOMMANDS = {
+    'env-configmap': ('Modify environment-level ConfigMap entries', _env_configmap_arguments),
+    'app-configmap': ('Modify app-level ConfigMap entries', _app_configmap_arguments),
+    'env-field': ('Modify environment-level fields', _env_field_arguments),
+    'platform-annotation': ('Modify platform-level pod annotations', _platform_annotation_arguments),
+    'platform-label': ('Modify platform-level default labels', _platform_label_arguments),
+    'env-label': ('Modify environment-level labels (appConfig.labels)', _env_label_arguments),
+    'app-annotation': ('Modify app-level pod annotation overrides', _app_annotation_arguments),
+    'apply': ('Apply a plan of operations with a single validation', _apply_arguments),
+    'get': ('Print a value of an app in an environment', _get_arguments),
+    'list': ('List the fields of an environment, app or struct', _list_arguments),
+    'serve': ('Run as a persistent co-process answering JSON requests', _serve_arguments),
+}
+
+
+def build_parser(commands=None) -> argparse.ArgumentParser:
+    """Build the argument parser.
+
+    Every subcommand is listed, but only those in commands (default: all) get
+    their arguments and actions. main() builds just the invoked one, since
+    building all of them costs more than many commands take to run.
+    """
+    parser = argparse.ArgumentParser(
+        description='Safely edit CUE configuration files',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    subparsers = parser.add_subparsers(dest='command', help='Command to run')
+    for name, (help_text, add_arguments) in SUBCOMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text)
+        if commands is None or name in commands:
+            add_arguments(subparser)
+    return parser
+
+
+def run_command(args: argparse.Namespace) -> dict:
+    """Apply and commit the operations described by parsed CLI arguments.
+
+    Returns {'ok': True, 'status': ..., 'files': [...], 'unchanged': [...]} on
+    success, or {'ok': False, 'error': message} with the validation output
+    included in the message. files lists the files written; unchanged lists
+    edited files whose new content equals what is on disk. Those are neither
+    validated nor written, and status is 'unchanged' when nothing was written
+    at all (files is then empty), 'modified' otherwise.
+
+    With args.dry_run nothing is validated or written: files lists the files
+    the edit would change, and 'diff' holds them rendered in args.diff_format.
+    With args.rev the files are edited as of that git revision instead (see
+    run_revision_command).
+    """
+    from .api import open_module
+    from .files import lock_files
+    from .operations import load_plan
+
+    try:
+        if args.command == 'apply':
+            operations = getattr(args, 'plan_operations', None)
+            if operations is None:
+                with TRACE.span('load_plan'):
+                    operations = load_plan(args.plan)
+        else:
+            operations = [{k: v for k, v in vars(args).items() if v is not None and k not in OPTION_NAMES}]
+
+        if getattr(args, 'rev', None):
+            return run_revision_command(args, operations)
+        if getattr(args, 'commit_to', None):
+            raise ValueError("--commit-to requires --rev")
+
+        # Hold the edited files from reading them until the new contents are
+        # written (a dry run only reads them)
+        module = open_module()
+        paths = module.paths(operations)
+        dry_run = getattr(args, 'dry_run', False)
+        with lock_files(shared=paths) if dry_run else lock_files(exclusive=paths):
+            changes = module.apply(operations)
+            changed, unchanged = changes.changed, changes.unchanged
+            if dry_run:
+                return {'ok': True, 'status': 'modified' if changed else 'unchanged', 'dry_run': True,
+                        'files': list(changed), 'unchanged': unchanged,
+                        'diff': changes.diff(getattr(args, 'diff_format', 'unified'))}
+            if not changed:
+                return {'ok': True, 'status': 'unchanged', 'files': [], 'unchanged': unchanged}
+
+            valid, output = changes.validate(full_vet=args.full_vet, use_cache=not args.no_cache)
+            if valid:
+                changes.write()
+    except (ValueError, OSError) as e:
+        return {'ok': False, 'error': str(e)}
+
+    if not valid:
+        return {'ok': False, 'error': f"CUE validation failed:\n{output}"}
+    return {'ok': True, 'status': 'modified', 'files': list(changed), 'unchanged': unchanged}
+
+
+def run_revision_command(args: argparse.Namespace, operations: list) -> dict:
+    """Apply operations to the files as of git revision args.rev (see RevisionModule).
+
+    Nothing in the checkout is read or written. After validation the new
+    contents are stored as git blobs: 'blobs' maps each file to its blob sha,
+    and 'content' holds the new content when a single file was edited. With
+    args.commit_to ('ref') they are instead committed on top of the revision
+    and the ref is moved there ('commit'); an unchanged edit commits nothing.
+    Paths are reported as checkout paths.
+    """
+    from .revision import RevisionModule
+
+    with RevisionModule(rev=args.rev) as module:
+        changes = module.apply(operations)
+        changed = {module.checkout_path(path): content for path, content in changes.changed.items()}
+        unchanged = [module.checkout_path(path) for path in changes.unchanged]
+        result = {'ok': True, 'status': 'modified' if changed else 'unchanged', 'rev': module.commit,
+                  'files': list(changed), 'unchanged': unchanged}
+        if getattr(args, 'commit_to', None):
+            result['ref'] = args.commit_to
+        elif len(changes.files) == 1:
+            result['content'] = next(iter(changes.files.values()))
+        if getattr(args, 'dry_run', False):
+            return {**result, 'dry_run': True, 'diff': changes.diff(getattr(args, 'diff_format', 'unified'))}
+        if not changed:
+            return result
+
+        valid, output = changes.validate(full_vet=args.full_vet, use_cache=not args.no_cache)
+        if not valid:
+            return {'ok': False, 'error': f"CUE validation failed:\n{output}"}
+        changes.write()
+        result['blobs'] = changes.blobs
+        if getattr(args, 'commit_to', None):
+            message = getattr(args, 'message', None) or _commit_message(operations, module, changed)
+            result['commit'] = changes.commit_to(args.commit_to, message)
+    return result
+
+
+def _commit_message(operations: list, module, changed: dict) -> str:
+    """Default --commit-to message, e.g. 'env-field set: env.cue'."""
+    commands = sorted({f"{op.get('command')} {op.get('action')}" for op in operations})
+    files = ', '.join(sorted(os.path.relpath(path, module.checkout_root) for path in changed))
+    return f"{'; '.join(commands)}: {files}"
+
+
+def run_query(args: argparse.Namespace) -> dict:
+    """Answer a get/list command: {'ok': True, 'value' or 'keys': ..., 'source': ...}."""
+    from .query import get_value, list_keys
+
+    try:
+        if getattr(args, 'rev', None):
+            return _run_revision_query(args)
+        if args.command == 'get':
+            value, source = get_value(args.file, args.env, args.app, args.path, export=args.export)
+            return {'ok': True, 'value': value, 'source': source}
+        keys, source = list_keys(args.file, args.env, args.app, args.path or '', export=args.export)
+        return {'ok': True, 'keys': keys, 'source': source}
+    except (ValueError, OSError) as e:
+        return {'ok': False, 'error': str(e)}
+
+
+def _run_revision_query(args: argparse.Namespace) -> dict:
+    from .query import get_value, list_keys
+    from .revision import RevisionModule
+
+    with RevisionModule(rev=args.rev) as module:
+        file = module.path(args.file)
+        if args.command == 'get':
+            value, source = get_value(file, args.env, args.app, args.path, export=args.export)
+            return {'ok': True, 'value': value, 'source': source}
+        keys, source = list_keys(file, args.env, args.app, args.path or '', export=args.export)
+        return {'ok': True, 'keys': keys, 'source': source}
+
+
+def _parse_request_argv(parser: argparse.ArgumentParser, argv: list) -> argparse.Namespace:
+    """Parse a request's argv, turning argparse's exit into a ValueError."""
+    stderr = io.StringIO()
+    try:
+        with contextlib.redirect_stderr(stderr):
+            args = parser.parse_args([str(arg) for arg in argv])
+    except SystemExit:
+        raise ValueError(stderr.getvalue().strip() or 'Invalid arguments') from None
+    if not args.command or args.command == 'serve':
+        raise ValueError(f"Unsupported command: {args.command}")
+    return args
+
+
+def handle_request(parser: argparse.ArgumentParser, request: dict) -> dict:
+    """Handle one serve-mode request; see serve_stdio for the protocol."""
+    if request.get('cwd'):
+        os.chdir(request['cwd'])
+
+    if 'argv' in request:
+        args = _parse_request_argv(parser, request['argv'])
+        if args.command in QUERY_COMMANDS:
+            return run_query(args)
+    else:
+        operations = request.get('operations', [request] if 'command' in request else [])
+        args = argparse.Namespace(command='apply', plan=None, full_vet=bool(request.get('full_vet')),
+                                  no_cache=bool(request.get('no_cache')), timings=bool(request.get('timings')),
+                                  dry_run=bool(request.get('dry_run')),
+                                  diff_format=request.get('diff_format', 'unified'), rev=request.get('rev'),
+                                  commit_to=request.get('commit_to'), message=request.get('message'))
+        args.plan_operations = [{k: v for k, v in op.items() if k not in ('id', 'cwd') and k not in OPTION_NAMES}
+                                for op in operations]
+    return run_command(args)
+
+
+def serve_stdio(parser: argparse.ArgumentParser):
+    """Answer line-delimited JSON requests on stdin until EOF.
+
+    Each request is one JSON object per line, either
+      {"argv": ["env-field", "set", "env.cue", "dev", "exampleApp", "replicas", "2"]}
+    or a batch plan / single operation as accepted by 'apply':
+      {"operations": [{"command": ..., "action": ..., ...}], "full_vet": false}
+      {"command": "env-label", "action": "remove", "file": ..., ...}
+    Optional keys: "id" (echoed back), "cwd" (directory relative paths and
+    the project root are resolved from) and "timings" (include the request's
+    timing record in the response, like --timings). Each response is one JSON line:
+      {"id": ..., "ok": true, "files": [...]} or {"id": ..., "ok": false, "error": "..."}
+    With $CUE_EDIT_TRACE set, one timing record per request is appended to it.
+
+    File contents, their structural indexes and import lists stay cached
+    between requests and are reused only while a file's mtime, size and inode
+    are unchanged.
+    """
+    trace_env = bool(os.environ.get('CUE_EDIT_TRACE'))
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        timings = False
+        request = {}
+        TRACE.reset()
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            timings = bool(request.get('timings')) or '--timings' in request.get('argv', [])
+            TRACE.enabled = timings or trace_env
+            response = handle_request(parser, request)
+        except ValueError as e:
+            response = {'ok': False, 'error': str(e)}
+        except Exception as e:  # keep serving; report the failure to the caller
+            response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        if 'id' in request:
+            response = {'id': request['id'], **response}
+        if TRACE.enabled:
+            record = TRACE.record(request=request, ok=response['ok'], files=response.get('files', []))
+            emit_trace(record, to_stderr=False)
+            if timings:
+                response['timings'] = record
+        sys.stdout.write(json.dumps(response) + '\n')
+        sys.stdout.flush()
+
+
+def print_query_result(result: dict, as_json: bool = False):
+    """Print a get value (strings raw, like jq -r) or list keys (one per line)."""
+    if 'keys' in result:
+        print(json.dumps(result['keys']) if as_json else '\n'.join(result['keys']))
+        return
+    value = result['value']
+    if isinstance(value, str) and not as_json:
+        print(value)
+    else:
+        print(json.dumps(value, indent=2 if isinstance(value, (dict, list)) else None))
+
+
+def main():
+    parser = build_parser(commands=sys.argv[1:2])
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    if args.command == 'serve':
+        serve_stdio(build_parser())
+        return
+
+    TRACE.enabled = args.timings or bool(os.environ.get('CUE_EDIT_TRACE'))
+    result = run_query(args) if args.command in QUERY_COMMANDS else run_command(args)
+    if TRACE.enabled:
+        emit_trace(TRACE.record(argv=sys.argv[1:], ok=result['ok'], files=result.get('files', [])),
+                   to_stderr=args.timings)
+
+    if not result['ok']:
+        print(f"Error: {result['error']}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command in QUERY_COMMANDS:
+        print_query_result(result, as_json=args.json)
+        return
+
+    if result.get('dry_run'):
+        diff = result['diff']
+        sys.stdout.write(json.dumps(diff, indent=2) + '\n' if args.diff_format == 'json' else diff)
+        if result['status'] == 'unchanged' and args.exit_unchanged:
+            sys.exit(EXIT_UNCHANGED)
+        return
+
+    if 'commit' in result:
+        print(f"Committed {result['commit']} to {result['ref']}")
+        return
+    if 'rev' in result:
+        if 'ref' in result:
+            for path in result['unchanged']:
+                print(f"Unchanged {path}")
+        elif 'content' in result:
+            sys.stdout.write(result['content'])
+        else:
+            for path, sha in result.get('blobs', {}).items():
+                print(f"{sha} {path}")
+        if result['status'] == 'unchanged' and args.exit_unchanged:
+            sys.exit(EXIT_UNCHANGED)
+        return
+
+    if not result['files'] and not result['unchanged']:
+        print("No operations to apply")
+
+    for path in result['files']:
+        print(f"Successfully modified {path}")
+    for path in result['unchanged']:
+        print(f"Unchanged {path}")
+
+    if result['status'] == 'unchanged' and args.exit_unchanged:
+        sys.exit(EXIT_UNCHANGED)
@@ -0,0 +1,782 @@
+"""Edit functions.
+
+File edits take a file's content and return the new content; platform edits
+take the project root and return the new contents of the files they change.
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+
+from .files import read_project_file
+from .index import Block, CueIndex, EditBuffer, Field, _append_splice, index_content
+
+
+def _label_key(key: str) -> str:
+    """Quote label keys that are not plain identifiers (e.g. cost-center)."""
+    return f'"{key}"' if '-' in key or '.' in key or '/' in key else key
+
+
+def _app_config_block(index: CueIndex, app: str) -> Block | None:
+    """Find the appConfig struct of an app in a templates/apps/*.cue file.
+
+    Falls back to the first appConfig struct in the file, since app files
+    define a single app.
+    """
+    return index.block(app, 'appConfig') or index.find_block('appConfig')
+
+
+def _find_config_field(index: CueIndex, block: Block, field: str) -> Field | None:
+    """Find a field by name in block: a direct child, else the first nested one.
+
+    Dotted names (deployment.replicas) are resolved as an exact path.
+    """
+    if '.' in field:
+        return index.field(*block.path, *field.split('.'))
+    if field in block.children:
+        return block.children[field]
+    return next((f for f in index.descendants(block) if f.name == field), None)
+
+
+def add_env_configmap_entry(content: str, env: str, app: str, key: str, value: str) -> str:
+    """Add a ConfigMap entry to an environment's app config in env.cue.
+
+    Structure: <env>: <app>: apps.<appRef> & {
+        appConfig: {
+            ...
+            configMap: {
+                data: {
+                    "key": "value"
+                }
+            }
+        }
+    }
+    """
+    edits = EditBuffer(content)
+    index = edits.index
+    if index.block(env, app) is None:
+        raise ValueError(f"Could not find app '{app}' in environment '{env}'")
+
+    data = index.block(env, app, 'appConfig', 'configMap', 'data')
+    configmap = index.block(env, app, 'appConfig', 'configMap')
+    app_config = index.block(env, app, 'appConfig')
+    if data is not None:
+        if key in data.children:
+            # Replace existing value
+            edits.replace_value(data.children[key], f'"{value}"')
+        else:
+            # Add new entry after the opening brace of data
+            edits.insert(data.open + 1, f'\n\t\t\t\t"{key}": "{value}"')
+    elif configmap is not None:
+        # configMap block exists without data
+        edits.insert(configmap.open + 1, f'\n\t\t\tdata: {{\n\t\t\t\t"{key}": "{value}"\n\t\t\t}}')
+    elif app_config is not None:
+        new_block = f'\n\t\tconfigMap: {{\n\t\t\tdata: {{\n\t\t\t\t"{key}": "{value}"\n\t\t\t}}\n\t\t}}'
+        edits.insert(app_config.open + 1, new_block)
+    else:
+        raise ValueError(f"Could not find appConfig block for app '{app}' in environment '{env}'")
+
+    return edits.text()
+
+
+def remove_env_configmap_entry(content: str, env: str, app: str, key: str) -> str:
+    """Remove a ConfigMap entry from an environment's app config."""
+    edits = EditBuffer(content)
+    entry = edits.index.field(env, app, 'appConfig', 'configMap', 'data', key)
+
+    if entry is None:
+        return content  # Nothing to remove if app or key doesn't exist
+
+    return edits.remove_field(entry).text()
+
+
+def add_app_configmap_entry(content: str, app: str, key: str, value: str) -> str:
+    """Add a ConfigMap entry to an app's default config in templates/apps/*.cue.
+
+    Structure: exampleApp: core.#App & {
+        appName: "example-app"
+        appEnvVars: [...]
+        appConfig: {
+            configMap: {
+                data: {
+                    "key": "value"
+                }
+            }
+        }
+    }
+    """
+    edits = EditBuffer(content)
+    index = edits.index
+    app_config = _app_config_block(index, app)
+
+    if app_config is None:
+        raise ValueError("Could not find appConfig block in file")
+
+    data = index.block(*app_config.path, 'configMap', 'data')
+    configmap = index.block(*app_config.path, 'configMap')
+    if data is not None:
+        if key in data.children:
+            # Replace existing value
+            edits.replace_value(data.children[key], f'"{value}"')
+        else:
+            edits.insert(data.open + 1, f'\n\t\t\t"{key}": "{value}"')
+    elif configmap is not None:
+        # configMap block exists without data
+        edits.insert(configmap.open + 1, f'\n\t\tdata: {{\n\t\t\t"{key}": "{value}"\n\t\t}}')
+    else:
+        new_block = f'\n\t\tconfigMap: {{\n\t\t\tdata: {{\n\t\t\t\t"{key}": "{value}"\n\t\t\t}}\n\t\t}}'
+        edits.insert(app_config.open + 1, new_block)
+
+    return edits.text()
+
+
+def remove_app_configmap_entry(content: str, app: str, key: str) -> str:
+    """Remove a ConfigMap entry from an app's default config.
+
+    This function operates on single-app files (templates/apps/*.cue); if the
+    app's appConfig is not found by name, the file's first appConfig is used.
+    """
+    edits = EditBuffer(content)
+    index = edits.index
+    app_config = _app_config_block(index, app)
+    entry = app_config and index.field(*app_config.path, 'configMap', 'data', key)
+
+    if entry is None:
+        return content
+
+    return edits.remove_field(entry).text()
+
+
+IMPORT_MODES = ('merge', 'replace', 'prune')
+
+
+def _cue_string(value: str) -> str:
+    """Encode a string as a CUE string literal (JSON string syntax is valid CUE)."""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _import_configmap_data(index: CueIndex, config_path: tuple, entries: dict, mode: str) -> str:
+    """Merge, replace or prune entries in <config_path>.configMap.data in one pass.
+
+    merge   - add new keys and update existing ones, keep the rest
+    replace - make data exactly entries (existing keys keep their position)
+    prune   - remove the keys in entries, leave everything else
+    """
+    if mode not in IMPORT_MODES:
+        raise ValueError(f"Unknown import mode: {mode} (expected one of {', '.join(IMPORT_MODES)})")
+
+    edits = EditBuffer(index.content)
+    data = index.block(*config_path, 'configMap', 'data')
+    if data is None:
+        if mode == 'prune' or not entries:
+            return edits.text()
+        # Create the missing configMap/data structs with all entries at once
+        lines = [f'{_cue_string(k)}: {_cue_string(v)}' for k, v in entries.items()]
+        configmap = index.block(*config_path, 'configMap')
+        parent = configmap or index.block(*config_path)
+        indent = index.line_indent(parent.open) + '\t'
+        if configmap is not None:
+            body = ''.join(f'\n{indent}\t{line}' for line in lines)
+            edits.insert(configmap.open + 1, f'\n{indent}data: {{{body}\n{indent}}}')
+        else:
+            body = ''.join(f'\n{indent}\t\t{line}' for line in lines)
+            edits.insert(parent.open + 1,
+                         f'\n{indent}configMap: {{\n{indent}\tdata: {{{body}\n{indent}\t}}\n{indent}}}')
+        return edits.text()
+
+    remaining = dict(entries)
+    for name, field in data.children.items():
+        if mode == 'prune':
+            if name in entries:
+                edits.remove_field(field)
+        elif name in remaining:
+            edits.replace_value(field, _cue_string(remaining.pop(name)))
+        elif mode == 'replace':
+            edits.remove_field(field)
+
+    if remaining and mode != 'prune':
+        new_entries = [f'{_cue_string(k)}: {_cue_string(v)}' for k, v in remaining.items()]
+        default_indent = index.line_indent(data.open) + '\t'
+        pos, text = _append_splice(index, data, new_entries, default_indent)
+        removed_to = max((end for _, end, _, _ in edits.edits), default=pos)
+        if removed_to > pos:
+            # The last existing entry is being removed together with the
+            # newline the insertion point sits on: insert after the removal
+            pos = removed_to
+            text = text.lstrip('\n') + '\n'
+        edits.insert(pos, text)
+
+    return edits.text()
+
+
+def import_env_configmap(content: str, env: str, app: str, entries: dict, mode: str = 'merge') -> str:
+    """Import a set of ConfigMap entries into an environment's app config in env.cue."""
+    index = index_content(content)
+    if index.block(env, app, 'appConfig') is None:
+        raise ValueError(f"Could not find appConfig block for app '{app}' in environment '{env}'")
+    return _import_configmap_data(index, (env, app, 'appConfig'), entries, mode)
+
+
+def import_app_configmap(content: str, app: str, entries: dict, mode: str = 'merge') -> str:
+    """Import a set of ConfigMap entries into an app's default config in templates/apps/*.cue."""
+    index = index_content(content)
+    app_config = _app_config_block(index, app)
+    if app_config is None:
+        raise ValueError("Could not find appConfig block in file")
+    return _import_configmap_data(index, app_config.path, entries, mode)
+
+
+def _configmap_value(key: str, value) -> str:
+    """ConfigMap data values are strings; render scalars the way YAML/JSON spell them."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        raise ValueError(f"ConfigMap value for '{key}' must be a scalar, not {type(value).__name__}")
+    return str(value)
+
+
+def _parse_dotenv(text: str) -> dict:
+    """Parse KEY=VALUE lines (comments, blank lines, 'export' and quoted values allowed)."""
+    entries = {}
+    for number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('export '):
+            line = line[len('export '):].lstrip()
+        key, sep, value = line.partition('=')
+        key, value = key.strip(), value.strip()
+        if not sep or not key:
+            raise ValueError(f"line {number}: expected KEY=VALUE")
+        if len(value) >= 2 and value[0] == value[-1] == '"':
+            value = json.loads(value) if '\\' in value else value[1:-1]
+        elif len(value) >= 2 and value[0] == value[-1] == "'":
+            value = value[1:-1]
+        elif ' #' in value:
+            value = value.split(' #', 1)[0].rstrip()
+        entries[key] = value
+    return entries
+
+
+def load_configmap_entries(source: str, fmt: str = '') -> dict:
+    """Load ConfigMap entries from a .env, JSON or YAML file ('-' reads stdin).
+
+    The format comes from fmt, else from the file extension (.json, .yaml/.yml,
+    anything else is read as .env). YAML needs PyYAML.
+    """
+    text = sys.stdin.read() if source == '-' else Path(source).read_text()
+    suffix = Path(source).suffix.lower()
+    fmt = fmt or {'.json': 'json', '.yaml': 'yaml', '.yml': 'yaml'}.get(suffix, 'env')
+
+    try:
+        if fmt == 'env':
+            data = _parse_dotenv(text)
+        elif fmt == 'json':
+            data = json.loads(text)
+        elif fmt == 'yaml':
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("YAML import requires PyYAML (pip install pyyaml); use .env or JSON instead") from None
+            data = yaml.safe_load(text)
+        else:
+            raise ValueError(f"Unknown import format: {fmt} (expected env, json or yaml)")
+    except ValueError as e:
+        raise ValueError(f"Cannot read ConfigMap entries from {source}: {e}") from None
+
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError(f"Cannot read ConfigMap entries from {source}: expected a mapping of keys to values")
+    return {str(key): _configmap_value(str(key), value) for key, value in data.items()}
+
+
+def import_env_configmap_file(content: str, env: str, app: str, source: str,
+                              mode: str = 'merge', fmt: str = '') -> str:
+    return import_env_configmap(content, env, app, load_configmap_entries(source, fmt), mode)
+
+
+def import_app_configmap_file(content: str, app: str, source: str, mode: str = 'merge', fmt: str = '') -> str:
+    return import_app_configmap(content, app, load_configmap_entries(source, fmt), mode)
+
+
+def set_env_field(content: str, env: str, app: str, field: str, value: str) -> str:
+    """Set a field value for an app in an environment.
+
+    The field is looked up in appConfig first, then in its nested structs
+    (so 'replicas' finds appConfig.deployment.replicas). Dotted names such as
+    deployment.replicas address an exact path.
+    """
+    # Determine if value should be quoted
+    try:
+        if '.' in value:
+            float(value)
+            formatted_value = value
+        else:
+            int(value)
+            formatted_value = value
+    except ValueError:
+        if value.lower() in ('true', 'false'):
+            formatted_value = value.lower()
+        else:
+            formatted_value = f'"{value}"'
+
+    edits = EditBuffer(content)
+    index = edits.index
+    if index.block(env, app) is None:
+        raise ValueError(f"Could not find app '{app}' in environment '{env}'")
+
+    app_config = index.block(env, app, 'appConfig')
+    if app_config is None:
+        raise ValueError(f"Could not find appConfig block for app '{app}' in environment '{env}'")
+
+    # Look for existing field in appConfig
+    existing = _find_config_field(index, app_config, field)
+    if existing is not None:
+        edits.replace_value(existing, formatted_value)
+    else:
+        # Field doesn't exist, add it after appConfig: {
+        # (dotted names become a label chain, e.g. deployment: replicas: 2)
+        label = field.replace('.', ': ')
+        edits.insert(app_config.open + 1, f'\n\t\t{label}: {formatted_value}')
+
+    return edits.text()
+
+
+def remove_env_field(content: str, env: str, app: str, field: str) -> str:
+    """Remove a field from an app's environment config."""
+    edits = EditBuffer(content)
+    index = edits.index
+    app_block = index.block(env, app)
+
+    if app_block is None:
+        return content
+
+    app_config = index.block(env, app, 'appConfig')
+    existing = app_config and _find_config_field(index, app_config, field)
+    if existing is None:
+        existing = _find_config_field(index, app_block, field)
+
+    if existing is None:
+        return content
+
+    return edits.remove_field(existing).text()
+
+
+# ============================================================================
+# PLATFORM-LEVEL ANNOTATION FUNCTIONS
+# ============================================================================
+
+def add_platform_annotation(project_root: str, key: str, value: str, files: dict | None = None) -> dict:
+    """Add a default pod annotation to the platform layer.
+
+    This modifies two files:
+    1. templates/core/app.cue - Add/update defaultPodAnnotations struct and pass to template
+    2. templates/resources/deployment.cue - Accept and use defaultPodAnnotations
+
+    Returns dict with 'app_cue' and 'deployment_cue' keys containing modified content.
+    If files is given, pending (not yet written) contents are read from it by path.
+    """
+    app_cue_path = Path(project_root) / "templates" / "core" / "app.cue"
+    deployment_cue_path = Path(project_root) / "templates" / "resources" / "deployment.cue"
+
+    if not app_cue_path.exists():
+        raise ValueError(f"File not found: {app_cue_path}")
+    if not deployment_cue_path.exists():
+        raise ValueError(f"File not found: {deployment_cue_path}")
+
+    app_content = read_project_file(app_cue_path, files)
+    deployment_content = read_project_file(deployment_cue_path, files)
+
+    # app.cue: steps 1 and 2 are computed against the same original content
+    # and applied together, as are steps 3-5 for deployment.cue
+    app_edits = EditBuffer(app_content)
+    deployment_edits = EditBuffer(deployment_content)
+
+    # Step 1: Add/update defaultPodAnnotations in app.cue
+    _add_annotation_to_app_cue(app_edits, key, value)
+
+    # Step 2: Add defaultPodAnnotations to deployment template call (if not present)
+    _add_annotation_param_to_template_call(app_edits)
+
+    # Step 3: Add defaultPodAnnotations parameter to deployment.cue (if not present)
+    _add_annotation_param_to_deployment_cue(deployment_edits)
+
+    # Step 4: Add _podAnnotations merge logic (if not present)
+    _add_annotation_merge_logic(deployment_edits)
+
+    # Step 5: Update pod template to use _podAnnotations (if not already)
+    _update_pod_template_annotations(deployment_edits)
+
+    return {
+        'app_cue': app_edits.text(),
+        'deployment_cue': deployment_edits.text(),
+        'app_cue_path': str(app_cue_path),
+        'deployment_cue_path': str(deployment_cue_path),
+    }
+
+
+def _add_annotation_to_app_cue(edits: EditBuffer, key: str, value: str) -> None:
+    """Add or update an annotation in defaultPodAnnotations struct."""
+    index = edits.index
+    annotations = index.find_block('defaultPodAnnotations')
+
+    # Check if defaultPodAnnotations already exists
+    if annotations is not None:
+        if key in annotations.children:
+            # Update existing key
+            edits.replace_value(annotations.children[key], f'"{value}"')
+        else:
+            # Add new key after the opening brace of defaultPodAnnotations
+            edits.insert(annotations.open + 1, f'\n\t\t"{key}": "{value}"')
+        return
+
+    # Create new defaultPodAnnotations struct after defaultLabels
+    default_labels = index.find_block('defaultLabels')
+    if default_labels is None:
+        raise ValueError("Could not find defaultLabels block in app.cue")
+
+    new_struct = f'''
+
+\t// Default pod annotations applied to all deployments
+\t// Merged with any podAnnotations provided via appConfig.deployment.podAnnotations
+\tdefaultPodAnnotations: {{
+\t\t"{key}": "{value}"
+\t}}'''
+    edits.insert(default_labels.close + 1, new_struct)
+
+
+def _add_annotation_param_to_template_call(edits: EditBuffer) -> None:
+    """Add defaultPodAnnotations parameter to deployment template call."""
+    if '"defaultPodAnnotations":' in edits.content:
+        return  # Already present
+
+    # Find the deployment template call and add the parameter after appEnvFrom
+    pattern = r'("appEnvFrom":\s*_computedAppEnvFrom)'
+    replacement = r'\1\n\t\t\t"defaultPodAnnotations": defaultPodAnnotations'
+    edits.sub(pattern, replacement)
+
+
+def _add_annotation_param_to_deployment_cue(edits: EditBuffer) -> None:
+    """Add defaultPodAnnotations parameter to #DeploymentTemplate."""
+    if 'defaultPodAnnotations:' in edits.content:
+        return  # Already present
+
+    # Add after appEnvFrom parameter definition
+    pattern = r'(appEnvFrom:\s*\[\.\.\.[^\]]+\]\s*\|\s*\*\[\])'
+    replacement = r'''\1
+
+\t// Default pod annotations (provided by app.cue)
+\t// Merged with appConfig.deployment.podAnnotations
+\tdefaultPodAnnotations: [string]: string'''
+    edits.sub(pattern, replacement)
+
+
+def _add_annotation_merge_logic(edits: EditBuffer) -> None:
+    """Add _podAnnotations computed field that merges defaults with config."""
+    if '_podAnnotations:' in edits.content:
+        return  # Already present
+
+    # Add after _labels definition
+    pattern = r'(_labels:\s*_defaultLabels\s*&\s*appConfig\.labels)'
+    replacement = r'''\1
+
+\t// Computed pod annotations - merge defaults with config
+\t_podAnnotations: defaultPodAnnotations & (appConfig.deployment.podAnnotations | {})'''
+    edits.sub(pattern, replacement)
+
+
+def _update_pod_template_annotations(edits: EditBuffer) -> None:
+    """Update pod template to always render annotations using _podAnnotations."""
+    if 'annotations: _podAnnotations' in edits.content:
+        return  # Already updated
+
+    # Replace the conditional annotation block with direct assignment
+    # Pattern matches the if block for podAnnotations in the template metadata
+    pattern = r'if appConfig\.deployment\.podAnnotations != _\|_ \{\s*\n\s*annotations: appConfig\.deployment\.podAnnotations\s*\n\s*\}'
+    replacement = 'annotations: _podAnnotations'
+    edits.sub(pattern, replacement)
+
+
+# The comment header _add_annotation_to_app_cue writes above the struct, up to its opening brace
+_PLATFORM_ANNOTATIONS_HEADER = re.compile(
+    r'\n\s*// Default pod annotations[^\n]*\n\s*// Merged with[^\n]*\n\s*defaultPodAnnotations:\s*\{\Z')
+
+
+def remove_platform_annotation(project_root: str, key: str, files: dict | None = None) -> dict:
+    """Remove a default pod annotation from the platform layer.
+
+    Returns dict with modified content for both files.
+    """
+    app_cue_path = Path(project_root) / "templates" / "core" / "app.cue"
+    deployment_cue_path = Path(project_root) / "templates" / "resources" / "deployment.cue"
+
+    if not app_cue_path.exists():
+        raise ValueError(f"File not found: {app_cue_path}")
+
+    app_content = read_project_file(app_cue_path, files)
+    deployment_content = read_project_file(deployment_cue_path, files)
+    app_edits = EditBuffer(app_content)
+    deployment_edits = EditBuffer(deployment_content)
+
+    index = app_edits.index
+    annotations = index.find_block('defaultPodAnnotations')
+    removed = annotations and annotations.children.get(key)
+
+    # Check if defaultPodAnnotations is empty once the key is removed
+    emptied = False
+    if annotations is not None:
+        start, end = index.field_span(removed) if removed else (annotations.close, annotations.close)
+        emptied = not (app_content[annotations.open + 1:start] + app_content[end:annotations.close]).strip()
+    header = emptied and _PLATFORM_ANNOTATIONS_HEADER.search(app_content, 0, annotations.open + 1)
+
+    if header:
+        # Remove the entire defaultPodAnnotations block including comment
+        app_edits.delete(header.start(), annotations.close + 1)
+    elif removed is not None:
+        # Remove the specific annotation key from defaultPodAnnotations
+        app_edits.remove_field(removed)
+
+    if emptied:
+        # Also remove from template call
+        app_edits.sub(r'\n\s*"defaultPodAnnotations":\s*defaultPodAnnotations', '')
+
+        # Revert deployment.cue changes
+        # Remove _podAnnotations line
+        deployment_edits.sub(r'\n\s*// Computed pod annotations[^\n]*\n\s*_podAnnotations:[^\n]+', '')
+
+        # Remove defaultPodAnnotations parameter
+        deployment_edits.sub(
+            r'\n\s*// Default pod annotations[^\n]*\n\s*// Merged with[^\n]*\n\s*defaultPodAnnotations:[^\n]+', '')
+
+        # Revert to conditional annotation rendering
+        deployment_edits.sub(
+            r'annotations: _podAnnotations',
+            '''if appConfig.deployment.podAnnotations != _|_ {
+\t\t\t\t\tannotations: appConfig.deployment.podAnnotations
+\t\t\t\t}'''
+        )
+
+    return {
+        'app_cue': app_edits.text(),
+        'deployment_cue': deployment_edits.text(),
+        'app_cue_path': str(app_cue_path),
+        'deployment_cue_path': str(deployment_cue_path),
+    }
+
+
+# ============================================================================
+# APP-LEVEL POD ANNOTATION FUNCTIONS
+# ============================================================================
+
+def add_app_pod_annotation(content: str, app: str, key: str, value: str) -> str:
+    """Add a pod annotation override to an app's config in templates/apps/*.cue.
+
+    This adds appConfig.deployment.podAnnotations to override platform defaults.
+
+    This function operates on single-app files (templates/apps/*.cue); if the
+    app's appConfig is not found by name, the file's first appConfig is used.
+    This is consistent with other app-level functions like remove_app_configmap_entry.
+
+    Structure: postgres: core.#App & {
+        appName: "postgres"
+        appConfig: {
+            deployment: {
+                podAnnotations: {
+                    "prometheus.io/scrape": "false"
+                }
+            }
+        }
+    }
+    """
+    edits = EditBuffer(content)
+    index = edits.index
+    app_config = _app_config_block(index, app)
+
+    if app_config is None:
+        raise ValueError("Could not find appConfig block in file")
+
+    pod_annotations = index.block(*app_config.path, 'deployment', 'podAnnotations')
+    deployment = index.block(*app_config.path, 'deployment')
+    if pod_annotations is not None:
+        if key in pod_annotations.children:
+            # Replace existing value
+            edits.replace_value(pod_annotations.children[key], f'"{value}"')
+        else:
+            edits.insert(pod_annotations.open + 1, f'\n\t\t\t\t"{key}": "{value}"')
+    elif deployment is not None:
+        # appConfig.deployment exists without podAnnotations
+        new_block = f'\n\t\t\tpodAnnotations: {{\n\t\t\t\t"{key}": "{value}"\n\t\t\t}}'
+        edits.insert(deployment.open + 1, new_block)
+    else:
+        new_block = f'\n\t\tdeployment: {{\n\t\t\tpodAnnotations: {{\n\t\t\t\t"{key}": "{value}"\n\t\t\t}}\n\t\t}}'
+        edits.insert(app_config.open + 1, new_block)
+
+    return edits.text()
+
+
+def remove_app_pod_annotation(content: str, app: str, key: str) -> str:
+    """Remove a pod annotation override from an app's config.
+
+    Also cleans up empty podAnnotations and deployment blocks if they become empty.
+
+    This function operates on single-app files (templates/apps/*.cue); if the
+    app's appConfig is not found by name, the file's first appConfig is used.
+    This is consistent with other app-level functions like remove_app_configmap_entry.
+    """
+    edits = EditBuffer(content)
+    index = edits.index
+    app_config = _app_config_block(index, app)
+    annotation = app_config and index.field(*app_config.path, 'deployment', 'podAnnotations', key)
+
+    if annotation is None:
+        return content
+
+    # Remove the enclosing struct instead when the annotation is all it contains
+    removed = annotation
+    for parent in ('podAnnotations', 'deployment'):
+        parent_field = index.field(*removed.path[:-1])
+        start, end = index.field_span(removed)
+        block = parent_field.block
+        if parent_field.name != parent or block is None:
+            break
+        remaining = content[block.open + 1:start] + content[end:block.close]
+        if remaining.strip():
+            break
+        removed = parent_field
+
+    return edits.remove_field(removed).text()
+
+
+# ============================================================================
+# PLATFORM-LEVEL LABEL FUNCTIONS
+# ============================================================================
+
+def add_platform_label(project_root: str, key: str, value: str, files: dict | None = None) -> dict:
+    """Add a default label to the platform layer (defaultLabels in app.cue).
+
+    This modifies templates/core/app.cue to add a label to the defaultLabels struct.
+
+    Returns dict with 'app_cue' key containing modified content.
+    """
+    app_cue_path = Path(project_root) / "templates" / "core" / "app.cue"
+
+    if not app_cue_path.exists():
+        raise ValueError(f"File not found: {app_cue_path}")
+
+    app_content = read_project_file(app_cue_path, files)
+
+    # Add/update label in defaultLabels
+    edits = EditBuffer(app_content)
+    _add_label_to_default_labels(edits, key, value)
+
+    return {
+        'app_cue': edits.text(),
+        'app_cue_path': str(app_cue_path),
+    }
+
+
+def _add_label_to_default_labels(edits: EditBuffer, key: str, value: str) -> None:
+    """Add or update a label in defaultLabels struct.
+
+    Uses CUE default value syntax (string | *"value") to allow environment-level
+    overrides. This ensures environment-specific labels can override platform defaults.
+    """
+    # Find the defaultLabels block
+    default_labels = edits.index.find_block('defaultLabels')
+    if default_labels is None:
+        raise ValueError("Could not find defaultLabels block in app.cue")
+
+    # Use CUE default value syntax: string | *"value"
+    # This allows environment-level overrides to take precedence
+    default_value_syntax = f'string | *"{value}"'
+
+    # Key may exist quoted or unquoted; the index normalizes both
+    if key in default_labels.children:
+        edits.replace_value(default_labels.children[key], default_value_syntax)
+    else:
+        # Add new key before the closing brace (keys with special characters need quoting)
+        edits.append_entries(default_labels, [f'"{key}": {default_value_syntax}'], '\t\t')
+
+
+def remove_platform_label(project_root: str, key: str, files: dict | None = None) -> dict:
+    """Remove a label from the platform layer (defaultLabels in app.cue).
+
+    Returns dict with modified content.
+    """
+    app_cue_path = Path(project_root) / "templates" / "core" / "app.cue"
+
+    if not app_cue_path.exists():
+        raise ValueError(f"File not found: {app_cue_path}")
+
+    edits = EditBuffer(read_project_file(app_cue_path, files))
+
+    # Find the defaultLabels block
+    default_labels = edits.index.find_block('defaultLabels')
+    if default_labels is None:
+        raise ValueError("Could not find defaultLabels block in app.cue")
+
+    # Remove the key (could be quoted or unquoted)
+    if key in default_labels.children:
+        edits.remove_field(default_labels.children[key])
+
+    return {
+        'app_cue': edits.text(),
+        'app_cue_path': str(app_cue_path),
+    }
+
+
+# ============================================================================
+# ENVIRONMENT-LEVEL LABEL FUNCTIONS
+# ============================================================================
+
+def add_env_label(content: str, env: str, app: str, key: str, value: str) -> str:
+    """Add a label to an environment's app config in env.cue (appConfig.labels).
+
+    Structure: <env>: <app>: apps.<appRef> & {
+        appConfig: {
+            labels: {
+                environment: "env"
+                managed_by:  "argocd"
+                "new-key": "new-value"
+            }
+            ...
+        }
+    }
+    """
+    edits = EditBuffer(content)
+    index = edits.index
+    if index.block(env, app) is None:
+        raise ValueError(f"Could not find app '{app}' in environment '{env}'")
+
+    labels = index.block(env, app, 'appConfig', 'labels')
+    app_config = index.block(env, app, 'appConfig')
+    if labels is not None:
+        # Key may exist quoted or unquoted; the index normalizes both
+        if key in labels.children:
+            edits.replace_value(labels.children[key], f'"{value}"')
+        else:
+            # Add new entry before the closing brace of labels block
+            edits.append_entries(labels, [f'{_label_key(key)}: "{value}"'], '\t\t\t')
+    elif app_config is not None:
+        # appConfig exists without a labels block
+        new_block = f'\n\t\tlabels: {{\n\t\t\t{_label_key(key)}: "{value}"\n\t\t}}'
+        edits.insert(app_config.open + 1, new_block)
+    else:
+        raise ValueError(f"Could not find appConfig block for app '{app}' in environment '{env}'")
+
+    return edits.text()
+
+
+def remove_env_label(content: str, env: str, app: str, key: str) -> str:
+    """Remove a label from an environment's app config (appConfig.labels)."""
+    edits = EditBuffer(content)
+    label = edits.index.field(env, app, 'appConfig', 'labels', key)
+
+    if label is None:
+        return content  # Nothing to remove if app or label doesn't exist
+
+    return edits.remove_field(label).text()
@@ -0,0 +1,164 @@
+"""Project files: locating the module root, cached reads, staged writes and locks."""
+
+import contextlib
+import fcntl
+import hashlib
+import os
+from pathlib import Path
+
+from .trace import TRACE
+
+# shutil and tempfile are imported by write_files, the only code that needs them.
+
+# Per-project directory for validation results, staged writes and lock files
+CACHE_DIR_NAME = '.cue-edit-cache'
+
+
+def find_project_root(file_path: str) -> str:
+    """Find the project root (directory containing cue.mod or templates/)."""
+    path = Path(file_path).resolve()
+    # If it's a file, start from its parent directory
+    if path.is_file():
+        path = path.parent
+    # Check current directory first, then walk up
+    while path != path.parent:
+        if (path / "cue.mod").exists() or (path / "templates").exists():
+            return str(path)
+        path = path.parent
+    # Fallback to original path
+    return str(Path(file_path).resolve())
+
+
+# File contents read so far: path -> ((mtime_ns, size, inode), content).
+# Entries are only reused while the file's stat signature is unchanged, so a
+# long-running process (serve mode) sees edits made by other tools.
+_FILE_CACHE = {}
+
+
+def _stat_signature(path) -> tuple:
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _stat_memo(cache: dict, path, compute):
+    """Return compute(path), reusing the cached result while the file is unchanged."""
+    signature = _stat_signature(path)
+    cached = cache.get(str(path))
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    result = compute(path)
+    cache[str(path)] = (signature, result)
+    return result
+
+
+def read_project_file(path: Path, files: dict | None = None) -> str:
+    """Read a file, preferring pending in-memory content from files (keyed by path)."""
+    if files is not None and str(path) in files:
+        return files[str(path)]
+    return _stat_memo(_FILE_CACHE, path, _read_text)
+
+
+def _read_text(path: Path) -> str:
+    with TRACE.span('read', path=str(path)):
+        content = path.read_text()
+    TRACE.add_bytes('read', len(content))
+    return content
+
+
+def module_cue_files(project_root: str, include_cue_mod: bool = True) -> list[str]:
+    """List the module's .cue files (relative paths, sorted), skipping hidden (., _) directories."""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(project_root):
+        rel_dir = os.path.relpath(dirpath, project_root)
+        dirnames[:] = sorted(
+            d for d in dirnames
+            if not d.startswith(('.', '_')) and (include_cue_mod or rel_dir != '.' or d != 'cue.mod')
+        )
+        files.extend(
+            os.path.normpath(os.path.join(rel_dir, name))
+            for name in filenames if name.endswith('.cue')
+        )
+    return sorted(files)
+
+
+def write_files(files: dict):
+    """Replace several files (path -> content) together.
+
+    Every new content is first written to a staging directory under its
+    project's .cue-edit-cache/, so a failure while writing (disk full,
+    interrupt) leaves all real files untouched; only then is each file
+    replaced with os.replace, which readers see as old or new, never partial.
+    Later reads (read_project_file) reuse the new contents.
+    """
+    import shutil
+    import tempfile
+
+    staging_dirs, staged = {}, []
+    try:
+        for path, content in files.items():
+            path = Path(path)
+            project_root = find_project_root(str(path))
+            if project_root not in staging_dirs:
+                base = Path(project_root) / CACHE_DIR_NAME / 'staging'
+                base.mkdir(parents=True, exist_ok=True)
+                staging_dirs[project_root] = tempfile.mkdtemp(dir=base)
+            tmp_path = os.path.join(staging_dirs[project_root], f'{len(staged)}-{path.name}')
+            with TRACE.span('write', path=str(path)):
+                with open(tmp_path, 'w') as f:
+                    f.write(content)
+                if path.exists():
+                    shutil.copymode(path, tmp_path)
+            TRACE.add_bytes('written', len(content))
+            staged.append((tmp_path, path))
+
+        for tmp_path, path in staged:
+            os.replace(tmp_path, path)
+    finally:
+        for staging_dir in staging_dirs.values():
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    for path, content in files.items():
+        _FILE_CACHE[str(path)] = (_stat_signature(path), content)
+
+
+# ============================================================================
+# LOCKING
+# ============================================================================
+#
+# Concurrent runs on one checkout (parallel Jenkins executors, demo scripts)
+# coordinate through advisory fcntl locks, one lock file per .cue file under
+# <project_root>/.cue-edit-cache/locks/. Writers hold an exclusive lock on every
+# file they edit from reading it until the new content is in place, so
+# overlapping edits serialise instead of losing updates; readers that need a
+# consistent view of several files hold shared locks. All locks a run needs are
+# taken at once in sorted path order, so runs cannot deadlock, and runs editing
+# different files never wait for each other.
+
+def _lock_path(path: str) -> str:
+    """Return the lock file for path, creating the locks directory if needed."""
+    project_root = find_project_root(path)
+    lock_dir = os.path.join(project_root, CACHE_DIR_NAME, 'locks')
+    os.makedirs(lock_dir, exist_ok=True)
+    rel_path = os.path.relpath(path, project_root)
+    name = hashlib.sha256(rel_path.encode()).hexdigest()[:16]
+    return os.path.join(lock_dir, f'{os.path.basename(path)}.{name}.lock')
+
+
+@contextlib.contextmanager
+def lock_files(exclusive=(), shared=()):
+    """Hold exclusive locks on the files being written and shared locks on files only read."""
+    modes = {str(Path(path).resolve()): fcntl.LOCK_SH for path in shared}
+    modes.update({str(Path(path).resolve()): fcntl.LOCK_EX for path in exclusive})
+
+    with contextlib.ExitStack() as stack:
+        with TRACE.span('lock', files=len(modes)):
+            for path in sorted(modes):
+                try:
+                    fd = os.open(_lock_path(path), os.O_RDWR | os.O_CREAT, 0o644)
+                except OSError:
+                    if modes[path] == fcntl.LOCK_EX:
+                        raise
+                    continue  # read-only checkout: no writer can hold the file either
+                stack.callback(os.close, fd)  # closing the descriptor releases the lock
+                fcntl.flock(fd, modes[path])
+        yield
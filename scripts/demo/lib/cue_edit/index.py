@@ -0,0 +1,397 @@
+"""Structural index of CUE file contents and the offset-based EditBuffer."""
+
+import functools
+import itertools
+import json
+import re
+
+from .trace import TRACE
+
+
+def find_block_end(content: str, start_pos: int) -> int:
+    """Find the position of the closing brace that matches the opening brace at start_pos."""
+    with TRACE.span('find_block_end'):
+        depth = 0
+        in_string = False
+        escape_next = False
+
+        for i, char in enumerate(content[start_pos:], start=start_pos):
+            if escape_next:
+                escape_next = False
+                continue
+            if char == '\\':
+                escape_next = True
+                continue
+            if char == '"' and not escape_next:
+                in_string = not in_string
+                continue
+            if in_string:
+                continue
+            if char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    return i
+        return -1
+
+
+# ============================================================================
+# STRUCTURAL INDEX
+# ============================================================================
+#
+# The edit functions resolve CUE paths such as dev.exampleApp.appConfig.labels
+# through a structural index instead of re-running regex searches and
+# find_block_end scans for every operation.
+#
+# Top-level fields are found with a single regex pass (CUE files are cue-fmt
+# formatted, so top-level labels start at column 0). Each top-level field's
+# text is tokenized lazily, the first time a path under it is requested, so
+# resolving one app in a file with thousands of apps only tokenizes that app.
+
+# Top-level field header, e.g. "dev: exampleApp: apps.exampleApp & {"
+# Anchored on the preceding newline rather than ^ with re.MULTILINE: the literal
+# prefix lets the regex engine skip ahead, which is several times faster on large files.
+_TOPLEVEL_RE = re.compile(
+    r'\n(?=[#A-Za-z_$"])((?:(?:\#?[A-Za-z_$][\w$]*|"(?:[^"\\\n]|\\.)*")[?!]?[ \t]*:(?![:=])[ \t]*)+)'
+)
+_TOPLEVEL_HEAD_RE = re.compile(_TOPLEVEL_RE.pattern[2:])
+_LABEL_RE = re.compile(r'(\#?[A-Za-z_$][\w$]*|"(?:[^"\\\n]|\\.)*")[?!]?[ \t]*:')
+
+_TOKEN_RE = re.compile(r'''
+      (?P<comment>//[^\n]*)
+    | (?P<label>(?:\#?[A-Za-z_$][\w$]*|"(?:[^"\\\n]|\\.)*")[?!]?[ \t]*:(?![:=]))
+    | (?P<string>"""[\s\S]*?"""|"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+    | (?P<open>[{\[(])
+    | (?P<close>[}\])])
+    | (?P<sep>[\n,])
+    | (?P<other>[^\s"'{}\[\](),/]+|/)
+''', re.VERBOSE)
+
+_LABEL_NAME_RE = re.compile(r'\#?[A-Za-z_$][\w$]*|"(?:[^"\\\n]|\\.)*"')
+_VALUE_START_RE = re.compile(r'[ \t]*')
+
+
+def _unquote_label(label: str) -> str:
+    """Return the field name for a label token (quoted labels are unquoted)."""
+    if label.startswith('"'):
+        try:
+            return json.loads(label)
+        except json.JSONDecodeError:
+            return label[1:-1]
+    return label
+
+
+class Block:
+    """A struct literal: offsets of its braces and its named child fields."""
+
+    __slots__ = ('path', 'open', 'close', 'children')
+
+    def __init__(self, path: tuple, open_pos: int):
+        self.path = path
+        self.open = open_pos    # offset of '{'
+        self.close = -1         # offset of the matching '}'
+        self.children = {}      # name -> Field, in document order
+
+
+class Field:
+    """A field: offsets of its label and value, and its struct value if any."""
+
+    __slots__ = ('name', 'path', 'start', 'label_end', 'end', 'block')
+
+    def __init__(self, name: str, path: tuple, start: int, label_end: int):
+        self.name = name
+        self.path = path
+        self.start = start          # offset of the label
+        self.label_end = label_end  # offset just after the ':'
+        self.end = label_end        # offset just after the value
+        self.block = None           # Block if the value is (or contains) a struct
+
+
+class _Frame:
+    __slots__ = ('path', 'kind', 'block', 'chain', 'value_started', 'last_end')
+
+    def __init__(self, path, kind, block, last_end):
+        self.path = path            # None inside lists and anonymous structs
+        self.kind = kind
+        self.block = block
+        self.chain = []             # fields of the current "a: b: c" label chain
+        self.value_started = False
+        self.last_end = last_end
+
+
+class CueIndex:
+    """Structural index over the text of one CUE file.
+
+    Paths are tuples of field names from the file root, e.g.
+    ('dev', 'exampleApp', 'appConfig', 'configMap', 'data'). Fields inside
+    lists and comprehension bodies are not indexed. When a path is defined
+    more than once, the first definition in the file wins.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+        self.blocks = {}
+        self.fields = {}
+        self._segments = []         # [start, end, label chain, indexed]
+        self._by_prefix = {}        # label chain prefix -> segment numbers
+        self._max_depth = 0
+
+        root = Block((), -1)
+        root.close = len(content)
+        self.blocks[()] = root
+
+        head = _TOPLEVEL_HEAD_RE.match(content)
+        for match in itertools.chain([head] if head else [], _TOPLEVEL_RE.finditer(content)):
+            start = match.start(1)
+            chain = tuple(_unquote_label(m.group(1)) for m in _LABEL_RE.finditer(match.group(1)))
+            if self._segments:
+                self._segments[-1][1] = start
+            number = len(self._segments)
+            self._segments.append([start, len(content), chain, False])
+            for depth in range(1, len(chain) + 1):
+                self._by_prefix.setdefault(chain[:depth], []).append(number)
+            self._max_depth = max(self._max_depth, len(chain))
+
+    def block(self, *path: str) -> Block | None:
+        """Return the struct at path, or None."""
+        self._ensure(path)
+        return self.blocks.get(path)
+
+    def field(self, *path: str) -> Field | None:
+        """Return the field at path, or None."""
+        self._ensure(path)
+        return self.fields.get(path)
+
+    def children(self, *path: str) -> dict:
+        """Return the named child fields of the struct at path."""
+        block = self.block(*path)
+        return block.children if block else {}
+
+    def find_block(self, name: str) -> Block | None:
+        """Return the first struct (in document order) whose field is named name."""
+        self._ensure_all()
+        found = [b for p, b in self.blocks.items() if p and p[-1] == name]
+        return min(found, key=lambda b: b.open) if found else None
+
+    def descendants(self, block: Block):
+        """Yield fields nested under block in document order (depth first)."""
+        for child in block.children.values():
+            yield child
+            if child.block is not None and child.block.path == child.path:
+                yield from self.descendants(child.block)
+
+    def value_start(self, field: Field) -> int:
+        """Offset of the first character of a field's value."""
+        return _VALUE_START_RE.match(self.content, field.label_end).end()
+
+    def line_start(self, pos: int) -> int:
+        return self.content.rfind('\n', 0, pos) + 1
+
+    def indent_of(self, pos: int) -> str:
+        """Whitespace before pos when pos is the first non-blank character of its line, else ''."""
+        start = self.line_start(pos)
+        return self.content[start:pos] if not self.content[start:pos].strip() else ''
+
+    def line_indent(self, pos: int) -> str:
+        """Leading whitespace of the line containing pos."""
+        start = self.line_start(pos)
+        line = self.content[start:pos]
+        return line[:len(line) - len(line.lstrip(' \t'))]
+
+    def field_span(self, field: Field) -> tuple[int, int]:
+        """Span to delete to remove a field, including its whole line when it has one."""
+        content = self.content
+        start, end = field.start, field.end
+        line_start = self.line_start(start)
+        if not content[line_start:start].strip():
+            start = line_start
+        # Consume an optional separator, trailing comment and the newline
+        while end < len(content) and content[end] in ' \t,':
+            end += 1
+        if content.startswith('//', end):
+            end = content.find('\n', end)
+            end = len(content) if end == -1 else end
+        if start == line_start and content.startswith('\n', end):
+            end += 1
+        return start, end
+
+    def _ensure(self, path: tuple):
+        """Tokenize every top-level segment that may define path."""
+        for depth in range(min(len(path), self._max_depth), 0, -1):
+            numbers = self._by_prefix.get(path[:depth])
+            if numbers:
+                for number in numbers:
+                    self._index_segment(number)
+                return
+
+    def _ensure_all(self):
+        for number in range(len(self._segments)):
+            self._index_segment(number)
+
+    def _register(self, parent_path: tuple, field: Field):
+        existing = self.fields.get(field.path)
+        if existing is None or field.start < existing.start:
+            self.fields[field.path] = field
+        parent = self.blocks.get(parent_path)
+        if parent is None and parent_path:
+            # Implicit struct from a label chain such as "dev: exampleApp: {...}"
+            parent = self.blocks[parent_path] = Block(parent_path, -1)
+        if parent is not None:
+            current = parent.children.get(field.name)
+            if current is None or field.start < current.start:
+                parent.children[field.name] = field
+
+    def _index_segment(self, number: int):
+        segment = self._segments[number]
+        if segment[3]:
+            return
+        segment[3] = True
+        start, end = segment[0], segment[1]
+
+        frame = _Frame((), '{', self.blocks[()], start)
+        stack = [frame]
+
+        def end_chain(frame):
+            for f in frame.chain:
+                f.end = max(frame.last_end, f.label_end)
+            frame.chain = []
+            frame.value_started = False
+
+        for match in _TOKEN_RE.finditer(self.content, start, end):
+            kind = match.lastgroup
+            frame = stack[-1]
+
+            if kind == 'label' and frame.kind == '{':
+                if frame.chain and frame.value_started:
+                    end_chain(frame)
+                parent_path = frame.chain[-1].path if frame.chain else frame.path
+                name = _unquote_label(_LABEL_NAME_RE.match(match.group()).group())
+                path = None if parent_path is None else parent_path + (name,)
+                field = Field(name, path, match.start(), match.end())
+                if path is not None:
+                    self._register(parent_path, field)
+                frame.chain.append(field)
+                frame.last_end = match.end()
+            elif kind == 'open':
+                char = match.group()
+                path = frame.chain[-1].path if char == '{' and frame.kind == '{' and frame.chain else None
+                frame.value_started = True
+                block = None
+                if char == '{':
+                    block = Block(path, match.start())
+                    if path is not None:
+                        existing = self.blocks.get(path)
+                        if existing is None or existing.open < 0 or block.open < existing.open:
+                            if existing is not None:
+                                block.children = existing.children
+                            self.blocks[path] = block
+                    if frame.chain and frame.chain[-1].block is None:
+                        frame.chain[-1].block = block
+                stack.append(_Frame(path, char, block, match.end()))
+            elif kind == 'close':
+                if len(stack) == 1:
+                    continue
+                end_chain(stack.pop())
+                if frame.block is not None:
+                    frame.block.close = match.start()
+                parent = stack[-1]
+                parent.value_started = True
+                parent.last_end = match.end()
+            elif kind == 'sep':
+                if frame.chain and frame.value_started:
+                    end_chain(frame)
+            elif kind in ('string', 'other', 'label'):
+                frame.value_started = True
+                frame.last_end = match.end()
+
+        # Unterminated structs at the end of a segment (malformed input)
+        while stack:
+            end_chain(stack.pop())
+
+
+@functools.lru_cache(maxsize=16)
+def index_content(content: str) -> CueIndex:
+    """Return the (cached) structural index for a file's content."""
+    with TRACE.span('index', bytes=len(content)):
+        return CueIndex(content)
+
+
+class EditBuffer:
+    """Pending edits to one file's content, recorded by offset and applied once.
+
+    Offsets always refer to the original content (the text the index was
+    built from), so an operation can record several insertions, replacements
+    and deletions without rebuilding the string or re-indexing in between.
+    text() joins the untouched pieces and the new text in a single pass.
+    Edits must not overlap; insertions at the same offset keep their order.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+        self.edits: list[tuple[int, int, int, str]] = []
+
+    @property
+    def index(self) -> CueIndex:
+        return index_content(self.content)
+
+    def replace(self, start: int, end: int, text: str) -> 'EditBuffer':
+        self.edits.append((start, end, len(self.edits), text))
+        return self
+
+    def insert(self, pos: int, text: str) -> 'EditBuffer':
+        return self.replace(pos, pos, text)
+
+    def delete(self, start: int, end: int) -> 'EditBuffer':
+        return self.replace(start, end, '')
+
+    def replace_value(self, field: Field, value: str) -> 'EditBuffer':
+        """Replace a field's value with value (a CUE literal)."""
+        return self.replace(self.index.value_start(field), field.end, value)
+
+    def remove_field(self, field: Field) -> 'EditBuffer':
+        """Remove a field (and its line)."""
+        return self.delete(*self.index.field_span(field))
+
+    def append_entries(self, block: Block, entries: list[str], default_indent: str) -> 'EditBuffer':
+        """Insert entries as the last fields of block, matching the existing entries' indentation."""
+        return self.insert(*_append_splice(self.index, block, entries, default_indent))
+
+    def sub(self, pattern: str, repl: str) -> 'EditBuffer':
+        """Record a replacement for every match of pattern, like re.sub on the original content."""
+        for match in re.finditer(pattern, self.content):
+            self.replace(match.start(), match.end(), match.expand(repl))
+        return self
+
+    def text(self) -> str:
+        """Materialize the edited content."""
+        if not self.edits:
+            return self.content
+        parts, pos = [], 0
+        for start, end, _, text in sorted(self.edits):
+            if start < pos:
+                raise ValueError(f"Overlapping edits at offset {start}")
+            parts.append(self.content[pos:start])
+            parts.append(text)
+            pos = end
+        parts.append(self.content[pos:])
+        return ''.join(parts)
+
+
+def _append_splice(index: CueIndex, block: Block, entries: list[str], default_indent: str) -> tuple[int, str]:
+    """Return (position, text) inserting entries as the last fields of block.
+
+    Entries match the existing entries' indentation.
+    """
+    content = index.content
+    children = list(block.children.values())
+    indent = (index.indent_of(children[0].start) if children else '') or default_indent
+    text = ''.join(f'\n{indent}{entry}' for entry in entries)
+
+    close_line = index.line_start(block.close)
+    if close_line > block.open + 1 and not content[close_line:block.close].strip():
+        # Insert after the last entry, before the newline preceding the closing brace line
+        return close_line - 1, text
+
+    # Fallback: closing brace shares a line with other content
+    return block.close, f'{text}\n{index.line_indent(block.open)}'
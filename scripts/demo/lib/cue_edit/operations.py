@@ -0,0 +1,218 @@
+"""Edit operations: dispatching operation dicts to edit functions, and rendering dry-run diffs."""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+from .edits import (
+    add_app_configmap_entry, add_app_pod_annotation, add_env_configmap_entry, add_env_label,
+    add_platform_annotation, add_platform_label, import_app_configmap_file,
+    import_env_configmap_file, remove_app_configmap_entry, remove_app_pod_annotation,
+    remove_env_configmap_entry, remove_env_field, remove_env_label, remove_platform_annotation,
+    remove_platform_label, set_env_field,
+)
+from .files import find_project_root, read_project_file
+from .trace import TRACE
+
+# difflib is imported by the dry-run renderers, the only code that needs it.
+
+
+# ============================================================================
+# DRY RUN (--dry-run / --diff)
+# ============================================================================
+#
+# A dry run stops after the in-memory edit: the new contents are compared
+# with the files on disk and printed as a unified diff (paths relative to the
+# project root, so 'git apply' takes it) or as a JSON patch of line hunks.
+# Nothing is written and cue is not run.
+
+DIFF_FORMATS = ('unified', 'json')
+
+
+def _diff_name(path: str) -> str:
+    return os.path.relpath(path, find_project_root(path))
+
+
+def _unified_diff(path: str, old: str, new: str) -> str:
+    import difflib
+
+    name = _diff_name(path)
+    lines = []
+    for line in difflib.unified_diff(old.splitlines(True), new.splitlines(True), f'a/{name}', f'b/{name}'):
+        lines.append(line if line.endswith('\n') else f'{line}\n\\ No newline at end of file\n')
+    return ''.join(lines)
+
+
+def _json_patch(path: str, old: str, new: str) -> dict:
+    """Line hunks (1-based starts) turning old into new."""
+    import difflib
+
+    old_lines, new_lines = old.splitlines(True), new.splitlines(True)
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    hunks = [
+        {'old_start': i1 + 1, 'old_lines': old_lines[i1:i2], 'new_start': j1 + 1, 'new_lines': new_lines[j1:j2]}
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal'
+    ]
+    return {'path': path, 'file': _diff_name(path), 'hunks': hunks}
+
+
+def render_diff(changed: dict, originals: dict, fmt: str = 'unified'):
+    """Render changed (path -> new content) against originals: a diff string, or a list of patches for 'json'."""
+    if fmt not in DIFF_FORMATS:
+        raise ValueError(f"Unknown diff format: {fmt} (expected one of {', '.join(DIFF_FORMATS)})")
+    with TRACE.span('diff', files=len(changed)):
+        if fmt == 'json':
+            return [_json_patch(path, originals[path], content) for path, content in sorted(changed.items())]
+        return ''.join(_unified_diff(path, originals[path], content) for path, content in sorted(changed.items()))
+
+
+# ============================================================================
+# OPERATION DISPATCH
+# ============================================================================
+
+# Maps (command, action) to the edit function and the operation fields it takes.
+# File operations take the target file's content as their first argument;
+# platform operations take the project root and return a dict of file contents.
+# Fields written as 'name=default' are optional.
+FILE_OPERATIONS = {
+    ('env-configmap', 'add'): (add_env_configmap_entry, ('env', 'app', 'key', 'value')),
+    ('env-configmap', 'remove'): (remove_env_configmap_entry, ('env', 'app', 'key')),
+    ('env-configmap', 'import'): (import_env_configmap_file, ('env', 'app', 'source', 'mode=merge', 'format=')),
+    ('app-configmap', 'add'): (add_app_configmap_entry, ('app', 'key', 'value')),
+    ('app-configmap', 'remove'): (remove_app_configmap_entry, ('app', 'key')),
+    ('app-configmap', 'import'): (import_app_configmap_file, ('app', 'source', 'mode=merge', 'format=')),
+    ('env-field', 'set'): (set_env_field, ('env', 'app', 'field', 'value')),
+    ('env-field', 'remove'): (remove_env_field, ('env', 'app', 'field')),
+    ('env-label', 'add'): (add_env_label, ('env', 'app', 'key', 'value')),
+    ('env-label', 'remove'): (remove_env_label, ('env', 'app', 'key')),
+    ('app-annotation', 'add'): (add_app_pod_annotation, ('app', 'key', 'value')),
+    ('app-annotation', 'remove'): (remove_app_pod_annotation, ('app', 'key')),
+}
+
+PLATFORM_OPERATIONS = {
+    ('platform-annotation', 'add'): (add_platform_annotation, ('key', 'value')),
+    ('platform-annotation', 'remove'): (remove_platform_annotation, ('key',)),
+    ('platform-label', 'add'): (add_platform_label, ('key', 'value')),
+    ('platform-label', 'remove'): (remove_platform_label, ('key',)),
+}
+
+# Files (relative to the project root) each platform command edits
+PLATFORM_FILES = {
+    'platform-annotation': ('templates/core/app.cue', 'templates/resources/deployment.cue'),
+    'platform-label': ('templates/core/app.cue',),
+}
+
+# Commands whose changes can affect every app, so they are validated at the
+# package level with -c=false (main branch env.cue is incomplete by design).
+MODULE_VET_COMMANDS = {'platform-annotation', 'platform-label', 'app-annotation'}
+
+# Commands that only change one app in one environment, so validating that
+# app's expression is enough. All other commands vet the edited file.
+APP_SCOPED_COMMANDS = {'env-configmap', 'env-field', 'env-label'}
+
+
+def _operation_args(op: dict, fields: tuple) -> list:
+    """Extract the positional arguments for an operation, in order."""
+    missing = [f for f in fields if '=' not in f and f not in op]
+    if missing:
+        raise ValueError(f"Operation {op.get('command')} {op.get('action')} is missing: {', '.join(missing)}")
+    args = []
+    for field in fields:
+        name, _, default = field.partition('=')
+        args.append(str(op.get(name, default)))
+    return args
+
+
+def apply_operations(operations: list, files: dict | None = None,
+                     base_dir: str | None = None) -> tuple[dict, set]:
+    """Apply operations to in-memory file contents without touching the disk.
+
+    Each operation is a dict with 'command' and 'action' keys plus the fields
+    of the matching CLI subcommand (e.g. file, env, app, key, value). Relative
+    file paths are resolved against base_dir (default: the current directory);
+    platform operations locate the project root from base_dir like the CLI
+    does from the current directory.
+
+    Returns (files, validations): files maps absolute paths to new contents,
+    validations is a set of (project_root, scope, file, expression) tuples
+    describing what each edit needs validated (see plan_validation).
+    """
+    files = {} if files is None else files
+    validations = set()
+
+    for op in operations:
+        with TRACE.span('edit', command=op.get('command'), action=op.get('action')):
+            _apply_operation(op, files, validations, base_dir)
+
+    return files, validations
+
+
+def operation_paths(operations: list, base_dir: str | None = None) -> set[str]:
+    """Return the absolute paths of the files operations will edit (see lock_files)."""
+    paths = set()
+    for op in operations:
+        if op.get('command') in PLATFORM_FILES:
+            project_root = find_project_root(base_dir or str(Path.cwd()))
+            paths.update(os.path.join(project_root, rel_path) for rel_path in PLATFORM_FILES[op['command']])
+        elif 'file' in op:
+            paths.add(str(Path(base_dir or '.', op['file']).resolve()))
+    return paths
+
+
+def _apply_operation(op: dict, files: dict, validations: set, base_dir: str | None = None):
+    """Apply one operation to files and record its validations (see apply_operations)."""
+    command, action = op.get('command'), op.get('action')
+
+    if (command, action) in PLATFORM_OPERATIONS:
+        func, fields = PLATFORM_OPERATIONS[(command, action)]
+        project_root = find_project_root(base_dir or str(Path.cwd()))
+        results = func(project_root, *_operation_args(op, fields), files=files)
+        files[results['app_cue_path']] = results['app_cue']
+        validations.add((project_root, 'module', results['app_cue_path'], None))
+        if 'deployment_cue_path' in results:
+            files[results['deployment_cue_path']] = results['deployment_cue']
+            validations.add((project_root, 'module', results['deployment_cue_path'], None))
+        return
+
+    if (command, action) not in FILE_OPERATIONS:
+        if command not in {c for c, _ in FILE_OPERATIONS} | {c for c, _ in PLATFORM_OPERATIONS}:
+            raise ValueError(f"Unknown command: {command}")
+        raise ValueError(f"Unknown action: {action}")
+
+    func, fields = FILE_OPERATIONS[(command, action)]
+    if 'file' not in op:
+        raise ValueError(f"Operation {command} {action} is missing: file")
+    file_path = Path(base_dir or '.', op['file']).resolve()
+    if str(file_path) not in files and not file_path.exists():
+        raise ValueError(f"File not found: {file_path}")
+
+    content = read_project_file(file_path, files)
+    files[str(file_path)] = func(content, *_operation_args(op, fields))
+
+    project_root = find_project_root(str(file_path))
+    if command in MODULE_VET_COMMANDS:
+        validations.add((project_root, 'module', str(file_path), None))
+    elif command in APP_SCOPED_COMMANDS:
+        validations.add((project_root, 'app', str(file_path), f"{op['env']}.{op['app']}"))
+    else:
+        validations.add((project_root, 'file', str(file_path), None))
+
+
+def load_plan(plan_path: str) -> list:
+    """Load operations from a JSON array, a {"operations": [...]} object or JSON lines.
+
+    A plan_path of '-' reads from stdin.
+    """
+    text = sys.stdin.read() if plan_path == '-' else Path(plan_path).read_text()
+
+    try:
+        plan = json.loads(text)
+    except json.JSONDecodeError:
+        plan = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    if isinstance(plan, dict):
+        plan = plan.get('operations', [plan])
+    if not isinstance(plan, list) or not all(isinstance(op, dict) for op in plan):
+        raise ValueError("Plan must be a list of operation objects")
+    return plan
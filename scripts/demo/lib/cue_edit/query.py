@@ -0,0 +1,111 @@
+"""Read-only queries (get / list) answered from the file, else with cue export."""
+
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from .files import find_project_root, lock_files, module_cue_files, read_project_file
+from .index import CueIndex, Field, index_content
+from .validation import run_cue
+
+
+#
+# Reading one value with 'cue export' evaluates the whole module. A scalar
+# written literally in the file is already the evaluated value (unification
+# can only confirm it), so get answers those from the structural index and
+# only exports values that are inherited from templates, are expressions, or
+# are structs and lists (which unify with template defaults).
+
+_SCALAR_LITERAL_RE = re.compile(r'"(?:[^"\\\n]|\\.)*"|-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null')
+_QUERY_PATH_RE = re.compile(r'(?:"[^"]*"|[^".]+)(?:\.(?:"[^"]*"|[^".]+))*')
+_IDENTIFIER_RE = re.compile(r'[A-Za-z_$#][A-Za-z0-9_$#]*')
+
+
+def parse_query_path(path: str) -> list[str]:
+    """Split a dotted path into labels; labels containing dots are quoted, e.g. data."log.level"."""
+    if not path:
+        return []
+    if not _QUERY_PATH_RE.fullmatch(path):
+        raise ValueError(f"Invalid path: {path}")
+    return [quoted or plain for quoted, plain in re.findall(r'"([^"]*)"|([^".]+)', path)]
+
+
+def _cue_expression(labels: list[str]) -> str:
+    """Build a cue -e expression, quoting labels that are not identifiers."""
+    return '.'.join(label if _IDENTIFIER_RE.fullmatch(label) else json.dumps(label) for label in labels)
+
+
+def _literal_value(index: CueIndex, field: Field):
+    """Return (True, value) if field's value is a scalar literal, else (False, None)."""
+    text = index.content[index.value_start(field):field.end].strip()
+    if field.block is not None or not _SCALAR_LITERAL_RE.fullmatch(text):
+        return False, None
+    try:
+        return True, json.loads(text)
+    except ValueError:
+        return False, None
+
+
+def _export_value(file_path: str, labels: list[str]):
+    """Evaluate <labels> in file with 'cue export' (the fallback for get and list)."""
+    if file_path == '-':
+        raise ValueError(f"{_cue_expression(labels)} is not set literally in the input; "
+                         "cue export needs a file in a CUE module")
+    path = Path(file_path).resolve()
+    project_root = find_project_root(str(path))
+    module_files = [os.path.join(project_root, rel) for rel in module_cue_files(project_root)]
+    with lock_files(shared=module_files):
+        ok, output = run_cue(["export", os.path.relpath(path, project_root),
+                              "-e", _cue_expression(labels), "--out", "json"], project_root)
+    if not ok:
+        raise ValueError(f"cue export of {_cue_expression(labels)} failed:\n{output}")
+    try:
+        return json.loads(output)
+    except ValueError:
+        raise ValueError(f"cue export of {_cue_expression(labels)} did not return JSON:\n{output}") from None
+
+
+def _query_content(file_path: str) -> str:
+    if file_path == '-':
+        return sys.stdin.read()
+    path = Path(file_path).resolve()
+    if not path.exists():
+        raise ValueError(f"File not found: {path}")
+    return read_project_file(path)
+
+
+def get_value(file_path: str, env: str, app: str, path: str, export: bool = False) -> tuple[object, str]:
+    """Return (value, source) of <env>.<app>.<path>; source is 'file' or 'export'.
+
+    Scalars written literally in the file are read from it; anything else is
+    evaluated with cue export (always, with export=True).
+    """
+    labels = [env, app, *parse_query_path(path)]
+    if not export:
+        index = index_content(_query_content(file_path))
+        field = index.field(*labels)
+        if field is not None:
+            found, value = _literal_value(index, field)
+            if found:
+                return value, 'file'
+    return _export_value(file_path, labels), 'export'
+
+
+def list_keys(file_path: str, env: str, app: str | None = None, path: str = '',
+              export: bool = False) -> tuple[list[str], str]:
+    """Return (field names, source) of the struct at <env>[.<app>[.<path>]].
+
+    Lists the fields written in the file when the struct is there, else the
+    fields of the evaluated struct from cue export (always, with export=True).
+    """
+    labels = [env, *([app] if app else []), *parse_query_path(path)]
+    if not export:
+        block = index_content(_query_content(file_path)).block(*labels)
+        if block is not None:
+            return list(block.children), 'file'
+    value = _export_value(file_path, labels)
+    if not isinstance(value, dict):
+        raise ValueError(f"{_cue_expression(labels)} is not a struct")
+    return list(value), 'export'
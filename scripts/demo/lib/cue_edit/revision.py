@@ -0,0 +1,231 @@
+"""Editing a git revision: a module read from git objects instead of a checkout.
+
+RevisionModule snapshots the module's files at a revision (one 'git ls-tree'
+and one 'git cat-file --batch', no checkout or worktree) into a private
+directory, and edits, queries and validates that snapshot exactly like a
+module on disk. Written changes become git blobs, and commit_to records them
+as a commit on top of the revision without touching the index or worktree.
+"""
+
+import os
+from pathlib import Path
+
+from .api import Changes, Module
+from .files import _FILE_CACHE, find_project_root, write_files
+from .trace import TRACE
+from .validation import _DIGEST_CACHE, _IMPORTS_CACHE, _shadow_base_dir
+
+
+def _git(args: list[str], cwd: str, input: bytes | None = None, env: dict | None = None) -> bytes:
+    """Run git and return its stdout; raises ValueError if it fails."""
+    import subprocess
+
+    with TRACE.span('git', command=args[0]):
+        try:
+            result = subprocess.run(['git', *args], cwd=cwd, input=input, capture_output=True,
+                                    env=None if env is None else {**os.environ, **env})
+        except FileNotFoundError:
+            raise ValueError("git not found in PATH") from None
+    if result.returncode != 0:
+        message = result.stderr.decode(errors='replace').strip()
+        raise ValueError(f"git {args[0]} failed: {message}")
+    return result.stdout
+
+
+def _module_file(rel_path: str) -> bool:
+    """Whether a module-relative path is part of the snapshot (see module_cue_files)."""
+    parts = rel_path.split('/')
+    if parts[0] == 'cue.mod':
+        return True
+    return rel_path.endswith('.cue') and not any(part.startswith(('.', '_')) for part in parts[:-1])
+
+
+def _read_blobs(repo: str, shas: list[str]) -> dict:
+    """Read blobs with a single 'git cat-file --batch': sha -> bytes."""
+    output = _git(['cat-file', '--batch'], repo, input=''.join(f'{sha}\n' for sha in shas).encode())
+    blobs, pos = {}, 0
+    while pos < len(output):
+        header_end = output.index(b'\n', pos)
+        sha, kind, size = output[pos:header_end].decode().split()
+        start = header_end + 1
+        blobs[sha] = output[start:start + int(size)]
+        pos = start + int(size) + 1
+    TRACE.add_bytes('read', sum(len(blob) for blob in blobs.values()))
+    return blobs
+
+
+class RevisionModule(Module):
+    """The CUE module containing base_dir, as of git revision rev.
+
+    Paths given to apply, get and list are paths in the checkout (relative
+    to base_dir); they are read from the revision, not from disk. The
+    snapshot is removed by close() (or on leaving a with block).
+    """
+
+    def __init__(self, base_dir: str = '.', rev: str = 'HEAD'):
+        self.checkout_base = str(Path(base_dir).resolve())
+        self.checkout_root = find_project_root(self.checkout_base)
+        self.repo = _git(['rev-parse', '--show-toplevel'], self.checkout_root).decode().strip()
+        self.prefix = os.path.relpath(self.checkout_root, self.repo)
+        self.rev = rev
+        try:
+            self.commit = _git(['rev-parse', '--verify', '--quiet', f'{rev}^{{commit}}'],
+                               self.repo).decode().strip()
+        except ValueError:
+            raise ValueError(f"Unknown revision: {rev}") from None
+
+        # Validation results are keyed by content, so the checkout's cache serves both
+        self.cache_root = self.checkout_root
+        self.entries = self._list_entries()
+        self.snapshot = self._write_snapshot()
+        self.root = self.snapshot
+        self.base_dir = os.path.join(self.snapshot, os.path.relpath(self.checkout_base, self.checkout_root))
+
+    def __repr__(self) -> str:
+        return f'RevisionModule({self.checkout_base!r}, rev={self.rev!r})'
+
+    def __enter__(self) -> 'RevisionModule':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _list_entries(self) -> dict:
+        """Module files at the revision: module-relative path -> (mode, blob sha)."""
+        pathspec = [] if self.prefix == '.' else ['--', self.prefix]
+        output = _git(['ls-tree', '-r', '-z', self.commit, *pathspec], self.repo).decode()
+        entries = {}
+        for record in filter(None, output.split('\0')):
+            meta, repo_path = record.split('\t', 1)
+            mode, kind, sha = meta.split()
+            rel_path = repo_path if self.prefix == '.' else os.path.relpath(repo_path, self.prefix)
+            if kind == 'blob' and mode != '120000' and _module_file(rel_path):
+                entries[rel_path] = (mode, sha)
+        if 'cue.mod/module.cue' not in entries:
+            raise ValueError(f"No CUE module at {self.prefix} in {self.rev}")
+        return entries
+
+    def _write_snapshot(self) -> str:
+        import tempfile
+
+        blobs = _read_blobs(self.repo, sorted({sha for _, sha in self.entries.values()}))
+        snapshot = os.path.realpath(tempfile.mkdtemp(prefix='cue-edit-rev-', dir=_shadow_base_dir()))
+        with TRACE.span('snapshot', files=len(self.entries)):
+            for rel_path, (_, sha) in self.entries.items():
+                path = os.path.join(snapshot, rel_path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.write(blobs[sha])
+        return snapshot
+
+    def close(self):
+        """Remove the snapshot and forget what was cached about its files."""
+        import shutil
+
+        prefix = self.snapshot + os.sep
+        for cache in (_FILE_CACHE, _DIGEST_CACHE, _IMPORTS_CACHE):
+            for key in [key for key in cache if str(key).startswith(prefix)]:
+                del cache[key]
+        shutil.rmtree(self.snapshot, ignore_errors=True)
+
+    def path(self, file: str) -> str:
+        """Return the snapshot path of file (a checkout path, relative to base_dir)."""
+        checkout_path = Path(self.checkout_base, file).resolve()
+        if not checkout_path.is_relative_to(self.checkout_root):
+            raise ValueError(f"{checkout_path} is outside the module at {self.checkout_root}")
+        rel_path = os.path.relpath(checkout_path, self.checkout_root)
+        if rel_path not in self.entries:
+            raise ValueError(f"{checkout_path} does not exist at {self.rev}")
+        return os.path.join(self.snapshot, rel_path)
+
+    def checkout_path(self, path: str) -> str:
+        """Return the checkout path of a snapshot path."""
+        return os.path.join(self.checkout_root, os.path.relpath(path, self.snapshot))
+
+    def repo_path(self, path: str) -> str:
+        """Return the path of a snapshot path relative to the repository root."""
+        return os.path.normpath(os.path.join(self.prefix, os.path.relpath(path, self.snapshot)))
+
+    def paths(self, operations: list) -> set[str]:
+        return {self.checkout_path(path) for path in super().paths(self._snapshot_operations(operations))}
+
+    def apply(self, operations: list) -> 'RevisionChanges':
+        """Apply operations to the revision's files in memory (see Module.apply)."""
+        return RevisionChanges(self).apply(operations)
+
+    def _snapshot_operations(self, operations: list) -> list:
+        return [{**op, 'file': self.path(op['file'])} if 'file' in op else op for op in operations]
+
+    def write_tree(self, blobs: dict) -> str:
+        """Return the tree of the revision with blobs (repo path -> sha) replaced."""
+        import tempfile
+
+        with tempfile.TemporaryDirectory(prefix='cue-edit-index-') as index_dir:
+            env = {'GIT_INDEX_FILE': os.path.join(index_dir, 'index')}
+            _git(['read-tree', self.commit], self.repo, env=env)
+            cacheinfo = []
+            for repo_path, sha in sorted(blobs.items()):
+                mode = self.entries[os.path.relpath(repo_path, self.prefix)][0]
+                cacheinfo += ['--cacheinfo', f'{mode},{sha},{repo_path}']
+            _git(['update-index', '--add', *cacheinfo], self.repo, env=env)
+            return _git(['write-tree'], self.repo, env=env).decode().strip()
+
+    def update_ref(self, ref: str, blobs: dict, message: str) -> str:
+        """Commit blobs (repo path -> sha) on top of the revision and point ref at it.
+
+        ref (a branch name or full ref) must not exist yet or point at the
+        revision, and must not be the checked-out branch; it is moved with a
+        compare-and-swap, so a concurrent push to it makes this fail instead
+        of being overwritten. Returns the new commit's sha.
+        """
+        if not ref.startswith('refs/'):
+            ref = f'refs/heads/{ref}'
+        try:
+            head = _git(['symbolic-ref', '-q', 'HEAD'], self.repo).decode().strip()
+        except ValueError:
+            head = None
+        if ref == head:
+            raise ValueError(f"{ref} is checked out in {self.repo}; edit the files instead")
+        try:
+            current = _git(['rev-parse', '--verify', '--quiet', ref], self.repo).decode().strip()
+        except ValueError:
+            current = ''
+        if current and current != self.commit:
+            raise ValueError(f"{ref} is at {current[:12]}, not at {self.rev} ({self.commit[:12]})")
+
+        tree = self.write_tree(blobs)
+        commit = _git(['commit-tree', tree, '-p', self.commit, '-m', message], self.repo).decode().strip()
+        _git(['update-ref', '-m', f'cue-edit: {message}', ref, commit, current], self.repo)
+        return commit
+
+
+class RevisionChanges(Changes):
+    """Edits of a revision's files; writing them stores git blobs (see RevisionModule).
+
+    blobs maps the checkout paths of written files to their blob shas.
+    """
+
+    def __init__(self, module: RevisionModule):
+        super().__init__(module)
+        self.blobs = {}
+
+    def apply(self, operations: list) -> 'RevisionChanges':
+        return super().apply(self.module._snapshot_operations(operations))
+
+    def write(self) -> list[str]:
+        """Store the changed files as git blobs; returns their checkout paths."""
+        changed = self.changed
+        write_files(changed)
+        self.originals.update(changed)
+        paths = sorted(changed)
+        output = _git(['hash-object', '-w', '--no-filters', '--stdin-paths'], self.module.repo,
+                      input=''.join(f'{path}\n' for path in paths).encode())
+        for path, sha in zip(paths, output.decode().split()):
+            self.blobs[self.module.checkout_path(path)] = sha
+        return [self.module.checkout_path(path) for path in paths]
+
+    def commit_to(self, ref: str, message: str) -> str:
+        """Commit the written files onto ref (see RevisionModule.update_ref); returns the commit sha."""
+        module = self.module
+        blobs = {os.path.relpath(path, module.repo): sha for path, sha in self.blobs.items()}
+        return module.update_ref(ref, blobs, message)
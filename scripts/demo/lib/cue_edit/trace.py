@@ -0,0 +1,71 @@
+"""Timing records (--timings / CUE_EDIT_TRACE)."""
+
+import contextlib
+import json
+import os
+import sys
+import time
+
+
+class Trace:
+    """Per-invocation timing record: monotonic phase spans, byte sizes and cue runs.
+
+    Disabled by default; spans are then no-ops. Times are milliseconds relative
+    to the start of the invocation (or serve-mode request).
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        self.origin = time.monotonic_ns()
+        self.spans = []
+        self.bytes = {}
+        self.cue_runs = []
+
+    def _ms(self, ns: int) -> float:
+        return round(ns / 1e6, 3)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attrs):
+        if not self.enabled:
+            yield
+            return
+        start = time.monotonic_ns()
+        try:
+            yield
+        finally:
+            self.spans.append({'name': name, 'start_ms': self._ms(start - self.origin),
+                               'duration_ms': self._ms(time.monotonic_ns() - start), **attrs})
+
+    def add_bytes(self, kind: str, size: int):
+        if self.enabled:
+            self.bytes[kind] = self.bytes.get(kind, 0) + size
+
+    def cue_run(self, args: list[str], cwd: str, start: int, exit_code: int | None, cache: str):
+        if self.enabled:
+            self.cue_runs.append({'argv': ['cue', *args], 'cwd': cwd, 'exit_code': exit_code, 'cache': cache,
+                                  'start_ms': self._ms(start - self.origin),
+                                  'duration_ms': self._ms(time.monotonic_ns() - start)})
+
+    def record(self, **fields) -> dict:
+        return {**fields, 'total_ms': self._ms(time.monotonic_ns() - self.origin),
+                'spans': self.spans, 'bytes': self.bytes, 'cue': self.cue_runs}
+
+
+TRACE = Trace()
+
+
+def emit_trace(record: dict, to_stderr: bool):
+    """Print a trace record to stderr and/or append it to $CUE_EDIT_TRACE as a JSON line."""
+    line = json.dumps(record)
+    if to_stderr:
+        print(line, file=sys.stderr)
+    trace_path = os.environ.get('CUE_EDIT_TRACE')
+    if trace_path:
+        try:
+            with open(trace_path, 'a') as f:
+                f.write(line + '\n')
+        except OSError as e:
+            print(f"Warning: cannot write trace to {trace_path}: {e}", file=sys.stderr)
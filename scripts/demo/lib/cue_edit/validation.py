@@ -0,0 +1,476 @@
+"""Validating edits with cue: scope planning, the result cache and shadow trees."""
+
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from .files import CACHE_DIR_NAME, _stat_memo, module_cue_files, write_files
+from .trace import TRACE
+
+# shutil, subprocess and tempfile are imported where they are used: commands
+# that end without running cue (queries, dry runs, no-op edits) skip them.
+
+
+def run_cue_vet(file_path: str, project_root: str) -> tuple[bool, str]:
+    """Run cue vet on a file and return (success, output)."""
+    return run_cue(["vet", file_path], project_root)
+
+
+def run_cue(args: list[str], project_root: str, cache_status: str = 'off') -> tuple[bool, str]:
+    """Run a cue command in the project root and return (success, output).
+
+    cache_status is only recorded in the trace (see Trace.cue_run).
+    """
+    import subprocess
+
+    start = time.monotonic_ns()
+    exit_code = None
+    try:
+        result = subprocess.run(
+            ["cue", *args],
+            cwd=project_root,
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        exit_code = result.returncode
+        return result.returncode == 0, result.stderr or result.stdout
+    except subprocess.TimeoutExpired:
+        return False, "CUE validation timed out"
+    except FileNotFoundError:
+        return False, "CUE command not found - install from https://cuelang.org/docs/install/"
+    finally:
+        TRACE.cue_run(args, project_root, start, exit_code, cache_status)
+
+
+# ============================================================================
+# VALIDATION SCOPE
+# ============================================================================
+#
+# Rather than vetting the whole module (./...) after every edit, validation is
+# limited to what an edit can affect: the packages that (transitively) import
+# the edited file's package, or a single <env>.<app> expression for edits that
+# only touch one app in env.cue. --full-vet restores the whole-module checks.
+
+_MODULE_RE = re.compile(r'^module:\s*"([^"]+)"', re.MULTILINE)
+_IMPORT_PATH_RE = re.compile(r'"([^"]+)"')
+
+
+# Import lists per file: path -> ((mtime_ns, size, inode), imports)
+_IMPORTS_CACHE = {}
+
+
+def _read_cue_imports(path: Path) -> list[str]:
+    """Return the import paths of a CUE file, reading only its header."""
+    imports = []
+    in_block = False
+    with open(path) as f:
+        for line in f:
+            stripped = line.strip()
+            if in_block:
+                if stripped.startswith(')'):
+                    in_block = False
+                    continue
+                imports.extend(_IMPORT_PATH_RE.findall(stripped.split('//')[0]))
+            elif stripped.startswith('import'):
+                rest = stripped[len('import'):].strip()
+                if rest.startswith('('):
+                    in_block = ')' not in rest
+                    imports.extend(_IMPORT_PATH_RE.findall(rest))
+                else:
+                    imports.extend(_IMPORT_PATH_RE.findall(rest)[:1])
+            elif stripped and not stripped.startswith(('//', 'package', '@')):
+                break  # Imports must precede all declarations
+    return imports
+
+
+def build_import_graph(project_root: str) -> dict[str, set[str]]:
+    """Map each package directory (relative to project_root) to the module packages it imports.
+
+    Directories in cue.mod and hidden (., _) directories are skipped, matching
+    what 'cue vet ./...' loads.
+    """
+    root = Path(project_root)
+    module_file = root / "cue.mod" / "module.cue"
+    module_match = _MODULE_RE.search(module_file.read_text()) if module_file.exists() else None
+    module_path = module_match.group(1) if module_match else None
+
+    graph = {}
+    for rel_path in module_cue_files(project_root, include_cue_mod=False):
+        package = Path(rel_path).parent.as_posix()
+        imports = graph.setdefault(package, set())
+        for import_path in _stat_memo(_IMPORTS_CACHE, root / rel_path, _read_cue_imports):
+            import_path = import_path.split(':')[0]
+            if module_path and (import_path == module_path or import_path.startswith(module_path + '/')):
+                imports.add(import_path[len(module_path):].lstrip('/') or '.')
+    return graph
+
+
+def downstream_packages(graph: dict[str, set[str]], package: str) -> list[str]:
+    """Return package and every package that imports it directly or transitively."""
+    importers = {}
+    for pkg, imports in graph.items():
+        for imported in imports:
+            importers.setdefault(imported, set()).add(pkg)
+
+    seen = {package}
+    pending = [package]
+    while pending:
+        for pkg in importers.get(pending.pop(), ()):
+            if pkg not in seen:
+                seen.add(pkg)
+                pending.append(pkg)
+    return sorted(seen)
+
+
+def plan_validation(validations: set, full_vet: bool = False) -> list[tuple[str, list[str]]]:
+    """Turn the validations recorded by apply_operations into cue commands.
+
+    Scopes:
+      module - 'cue vet -c=false' over the edited package and its importers
+               ('./...' with full_vet)
+      file   - 'cue vet <file>'
+      app    - 'cue export <file> -e <env>.<app>' ('cue vet <file>' with full_vet)
+
+    Returns a list of (project_root, cue arguments), in a stable order.
+    """
+    commands = []
+    by_root = {}
+    for project_root, scope, file_path, expression in validations:
+        by_root.setdefault(project_root, []).append((scope, file_path, expression))
+
+    for project_root, entries in sorted(by_root.items()):
+        module_files = sorted({f for scope, f, _ in entries if scope == 'module'})
+        vet_files = sorted({f for scope, f, _ in entries if scope == 'file' or (scope == 'app' and full_vet)})
+        app_exprs = {}
+        for scope, file_path, expression in entries:
+            if scope == 'app' and not full_vet and file_path not in vet_files:
+                app_exprs.setdefault(file_path, set()).add(expression)
+
+        if module_files:
+            if full_vet:
+                commands.append((project_root, ["vet", "-c=false", "./..."]))
+            else:
+                graph = build_import_graph(project_root)
+                packages = set()
+                for file_path in module_files:
+                    package = Path(file_path).parent.relative_to(project_root).as_posix()
+                    packages.update(downstream_packages(graph, package))
+                args = ['.' if p == '.' else f'./{p}' for p in sorted(packages)]
+                commands.append((project_root, ["vet", "-c=false", *args]))
+
+        # File arguments are relative to the project root (the cue working
+        # directory) so cached results do not depend on the checkout location
+        for file_path in vet_files:
+            commands.append((project_root, ["vet", os.path.relpath(file_path, project_root)]))
+
+        for file_path, expressions in sorted(app_exprs.items()):
+            args = ["export", os.path.relpath(file_path, project_root)]
+            for expression in sorted(expressions):
+                args += ["-e", expression]
+            commands.append((project_root, [*args, "--out", "json"]))
+
+    return commands
+
+
+# ============================================================================
+# VALIDATION CACHE
+# ============================================================================
+#
+# Validation results are cached on disk, keyed by a hash of every .cue file in
+# the module, the cue binary version and the cue arguments. Re-validating an
+# identical tree (idempotent re-applies, retries) then skips the subprocess.
+
+CACHE_MAX_BYTES = int(os.environ.get('CUE_EDIT_CACHE_MAX_BYTES', 8 * 1024 * 1024))
+
+
+_DIGEST_CACHE = {}
+
+
+def _hash_file(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def tree_digest(project_root: str, overrides: dict | None = None) -> str:
+    """Hash the contents of every .cue file in the module (including cue.mod).
+
+    overrides (relative path -> content) replaces or adds files, so the digest
+    of a pending edit can be computed without reading the shadow tree.
+    """
+    overrides = overrides or {}
+    digest = hashlib.sha256()
+    for rel_path in sorted(set(module_cue_files(project_root)) | set(overrides)):
+        if rel_path in overrides:
+            file_digest = hashlib.sha256(overrides[rel_path].encode()).hexdigest()
+        else:
+            file_digest = _stat_memo(_DIGEST_CACHE, os.path.join(project_root, rel_path), _hash_file)
+        digest.update(f'{rel_path}\0{file_digest}\0'.encode())
+    return digest.hexdigest()
+
+
+class ValidationCache:
+    """Size-bounded on-disk cache of cue results with LRU eviction.
+
+    Entries are JSON files under <project_root>/.cue-edit-cache/validations/
+    (or $CUE_EDIT_CACHE_DIR); a hit refreshes the entry's mtime, and the least
+    recently used entries are evicted once the total size exceeds CACHE_MAX_BYTES.
+    """
+
+    def __init__(self, project_root: str):
+        base = os.environ.get('CUE_EDIT_CACHE_DIR') or os.path.join(project_root, CACHE_DIR_NAME)
+        self.dir = Path(base) / 'validations'
+        self.version_file = Path(base) / 'cue-version.json'
+        self._cue_version = None
+
+    def cue_version(self) -> str | None:
+        """Return 'cue version' output, cached per cue binary (path, size, mtime)."""
+        if self._cue_version is not None:
+            return self._cue_version
+
+        import shutil
+        import subprocess
+
+        cue_path = shutil.which('cue')
+        if cue_path is None:
+            return None
+        stat = os.stat(cue_path)
+        binary = [cue_path, stat.st_size, stat.st_mtime_ns]
+
+        try:
+            cached = json.loads(self.version_file.read_text())
+            if cached.get('binary') == binary:
+                self._cue_version = cached['version']
+                return self._cue_version
+        except (OSError, ValueError, KeyError):
+            pass
+
+        try:
+            result = subprocess.run([cue_path, 'version'], capture_output=True, text=True, timeout=30)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode != 0:
+            return None
+
+        self._cue_version = result.stdout.strip()
+        self._write_json(self.version_file, {'binary': binary, 'version': self._cue_version})
+        return self._cue_version
+
+    def key(self, args: list[str], digest: str) -> str | None:
+        version = self.cue_version()
+        if version is None:
+            return None
+        return hashlib.sha256(json.dumps([version, args, digest]).encode()).hexdigest()
+
+    def get(self, key: str) -> tuple[bool, str] | None:
+        entry_path = self.dir / f'{key}.json'
+        try:
+            entry = json.loads(entry_path.read_text())
+            os.utime(entry_path)  # Mark as recently used
+            return entry['ok'], entry['output']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, ok: bool, output: str, args: list[str]):
+        self._write_json(self.dir / f'{key}.json', {'ok': ok, 'output': output, 'args': args})
+        self._evict()
+
+    def _write_json(self, path: Path, data: dict):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+            tmp_path.write_text(json.dumps(data))
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # The cache is an optimization; never fail an edit over it
+
+    def _evict(self):
+        try:
+            entries = [(e.stat(), e) for e in os.scandir(self.dir) if e.name.endswith('.json')]
+        except OSError:
+            return
+        total = sum(stat.st_size for stat, _ in entries)
+        for stat, entry in sorted(entries, key=lambda item: item[0].st_mtime_ns):
+            if total <= CACHE_MAX_BYTES:
+                break
+            try:
+                os.unlink(entry.path)
+                total -= stat.st_size
+            except OSError:
+                pass
+
+
+def run_cue_cached(args: list[str], project_root: str, cache: ValidationCache | None = None,
+                   digest: str | None = None, run_dir=None) -> tuple[bool, str]:
+    """Run a cue command, answering from the validation cache when the tree is unchanged.
+
+    Pass digest when validating several commands against the same tree, so the
+    module is hashed once. run_dir, if given, is called only when cue has to
+    run and returns the directory to run it in (e.g. a shadow tree built on
+    demand) instead of project_root. Timeouts and a missing cue binary are
+    never cached.
+    """
+    if cache is None:
+        return run_cue(args, run_dir() if run_dir else project_root)
+
+    key = cache.key(args, digest or tree_digest(project_root))
+    if key is None:
+        return run_cue(args, run_dir() if run_dir else project_root)
+
+    start = time.monotonic_ns()
+    cached = cache.get(key)
+    if cached is not None:
+        TRACE.cue_run(args, project_root, start, 0 if cached[0] else None, 'hit')
+        return cached
+
+    valid, output = run_cue(args, run_dir() if run_dir else project_root, cache_status='miss')
+    if valid or not output.startswith(("CUE validation timed out", "CUE command not found")):
+        cache.put(key, valid, '' if valid else output, args)
+    return valid, output
+
+
+# ============================================================================
+# SHADOW VALIDATION
+# ============================================================================
+#
+# Edits are validated in a shadow copy of the module rather than by writing the
+# real files, running cue and restoring backups. The shadow holds only what cue
+# loads (.cue files and cue.mod), hardlinked from the checkout, plus the
+# edited contents; it lives in the project's .cue-edit-cache/shadow/ so the
+# links stay on one filesystem. The real files are replaced with os.replace
+# only after validation passes, so an interrupted run never leaves them
+# half-edited and concurrent readers always see either the old or the new
+# content. Shadows are only built for commands the validation cache cannot
+# answer.
+
+def _shadow_base_dir(project_root: str | None = None) -> str:
+    """Directory for shadow trees.
+
+    $CUE_EDIT_SHADOW_DIR if set; else the project's .cue-edit-cache/shadow/
+    (same filesystem, so unchanged files can be hardlinked) when project_root
+    is given and writable; else tmpfs, else the temp dir.
+    """
+    base = os.environ.get('CUE_EDIT_SHADOW_DIR')
+    if base:
+        return base
+    if project_root is not None:
+        base = os.path.join(project_root, CACHE_DIR_NAME, 'shadow')
+        try:
+            os.makedirs(base, exist_ok=True)
+            return base
+        except OSError:
+            pass
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    import tempfile
+    return tempfile.gettempdir()
+
+
+def _link_or_copy(src: str, dst: str, link: bool):
+    if link:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    import shutil
+    shutil.copyfile(src, dst)
+
+
+def build_shadow_tree(project_root: str, overrides: dict) -> str:
+    """Create a shadow module with overrides (relative path -> content) applied.
+
+    Unchanged files are hardlinked when the shadow directory is on the same
+    filesystem as the project (the default, see _shadow_base_dir), and copied
+    otherwise. The caller removes the returned directory.
+    """
+    import tempfile
+
+    base = _shadow_base_dir(project_root)
+    shadow_root = tempfile.mkdtemp(prefix='cue-edit-shadow-', dir=base)
+    link = os.stat(base).st_dev == os.stat(project_root).st_dev
+
+    rel_paths = set(module_cue_files(project_root))
+    cue_mod = os.path.join(project_root, 'cue.mod')
+    for dirpath, _, filenames in os.walk(cue_mod):
+        rel_paths.update(os.path.relpath(os.path.join(dirpath, name), project_root) for name in filenames)
+
+    for rel_path in sorted(rel_paths | set(overrides)):
+        dst = os.path.join(shadow_root, rel_path)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        if rel_path in overrides:
+            with open(dst, 'w') as f:
+                f.write(overrides[rel_path])
+        else:
+            _link_or_copy(os.path.join(project_root, rel_path), dst, link)
+
+    return shadow_root
+
+
+def validate_changes(files: dict, validations: set, full_vet: bool = False,
+                     use_cache: bool = True, cache_root: str | None = None) -> tuple[bool, str]:
+    """Validate new contents (path -> content) in shadow trees, without writing them.
+
+    validations are the tuples recorded by apply_operations for these files.
+    Results are cached under cache_root's .cue-edit-cache/ (default: each
+    project root's). Returns (success, validation output).
+    """
+    import shutil
+
+    roots = sorted({v[0] for v in validations})
+    overrides = {
+        project_root: {
+            os.path.relpath(path, project_root): content
+            for path, content in files.items()
+            if Path(path).is_relative_to(project_root)
+        }
+        for project_root in roots
+    }
+
+    with TRACE.span('plan_validation'):
+        commands = plan_validation(validations, full_vet)
+
+    shadows, caches, digests = {}, {}, {}
+
+    def shadow_of(project_root: str):
+        if project_root not in shadows:
+            with TRACE.span('shadow', root=project_root):
+                shadows[project_root] = build_shadow_tree(project_root, overrides[project_root])
+        return shadows[project_root]
+
+    try:
+        # Validate each affected package/file once; the digest covers the
+        # pending contents, so cache hits need no shadow tree
+        for project_root, args in commands:
+            if use_cache and project_root not in caches:
+                caches[project_root] = ValidationCache(cache_root or project_root)
+                with TRACE.span('digest', root=project_root):
+                    digests[project_root] = tree_digest(project_root, overrides[project_root])
+            valid, output = run_cue_cached(args, project_root, caches.get(project_root),
+                                           digests.get(project_root),
+                                           run_dir=lambda root=project_root: shadow_of(root))
+            if not valid:
+                return False, output
+
+    finally:
+        with TRACE.span('cleanup'):
+            for shadow_root in shadows.values():
+                shutil.rmtree(shadow_root, ignore_errors=True)
+
+    return True, ""
+
+
+def commit_changes(files: dict, validations: set, full_vet: bool = False,
+                   use_cache: bool = True) -> tuple[bool, str]:
+    """Validate all files in shadow trees, then replace the real files.
+
+    Either all files end up with their new content (validation passed) or
+    none of them are changed. Returns (success, validation output).
+    """
+    valid, output = validate_changes(files, validations, full_vet, use_cache)
+    if valid:
+        write_files(files)
+    return valid, output
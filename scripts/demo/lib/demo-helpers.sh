@@ -174,6 +174,76 @@ demo_push_branch() {
 # CUE EDITING WRAPPERS
 # ============================================================================
 
+# Start a persistent cue-edit.py co-process (cue-edit.py serve --stdio).
+# While it runs, demo_cue_edit sends requests to it instead of starting a new
+# Python process per edit. demo_cue_edit starts it on first use unless
+# DEMO_CUE_EDIT_COPROC=0; demo_init stops it on exit (demo_cue_edit_stop).
+demo_cue_edit_start() {
+    [[ -n "${CUE_EDIT_COPROC_PID:-}" ]] && return 0
+    coproc CUE_EDIT_COPROC { python3 "${CUE_EDIT}" serve --stdio; }
+}
+
+demo_cue_edit_stop() {
+    [[ -z "${CUE_EDIT_COPROC_PID:-}" ]] && return 0
+    local pid="$CUE_EDIT_COPROC_PID"
+    exec {CUE_EDIT_COPROC[1]}>&-
+    wait "$pid" 2>/dev/null || true
+    unset CUE_EDIT_COPROC_PID
+}
+
+# Print a serve --stdio response like cue-edit.py prints the result, as one
+# jq call: a "<exit status> <out|err>" line followed by the text to print
+_CUE_EDIT_RESPONSE_JQ='
+    def lines: map(. + "\n") | add // "";
+    (if .status == "unchanged" then $unchanged_status else 0 end) as $status
+    | if .ok != true then "1 err\n", "Error: \(.error)\n"
+      elif has("keys") then "0 out\n", (.keys | lines)
+      elif has("value") then "0 out\n", .value, "\n"
+      elif .dry_run then "\($status) out\n", .diff, (.diff | if type == "string" then empty else "\n" end)
+      elif has("commit") then "0 out\n", "Committed \(.commit) to \(.ref)\n"
+      elif has("rev") then "\($status) out\n",
+          (if has("ref") then (.unchanged | map("Unchanged \(.)") | lines)
+           elif has("content") then .content
+           else (.blobs // {} | to_entries | map("\(.value) \(.key)") | lines) end)
+      else "\($status) out\n",
+          (if .files == [] and .unchanged == [] then "No operations to apply\n" else empty end),
+          (.files | map("Successfully modified \(.)") | lines), (.unchanged | map("Unchanged \(.)") | lines)
+      end'
+
+# Run a cue-edit.py command, through the co-process when one is running.
+# Output and exit status match running cue-edit.py directly. Calls from a
+# subshell (e.g. inside $(...)) cannot use the co-process and run cue-edit.py.
+demo_cue_edit() {
+    if [[ "${DEMO_CUE_EDIT_COPROC:-1}" != "0" && "$BASHPID" == "$$" ]]; then
+        demo_cue_edit_start
+    fi
+    if [[ -z "${CUE_EDIT_COPROC_PID:-}" || "$BASHPID" != "$$" ]]; then
+        python3 "${CUE_EDIT}" "$@"
+        return
+    fi
+
+    local response status stream output
+    jq -cn --arg cwd "$PWD" '{cwd: $cwd, argv: $ARGS.positional}' --args -- "$@" >&"${CUE_EDIT_COPROC[1]}"
+    if ! IFS= read -r response <&"${CUE_EDIT_COPROC[0]}"; then
+        demo_warn "cue-edit.py co-process exited unexpectedly"
+        unset CUE_EDIT_COPROC_PID
+        return 1
+    fi
+
+    local unchanged_status=0
+    [[ " $* " == *" --exit-unchanged "* ]] && unchanged_status=3
+    {
+        read -r status stream
+        IFS= read -r -d '' output || true
+    } < <(jq -j --argjson unchanged_status "$unchanged_status" "$_CUE_EDIT_RESPONSE_JQ" <<< "$response")
+    if [[ "$stream" == "err" ]]; then
+        printf '%s' "$output" >&2
+    else
+        printf '%s' "$output"
+    fi
+    return "${status:-1}"
+}
+
 demo_add_configmap_entry() {
     local env="$1"
     local app="$2"
@@ -182,7 +252,7 @@ demo_add_configmap_entry() {
     local file="${5:-env.cue}"
 
     demo_action "Adding ConfigMap entry: $key=$value"
-    python3 "${CUE_EDIT}" env-configmap add "$file" "$env" "$app" "$key" "$value"
+    demo_cue_edit env-configmap add "$file" "$env" "$app" "$key" "$value"
 }
 
 demo_remove_configmap_entry() {
@@ -192,7 +262,7 @@ demo_remove_configmap_entry() {
     local file="${4:-env.cue}"
 
     demo_action "Removing ConfigMap entry: $key"
-    python3 "${CUE_EDIT}" env-configmap remove "$file" "$env" "$app" "$key"
+    demo_cue_edit env-configmap remove "$file" "$env" "$app" "$key"
 }
 
 demo_add_app_configmap_entry() {
@@ -202,7 +272,7 @@ demo_add_app_configmap_entry() {
     local value="$4"
 
     demo_action "Adding app ConfigMap entry: $key=$value"
-    python3 "${CUE_EDIT}" app-configmap add "$file" "$app" "$key" "$value"
+    demo_cue_edit app-configmap add "$file" "$app" "$key" "$value"
 }
 
 demo_remove_app_configmap_entry() {
@@ -211,7 +281,7 @@ demo_remove_app_configmap_entry() {
     local key="$3"
 
     demo_action "Removing app ConfigMap entry: $key"
-    python3 "${CUE_EDIT}" app-configmap remove "$file" "$app" "$key"
+    demo_cue_edit app-configmap remove "$file" "$app" "$key"
 }
 
 demo_set_env_field() {
@@ -222,18 +292,26 @@ demo_set_env_field() {
     local file="${5:-env.cue}"
 
     demo_action "Setting $field=$value for $app in $env"
-    python3 "${CUE_EDIT}" env-field set "$file" "$env" "$app" "$field" "$value"
+    demo_cue_edit env-field set "$file" "$env" "$app" "$field" "$value"
 }
 
 # ============================================================================
 # MANIFEST OPERATIONS
 # ============================================================================
 
+# Generate manifests with k8s-deployments' generate-manifests.sh, which hands
+# off to generate-manifests.py (two cue exports and one yq pass per
+# environment instead of per app). DEMO_GENERATE_MANIFESTS_PY=0 runs the
+# shell loop instead.
 demo_generate_manifests() {
     local env="${1:-$(git rev-parse --abbrev-ref HEAD)}"
 
     demo_action "Generating manifests for environment: $env"
-    ./scripts/generate-manifests.sh "$env"
+    if [[ "${DEMO_GENERATE_MANIFESTS_PY:-1}" == "1" ]]; then
+        GENERATE_MANIFESTS_PY="${DEMO_LIB_DIR}/generate-manifests.py" ./scripts/generate-manifests.sh "$env"
+    else
+        ./scripts/generate-manifests.sh "$env"
+    fi
 }
 
 demo_verify_manifest_contains() {
@@ -303,6 +381,8 @@ demo_cleanup_handler() {
     if [[ -n "$original_branch" ]]; then
         git checkout "$original_branch" 2>/dev/null || true
     fi
+
+    demo_cue_edit_stop
 }
 
 # ============================================================================
@@ -400,6 +480,10 @@ demo_init() {
     # Verify cue-edit.py exists
     demo_require_file "$CUE_EDIT" "CUE edit helper"
 
+    # Stop the cue-edit.py co-process if demo_cue_edit starts one
+    # (demo_cleanup_on_exit replaces this trap and stops it too)
+    trap demo_cue_edit_stop EXIT
+
     demo_header "$demo_name"
 }
 
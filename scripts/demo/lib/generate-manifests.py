@@ -0,0 +1,591 @@
+#!/usr/bin/env python3
+"""
+generate-manifests.py - Generate Kubernetes manifests from CUE with a single export
+
+Drop-in replacement for the per-app loop in k8s-deployments'
+scripts/generate-manifests.sh. Instead of running 'cue export' twice up front
+and twice per app (plus one 'yq sort_keys(..)' per app), it runs
+
+  cue export ./env.cue -e <env> --out json
+
+once to read every app's resources_list, then one 'cue export --out yaml'
+of all apps' resources and one 'yq sort_keys(..)' over the result, and
+writes each app's documents to manifests/<app>/<app>.yaml. The YAML comes
+from cue and yq as before, so the files are the ones the shell loop writes.
+
+Usage:
+  generate-manifests.py [env] [--project-root DIR] [--manifest-dir DIR] [--incremental]
+  generate-manifests.py --branches [dev,stage,prod] [--project-root DIR] [--manifest-dir DIR]
+
+  env defaults to the current git branch (falling back to dev), like
+  generate-manifests.sh. The project root defaults to the current directory.
+
+Incremental mode (--incremental):
+  Records a fingerprint of each app's inputs (its <env>: <app>: block in
+  env.cue, the templates/apps file it unifies with, and the shared files:
+  the rest of env.cue, templates/core, templates/resources, templates/base,
+  schemas and cue.mod) in .cue-edit-cache/manifests/ (or $CUE_EDIT_CACHE_DIR).
+  Apps whose fingerprint and manifest are unchanged are skipped, and cue is
+  not run at all when every app is up to date. Directories of apps that are
+  no longer in the environment are removed.
+
+Multi-environment mode (--branches):
+  Generates every listed environment from its branch without checking
+  anything out: the module's files on each branch are read with one
+  'git cat-file --batch' into per-branch shadow directories, and the
+  environments are exported and rendered concurrently in a process pool
+  sized to the available cores. Output goes to <manifest-dir>/<env>/<app>/
+  <app>.yaml. Entries are env names (branch = env) or env=ref, e.g.
+  --branches dev,stage=origin/stage,prod=origin/prod.
+
+generate-manifests.sh execs this script when GENERATE_MANIFESTS_PY points
+to it (demo_generate_manifests sets it unless DEMO_GENERATE_MANIFESTS_PY=0).
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import cue_edit
+
+ENVIRONMENTS = ('dev', 'stage', 'prod')
+
+RED = '\033[0;31m'
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+NC = '\033[0m'
+
+
+def log_info(message: str):
+    print(f"{GREEN}[INFO]{NC} {message}", flush=True)
+
+
+def log_warn(message: str):
+    print(f"{YELLOW}[WARN]{NC} {message}", flush=True)
+
+
+def log_error(message: str):
+    print(f"{RED}[ERROR]{NC} {message}", flush=True)
+
+
+# ============================================================================
+# YAML (cue export + yq)
+# ============================================================================
+#
+# The YAML itself comes from the same tools generate-manifests.sh uses: every
+# app's resources are exported in one 'cue export -e <env>.<app>.resources.<r>
+# ... --out yaml' and key-sorted in one 'yq sort_keys(..)' pass (skipped
+# without yq, like the shell loop). Both treat documents independently, so
+# cutting the stream at its '---' lines gives each app the bytes the per-app
+# commands would have written.
+
+def split_documents(stream: str) -> list[str]:
+    """Split a YAML stream at its '---' lines; each document keeps its final newline."""
+    documents, current = [], []
+    for line in stream.splitlines(keepends=True):
+        if line.rstrip('\n') == '---':
+            documents.append(''.join(current))
+            current = []
+        else:
+            current.append(line)
+    documents.append(''.join(current))
+    return documents
+
+
+def render_apps(project_root: Path, env: str, app_resources: dict[str, list[str]]) -> tuple[bool, dict | str]:
+    """Render the manifests of app_resources ({app: resources_list}); returns (success, {app: yaml} or error)."""
+    expressions = [f"{env}.{app_name}.resources.{resource}"
+                   for app_name, resources in app_resources.items() for resource in resources]
+    if not expressions:
+        return True, {}
+    try:
+        result = subprocess.run(
+            ["cue", "export", "./env.cue", *(arg for e in expressions for arg in ('-e', e)), "--out", "yaml"],
+            cwd=project_root, capture_output=True, text=True)
+    except FileNotFoundError:
+        return False, "CUE command not found - install from https://cuelang.org/docs/install/"
+    if result.returncode != 0:
+        return False, result.stderr or result.stdout
+    # The shell loop captures the export with $(...) and echoes it into yq
+    stream = result.stdout.rstrip('\n') + '\n'
+    if shutil.which('yq'):
+        result = subprocess.run(["yq", "sort_keys(..)"], input=stream, capture_output=True, text=True)
+        if result.returncode != 0:
+            return False, f"yq sort_keys(..) failed: {result.stderr or result.stdout}"
+        stream = result.stdout
+
+    documents = split_documents(stream)
+    if len(documents) != len(expressions):
+        return False, f"expected {len(expressions)} YAML documents, got {len(documents)}"
+    rendered, pos = {}, 0
+    for app_name, resources in app_resources.items():
+        rendered[app_name] = '---\n'.join(documents[pos:pos + len(resources)])
+        pos += len(resources)
+    return True, rendered
+
+
+# ============================================================================
+# INCREMENTAL MODE
+# ============================================================================
+
+STATE_VERSION = 1
+
+_APP_REF_RE = re.compile(r'\bapps\.([A-Za-z_$][A-Za-z0-9_$]*)')
+
+
+def _sha256(data: str | bytes) -> str:
+    return hashlib.sha256(data.encode() if isinstance(data, str) else data).hexdigest()
+
+
+def fingerprint_apps(project_root: Path, env: str) -> dict[str, str]:
+    """Fingerprint the inputs of every app defined for env in env.cue."""
+    content = (project_root / 'env.cue').read_text()
+    index = cue_edit.CueIndex(content)
+    app_fields = {name: field for name, field in index.children(env).items() if field.block is not None}
+
+    shared = hashlib.sha256()
+    shared.update(f"generator\0{_sha256(Path(__file__).read_bytes())}\0".encode())
+
+    # env.cue outside this environment's app blocks
+    pos = 0
+    for start, end in sorted((field.start, field.end) for field in app_fields.values()):
+        shared.update(content[pos:start].encode())
+        pos = end
+    shared.update(content[pos:].encode())
+
+    # 'cue export ./env.cue' loads env.cue and the packages it imports, so other
+    # files in the root directory (e.g. seed-env.cue) are not inputs
+    app_templates = {}
+    for rel_path in cue_edit.module_cue_files(str(project_root)):
+        if os.sep not in rel_path:
+            continue
+        data = (project_root / rel_path).read_text()
+        if Path(rel_path).parent.as_posix() == 'templates/apps':
+            app_templates[rel_path] = (_sha256(data), cue_edit.CueIndex(data))
+        else:
+            shared.update(f"{rel_path}\0{_sha256(data)}\0".encode())
+    shared_digest = shared.hexdigest()
+    all_templates = _sha256('\0'.join(f"{path}\0{digest}" for path, (digest, _) in sorted(app_templates.items())))
+
+    fingerprints = {}
+    for name, field in app_fields.items():
+        block = content[field.start:field.end]
+        template_digests = []
+        for ref in sorted(set(_APP_REF_RE.findall(block))):
+            digest = next((d for d, template_index in app_templates.values() if template_index.field(ref)), None)
+            template_digests.append(digest)
+        if not template_digests or None in template_digests:
+            template = all_templates  # unknown template: depend on all of templates/apps
+        else:
+            template = '\0'.join(template_digests)
+        fingerprints[name] = _sha256(f"{shared_digest}\0{block}\0{template}")
+    return fingerprints
+
+
+def state_path(project_root: Path, env: str) -> Path:
+    base = os.environ.get('CUE_EDIT_CACHE_DIR') or project_root / '.cue-edit-cache'
+    return Path(base) / 'manifests' / f'{env}.json'
+
+
+def load_state(path: Path, manifest_dir: Path) -> dict:
+    """Return the recorded {app: {'fingerprint', 'manifest'}} for manifest_dir, or {}."""
+    try:
+        state = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if state.get('version') != STATE_VERSION or state.get('manifest_dir') != str(manifest_dir):
+        return {}
+    return state.get('apps', {})
+
+
+def save_state(path: Path, manifest_dir: Path, apps: dict):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps({'version': STATE_VERSION, 'manifest_dir': str(manifest_dir),
+                                        'apps': apps}, indent=2, sort_keys=True) + '\n')
+        os.replace(tmp_path, path)
+    except OSError as e:
+        log_warn(f"Could not save manifest fingerprints to {path}: {e}")
+
+
+def _manifest_digest(manifest: Path) -> str | None:
+    try:
+        return _sha256(manifest.read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def is_up_to_date(recorded: dict | None, fingerprint: str | None, manifest: Path) -> bool:
+    """An app is current when its fingerprint matches and its manifest is as written."""
+    return (fingerprint is not None and recorded is not None
+            and recorded.get('fingerprint') == fingerprint
+            and recorded.get('manifest') == _manifest_digest(manifest))
+
+
+# ============================================================================
+# GENERATION
+# ============================================================================
+
+def export_environment(project_root: Path, env: str) -> tuple[bool, str]:
+    """Run the single 'cue export' for an environment; returns (success, output)."""
+    try:
+        result = subprocess.run(
+            ["cue", "export", "./env.cue", "-e", env, "--out", "json"],
+            cwd=project_root,
+            capture_output=True,
+            text=True
+        )
+    except FileNotFoundError:
+        return False, "CUE command not found - install from https://cuelang.org/docs/install/"
+    return result.returncode == 0, result.stdout if result.returncode == 0 else result.stderr or result.stdout
+
+
+def app_resources(env: str, app_name: str, app: dict) -> list[str] | None:
+    """Return an app's resources_list, or None if it has none."""
+    resources_list = app.get('resources_list') if isinstance(app, dict) else None
+    if not resources_list:
+        return None
+
+    resources = app.get('resources') or {}
+    missing = [name for name in resources_list if name not in resources]
+    if missing:
+        raise KeyError(f"{env}.{app_name}.resources has no {', '.join(missing)}")
+    return list(resources_list)
+
+
+def _manifest_path(manifest_dir: Path, app_name: str) -> Path:
+    return manifest_dir / app_name / f"{app_name}.yaml"
+
+
+def generate(project_root: Path, env: str, manifest_dir: Path, incremental: bool = False) -> int:
+    module_files = [project_root / rel_path for rel_path in cue_edit.module_cue_files(str(project_root))]
+
+    # Read the module under shared locks, so a cue-edit.py change spanning
+    # several files is seen either completely or not at all (by both exports)
+    with cue_edit.lock_files(shared=module_files):
+        return _generate(project_root, env, manifest_dir, incremental)
+
+
+def _generate(project_root: Path, env: str, manifest_dir: Path, incremental: bool) -> int:
+    fingerprints, recorded = {}, {}
+    if incremental:
+        try:
+            fingerprints = fingerprint_apps(project_root, env)
+        except (OSError, ValueError) as e:
+            log_warn(f"Cannot fingerprint apps ({e}) - regenerating everything")
+        recorded = load_state(state_path(project_root, env), manifest_dir)
+        existing = {p.name for p in manifest_dir.iterdir() if p.is_dir()} if manifest_dir.is_dir() else set()
+        if (fingerprints and set(recorded) == set(fingerprints) and existing <= set(fingerprints)
+                and all(is_up_to_date(recorded[name], fp, _manifest_path(manifest_dir, name))
+                        for name, fp in fingerprints.items())):
+            log_info(f"All {len(fingerprints)} apps in {env} are up to date - nothing to regenerate")
+            return 0
+
+    ok, output = export_environment(project_root, env)
+    if not ok:
+        log_error(f"env.cue is incomplete or invalid for {env}")
+        log_error(f"Run: cue export ./env.cue -e {env} --out json")
+        for line in output.rstrip().splitlines():
+            print(f"  {line}")
+        return 1
+
+    manifest_dir.mkdir(parents=True, exist_ok=True)
+
+    if not incremental:
+        log_info("Cleaning old manifests...")
+        for old_manifest in manifest_dir.rglob('*.yaml'):
+            if old_manifest.is_file():
+                old_manifest.unlink()
+
+    log_info(f"Discovering apps in {env} environment...")
+    apps = json.loads(output) if output.strip() else None
+    app_names = sorted(name for name, value in (apps or {}).items() if isinstance(value, dict))
+
+    if incremental:
+        for stale_dir in sorted(p for p in manifest_dir.iterdir() if p.is_dir() and p.name not in app_names):
+            log_info(f"Removing manifests of app no longer in {env}: {stale_dir.name}")
+            shutil.rmtree(stale_dir)
+
+    if not apps:
+        log_warn(f"No apps defined in {env} environment")
+        if incremental:
+            save_state(state_path(project_root, env), manifest_dir, {})
+        return 0
+    if not app_names:
+        log_warn(f"No apps found in {env} environment")
+        if incremental:
+            save_state(state_path(project_root, env), manifest_dir, {})
+        return 0
+
+    log_info(f"Found apps: {' '.join(app_names)}")
+
+    state, to_render = {}, {}
+    for app_name in app_names:
+        manifest = _manifest_path(manifest_dir, app_name)
+        fingerprint = fingerprints.get(app_name)
+        if incremental and is_up_to_date(recorded.get(app_name), fingerprint, manifest):
+            log_info(f"Unchanged: {app_name}")
+            state[app_name] = recorded[app_name]
+            continue
+
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            resources = app_resources(env, app_name, apps[app_name])
+        except KeyError as e:
+            log_error(f"Error exporting resources for {app_name} in {env}:")
+            print(f"  {e.args[0]}")
+            continue
+        if resources is None:
+            log_warn(f"No resources defined for {app_name} in {env}")
+            log_warn(f"Check that {env}.{app_name}.resources_list exists in ./env.cue")
+            manifest.unlink(missing_ok=True)
+            if fingerprint is not None:
+                state[app_name] = {'fingerprint': fingerprint, 'manifest': None}
+            continue
+        to_render[app_name] = resources
+
+    if to_render:
+        log_info(f"Exporting resources of {len(to_render)} apps: {' '.join(to_render)}")
+    ok, rendered = render_apps(project_root, env, to_render)
+    if not ok:
+        log_error(f"Error exporting resources in {env}:")
+        for line in rendered.rstrip().splitlines():
+            print(f"  {line}")
+        return 1
+
+    for app_name, resources in to_render.items():
+        log_info(f"Processing app: {app_name}")
+        manifest = _manifest_path(manifest_dir, app_name)
+        manifest.write_text(rendered[app_name])
+        fingerprint = fingerprints.get(app_name)
+        if fingerprint is not None:
+            state[app_name] = {'fingerprint': fingerprint, 'manifest': _sha256(rendered[app_name])}
+        log_info(f"Successfully generated {manifest}")
+        log_info(f"Resources: {' '.join(resources)}")
+
+    if incremental:
+        save_state(state_path(project_root, env), manifest_dir, state)
+
+    log_info("Manifest generation complete!")
+    return 0
+
+
+# ============================================================================
+# MULTI-ENVIRONMENT MODE (git objects)
+# ============================================================================
+
+def _git(project_root: Path, *args: str, input: bytes | None = None) -> bytes:
+    result = subprocess.run(["git", "-C", str(project_root), *args], input=input, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)}: {result.stderr.decode(errors='replace').strip()}")
+    return result.stdout
+
+
+def resolve_ref(project_root: Path, ref: str) -> str:
+    """Resolve a branch name to a commit, falling back to origin/<branch>."""
+    for candidate in (ref, f"origin/{ref}"):
+        try:
+            return _git(project_root, "rev-parse", "--verify", "--quiet", f"{candidate}^{{commit}}").decode().strip()
+        except RuntimeError:
+            continue
+    raise RuntimeError(f"Unknown branch or ref: {ref}")
+
+
+def module_blobs(project_root: Path, commit: str) -> dict[str, str]:
+    """Map module file paths (relative to the module root) to blob ids at commit.
+
+    Selects the files 'cue export' can load, like cue-edit.py's shadow trees:
+    .cue files outside hidden (., _) directories plus all of cue.mod.
+    """
+    prefix = _git(project_root, "rev-parse", "--show-prefix").decode().strip()
+    listing = _git(project_root, "ls-tree", "-r", "-z", "--full-tree", f"{commit}:{prefix}")
+    blobs = {}
+    for entry in listing.split(b'\0'):
+        if not entry:
+            continue
+        meta, path = entry.decode().split('\t', 1)
+        mode, kind, blob = meta.split()
+        parts = path.split('/')
+        if kind != 'blob' or mode == '120000':
+            continue
+        if parts[0] == 'cue.mod' or (path.endswith('.cue') and not any(p[0] in '._' for p in parts[:-1])):
+            blobs[path] = blob
+    return blobs
+
+
+def read_blobs(project_root: Path, blob_ids: set[str]) -> dict[str, bytes]:
+    """Read many blobs with a single 'git cat-file --batch' process."""
+    order = sorted(blob_ids)
+    output = _git(project_root, "cat-file", "--batch", input=''.join(f"{b}\n" for b in order).encode())
+    contents, pos = {}, 0
+    for blob in order:
+        header_end = output.index(b'\n', pos)
+        header = output[pos:header_end].decode().split()
+        if len(header) != 3:
+            raise RuntimeError(f"git cat-file: unexpected response for {blob}: {' '.join(header)}")
+        size = int(header[2])
+        contents[blob] = output[header_end + 1:header_end + 1 + size]
+        pos = header_end + 1 + size + 1
+    return contents
+
+
+def render_environment(env: str, module_root: str) -> dict:
+    """Export one environment from a shadow module and render its manifests.
+
+    Runs in a worker process. Returns {'ok', 'error', 'apps'} where apps maps
+    each app name to ('ok', yaml) / ('warn', message) / ('error', message).
+    """
+    ok, output = export_environment(Path(module_root), env)
+    if not ok:
+        return {'ok': False, 'error': output, 'apps': {}}
+    apps = json.loads(output) if output.strip() else {}
+    rendered, to_render = {}, {}
+    for app_name in sorted(name for name, value in (apps or {}).items() if isinstance(value, dict)):
+        try:
+            resources = app_resources(env, app_name, apps[app_name])
+        except KeyError as e:
+            rendered[app_name] = ('error', e.args[0])
+            continue
+        if resources is None:
+            rendered[app_name] = ('warn', f"No resources defined for {app_name} in {env}")
+        else:
+            to_render[app_name] = resources
+    ok, manifests = render_apps(Path(module_root), env, to_render)
+    if not ok:
+        return {'ok': False, 'error': manifests, 'apps': {}}
+    rendered.update((app_name, ('ok', manifest)) for app_name, manifest in manifests.items())
+    rendered = dict(sorted(rendered.items()))
+    return {'ok': True, 'error': '', 'apps': rendered}
+
+
+def _worker_count(jobs: int) -> int:
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    return max(1, min(jobs, cores))
+
+
+def generate_branches(project_root: Path, branches: list[tuple[str, str]], manifest_dir: Path) -> int:
+    """Generate <manifest_dir>/<env>/ for each (env, ref) from git objects."""
+    commits = {env: resolve_ref(project_root, ref) for env, ref in branches}
+    trees = {env: module_blobs(project_root, commit) for env, commit in commits.items()}
+    contents = read_blobs(project_root, {blob for tree in trees.values() for blob in tree.values()})
+
+    shadows = {}
+    try:
+        for env, tree in trees.items():
+            shadow = Path(tempfile.mkdtemp(prefix=f'generate-manifests-{env}-'))
+            shadows[env] = shadow
+            for rel_path, blob in tree.items():
+                dst = shadow / rel_path
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                dst.write_bytes(contents[blob])
+            log_info(f"{env}: {len(tree)} files from {commits[env][:12]}")
+
+        workers = _worker_count(len(shadows))
+        log_info(f"Exporting {len(shadows)} environments with {workers} workers...")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {env: pool.submit(render_environment, env, str(shadow)) for env, shadow in shadows.items()}
+            results = {env: future.result() for env, future in futures.items()}
+    finally:
+        for shadow in shadows.values():
+            shutil.rmtree(shadow, ignore_errors=True)
+
+    status = 0
+    for env, _ in branches:
+        result = results[env]
+        if not result['ok']:
+            log_error(f"env.cue is incomplete or invalid for {env} ({commits[env][:12]}):")
+            for line in result['error'].rstrip().splitlines():
+                print(f"  {line}")
+            status = 1
+            continue
+
+        env_dir = manifest_dir / env
+        if env_dir.exists():
+            shutil.rmtree(env_dir)
+        env_dir.mkdir(parents=True)
+        for app_name, (kind, payload) in result['apps'].items():
+            if kind == 'error':
+                log_error(f"Error exporting resources for {app_name} in {env}:")
+                print(f"  {payload}")
+            elif kind == 'warn':
+                log_warn(payload)
+            else:
+                manifest = env_dir / app_name / f"{app_name}.yaml"
+                manifest.parent.mkdir(parents=True)
+                manifest.write_text(payload)
+                log_info(f"Successfully generated {manifest}")
+        if not result['apps']:
+            log_warn(f"No apps defined in {env} environment")
+
+    log_info("Manifest generation complete!")
+    return status
+
+
+def parse_branches(value: str) -> list[tuple[str, str]]:
+    """Parse 'dev,stage=origin/stage' into [(env, ref)]."""
+    branches = []
+    for item in (part.strip() for part in value.split(',')):
+        if not item:
+            continue
+        env, _, ref = item.partition('=')
+        if env not in ENVIRONMENTS:
+            raise argparse.ArgumentTypeError(f"invalid environment: {env}")
+        branches.append((env, ref or env))
+    return branches
+
+
+def detect_environment(project_root: Path) -> str:
+    result = subprocess.run(["git", "-C", str(project_root), "rev-parse", "--abbrev-ref", "HEAD"],
+                            capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 and result.stdout.strip() else 'dev'
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate Kubernetes manifests from CUE with a single export',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('env', nargs='?', help='Environment (dev/stage/prod); default: current git branch')
+    parser.add_argument('--project-root', type=Path, default=Path.cwd(),
+                        help='k8s-deployments checkout containing env.cue (default: current directory)')
+    parser.add_argument('--manifest-dir', type=Path,
+                        help='Output directory (default: <project-root>/manifests)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only regenerate apps whose inputs changed since the last run')
+    parser.add_argument('--branches', nargs='?', type=parse_branches, const=','.join(ENVIRONMENTS),
+                        help='Generate these environments from their branches into <manifest-dir>/<env>/ '
+                             f"(default: {','.join(ENVIRONMENTS)})")
+    args = parser.parse_args()
+
+    project_root = args.project_root.resolve()
+    if args.branches:
+        manifest_dir = (args.manifest_dir or project_root / 'manifests').resolve()
+        try:
+            sys.exit(generate_branches(project_root, args.branches, manifest_dir))
+        except RuntimeError as e:
+            log_error(str(e))
+            sys.exit(1)
+
+    env = args.env or detect_environment(project_root)
+    if env not in ENVIRONMENTS:
+        log_error(f"Invalid environment: {env}")
+        print(f"Usage: {sys.argv[0]} <{'|'.join(ENVIRONMENTS)}>")
+        sys.exit(1)
+
+    log_info(f"Generating manifests for environment: {env}")
+    manifest_dir = (args.manifest_dir or project_root / 'manifests').resolve()
+    sys.exit(generate(project_root, env, manifest_dir, incremental=args.incremental))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+k8s-assert.py - Check assertions.sh assertions against one snapshot per namespace
+
+Command-line front end of the k8s_assert package (k8s_assert/cli.py); run
+'k8s-assert.py --help' for usage. assert_all in assertions.sh runs it.
+"""
+
+from k8s_assert.cli import main
+
+if __name__ == '__main__':
+    main()
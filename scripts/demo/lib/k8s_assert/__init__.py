@@ -0,0 +1,31 @@
+"""
+k8s_assert - assertions.sh assertions checked against namespace snapshots
+
+The library behind k8s-assert.py (see k8s_assert/cli.py):
+
+  from k8s_assert import Snapshot, parse_assertions, run   # scripts/demo/lib on sys.path
+
+  assertions = parse_assertions([
+      'deployment_env_var dev example-app LOG_LEVEL DEBUG',
+      'configmap_entry_absent prod example-app-config feature.flag',
+  ])
+  if not run(assertions, Snapshot()):
+      for assertion in assertions:
+          print(assertion, assertion.lines)
+
+A Snapshot fetches each namespace it is asked about with one kubectl call
+and answers lookups from memory; run() loads every namespace the
+assertions need at once and re-fetches only what failing, retried
+assertions read. manifest_snapshot(dir) answers the same lookups from
+generated manifests instead, for checks before anything is deployed:
+
+  run(assertions, manifest_snapshot('manifests'), retry=False)
+"""
+
+from .checks import CHECKS
+from .engine import Assertion, parse_assertions, run
+from .manifests import ManifestIndex, manifest_snapshot
+from .snapshot import Snapshot, kubectl_fetch
+
+__all__ = ['CHECKS', 'Assertion', 'ManifestIndex', 'Snapshot', 'kubectl_fetch', 'manifest_snapshot',
+           'parse_assertions', 'run']
@@ -0,0 +1,249 @@
+"""The assertions of assertions.sh, evaluated against a Snapshot.
+
+Each check is named like its shell function without the assert_ prefix and
+takes the same arguments as strings. It returns the lines the shell
+function would print, as (kind, message) with kind 'verify', 'fail' or
+'info'; the assertion holds if none is 'fail'. RETRIES gives the checks
+the shell functions retry (every 2s) and how often, RETRY_WHILE the checks
+that retry only part of what they assert.
+"""
+
+import fnmatch
+import re
+
+from .jsonpath import render
+
+CHECKS = {}
+
+# Attempts of the checks built on assert_field_equals (field_equals takes
+# max_retries as its last argument instead)
+RETRIES = {
+    'field_equals': 5, 'label_equals': 5, 'annotation_equals': 5, 'pod_label_equals': 5,
+    'pod_annotation_equals': 5, 'configmap_entry': 5, 'replicas': 5, 'image': 5,
+    'readiness_probe_timeout': 5, 'env_isolation': 5, 'env_propagation': 5,
+}
+
+# Check -> function of its failed lines, True while a retry may still pass.
+# assert_env_isolation retries only the assert_field_equals on env_has
+# (lines[1]); once that holds, env_lacks is read once and not retried.
+RETRY_WHILE = {
+    'env_isolation': lambda lines: lines[1][0] == 'fail',
+}
+
+_IMAGE = '{.spec.template.spec.containers[0].image}'
+
+
+def check(function):
+    """Register function in CHECKS under its name."""
+    CHECKS[function.__name__] = function
+    return function
+
+
+def _field(snapshot, namespace: str, kind: str, name: str, jsonpath: str) -> str:
+    obj = snapshot.get(namespace, kind, name)
+    return render(obj, jsonpath) if obj is not None else ''
+
+
+def _env_values(snapshot, namespace: str, deployment: str, env_name: str) -> str:
+    return _field(snapshot, namespace, 'deployment', deployment,
+                  f'{{.spec.template.spec.containers[0].env[?(@.name=="{env_name}")].value}}')
+
+
+def _escape_key(key: str) -> str:
+    return key.replace('.', '\\.')
+
+
+@check
+def resource_exists(snapshot, namespace, kind, name):
+    if snapshot.get(namespace, kind, name) is not None:
+        return [('verify', f"Resource exists: {kind}/{name} in {namespace}")]
+    return [('fail', f"Resource not found: {kind}/{name} in {namespace}")]
+
+
+@check
+def resource_absent(snapshot, namespace, kind, name):
+    if snapshot.get(namespace, kind, name) is None:
+        return [('verify', f"Resource absent (expected): {kind}/{name} in {namespace}")]
+    return [('fail', f"Resource exists but should not: {kind}/{name} in {namespace}")]
+
+
+@check
+def field_equals(snapshot, namespace, kind, name, jsonpath, expected, max_retries='5'):
+    actual = _field(snapshot, namespace, kind, name, jsonpath)
+    if actual == expected:
+        return [('verify', f"Field {jsonpath} = '{expected}'")]
+    return [('fail', f"Field {jsonpath}: expected '{expected}', got '{actual}'")]
+
+
+@check
+def field_contains(snapshot, namespace, kind, name, jsonpath, substring):
+    actual = _field(snapshot, namespace, kind, name, jsonpath)
+    if substring in actual:
+        return [('verify', f"Field {jsonpath} contains '{substring}'")]
+    return [('fail', f"Field {jsonpath} does not contain '{substring}' (value: '{actual}')")]
+
+
+@check
+def field_absent(snapshot, namespace, kind, name, jsonpath):
+    actual = _field(snapshot, namespace, kind, name, jsonpath)
+    if not actual:
+        return [('verify', f"Field {jsonpath} is absent/empty (expected)")]
+    return [('fail', f"Field {jsonpath} exists but should not: '{actual}'")]
+
+
+@check
+def label_equals(snapshot, namespace, kind, name, label_key, expected_value):
+    return field_equals(snapshot, namespace, kind, name, f'{{.metadata.labels.{label_key}}}', expected_value)
+
+
+@check
+def label_absent(snapshot, namespace, kind, name, label_key):
+    return field_absent(snapshot, namespace, kind, name, f'{{.metadata.labels.{label_key}}}')
+
+
+@check
+def annotation_equals(snapshot, namespace, kind, name, annotation_key, expected_value):
+    return field_equals(snapshot, namespace, kind, name,
+                        f'{{.metadata.annotations.{_escape_key(annotation_key)}}}', expected_value)
+
+
+@check
+def pod_label_equals(snapshot, namespace, deployment, label_key, expected_value):
+    return field_equals(snapshot, namespace, 'deployment', deployment,
+                        f'{{.spec.template.metadata.labels.{label_key}}}', expected_value)
+
+
+@check
+def pod_annotation_equals(snapshot, namespace, deployment, annotation_key, expected_value):
+    return field_equals(snapshot, namespace, 'deployment', deployment,
+                        f'{{.spec.template.metadata.annotations.{_escape_key(annotation_key)}}}', expected_value)
+
+
+@check
+def pod_annotation_absent(snapshot, namespace, deployment, annotation_key):
+    return field_absent(snapshot, namespace, 'deployment', deployment,
+                        f'{{.spec.template.metadata.annotations.{_escape_key(annotation_key)}}}')
+
+
+@check
+def env_isolation(snapshot, kind, name, jsonpath, expected, env_has, env_lacks):
+    lines = [('info', "Testing environment isolation...")]
+    lines += field_equals(snapshot, env_has, kind, name, jsonpath, expected)
+    if lines[-1][0] == 'fail':
+        return lines + [('fail', f"Isolation test: value should exist in {env_has}")]
+    if _field(snapshot, env_lacks, kind, name, jsonpath) != expected:
+        return lines + [('verify', f"Isolation confirmed: {env_lacks} does not have value '{expected}'")]
+    return lines + [('fail', f"Isolation violated: {env_lacks} has value '{expected}' (should not)")]
+
+
+@check
+def env_propagation(snapshot, kind, name, jsonpath, expected, *envs):
+    lines = [('info', f"Testing environment propagation across: {' '.join(envs)}")]
+    for env in envs:
+        lines += field_equals(snapshot, env, kind, name, jsonpath, expected)
+    if any(line_kind == 'fail' for line_kind, _ in lines):
+        return lines + [('fail', f"Propagation incomplete: not all environments have value '{expected}'")]
+    return lines + [('verify', f"Propagation confirmed: value '{expected}' present in all environments")]
+
+
+@check
+def configmap_entry(snapshot, namespace, configmap, key, expected):
+    return field_equals(snapshot, namespace, 'configmap', configmap, f"{{.data['{key}']}}", expected)
+
+
+@check
+def configmap_entry_absent(snapshot, namespace, configmap, key):
+    return field_absent(snapshot, namespace, 'configmap', configmap, f"{{.data['{key}']}}")
+
+
+@check
+def replicas(snapshot, namespace, deployment, expected):
+    return field_equals(snapshot, namespace, 'deployment', deployment, '{.spec.replicas}', expected)
+
+
+@check
+def image(snapshot, namespace, deployment, expected):
+    return field_equals(snapshot, namespace, 'deployment', deployment, _IMAGE, expected)
+
+
+@check
+def image_contains(snapshot, namespace, deployment, substring):
+    return field_contains(snapshot, namespace, 'deployment', deployment, _IMAGE, substring)
+
+
+@check
+def image_tag_matches(snapshot, namespace, deployment, pattern, description='Image tag matches pattern'):
+    tag = _field(snapshot, namespace, 'deployment', deployment, _IMAGE).rpartition(':')[2]
+    negate = pattern.startswith('!')
+    pattern = pattern.removeprefix('!')
+    if fnmatch.fnmatchcase(tag, pattern):
+        if negate:
+            return [('fail', f"{description}: tag '{tag}' should NOT match '{pattern}'")]
+        return [('verify', f"{description}: tag '{tag}' matches '{pattern}'")]
+    if negate:
+        return [('verify', f"{description}: tag '{tag}' does not match '{pattern}' (expected)")]
+    return [('fail', f"{description}: tag '{tag}' does not match '{pattern}'")]
+
+
+def extract_git_hash_from_image(image: str) -> str:
+    """The trailing git hash (6+ hex characters) of an image or tag, or ''."""
+    match = re.search(r'[a-f0-9]{6,}$', image)
+    return match.group() if match else ''
+
+
+@check
+def same_git_hash_across_envs(snapshot, *envs):
+    first_hash = first_env = ''
+    for env in envs:
+        image_ref = _field(snapshot, env, 'deployment', 'example-app', _IMAGE)
+        git_hash = extract_git_hash_from_image(image_ref)
+        if not git_hash:
+            return [('fail', f"Could not extract git hash from {env} image: {image_ref}")]
+        if not first_hash:
+            first_hash, first_env = git_hash, env
+        elif git_hash != first_hash:
+            return [('fail', f"Git hash mismatch: {first_env}={first_hash}, {env}={git_hash}")]
+    return [('verify', f"Same git hash ({first_hash}) across all environments: {' '.join(envs)}")]
+
+
+@check
+def deployment_env_var(snapshot, namespace, deployment, env_name, expected_value):
+    actual = _env_values(snapshot, namespace, deployment, env_name)
+    if actual == expected_value:
+        return [('verify', f"Env var {env_name} = '{expected_value}' in {namespace}/{deployment}")]
+    return [('fail', f"Env var {env_name}: expected '{expected_value}', got '{actual}' in {namespace}/{deployment}")]
+
+
+@check
+def deployment_env_var_absent(snapshot, namespace, deployment, env_name):
+    actual = _env_values(snapshot, namespace, deployment, env_name)
+    if not actual:
+        return [('verify', f"Env var {env_name} absent (expected) in {namespace}/{deployment}")]
+    return [('fail', f"Env var {env_name} exists but should not: '{actual}' in {namespace}/{deployment}")]
+
+
+@check
+def readiness_probe_timeout(snapshot, namespace, deployment, expected):
+    return field_equals(snapshot, namespace, 'deployment', deployment,
+                        '{.spec.template.spec.containers[0].readinessProbe.timeoutSeconds}', expected)
+
+
+@check
+def deployment_env_var_last(snapshot, namespace, deployment, env_name, expected_value):
+    words = _env_values(snapshot, namespace, deployment, env_name).split()
+    actual = words[-1] if words else ''
+    if actual == expected_value:
+        return [('verify', f"Env var {env_name} (last value) = '{expected_value}' in {namespace}/{deployment}")]
+    return [('fail', f"Env var {env_name} (last value): expected '{expected_value}', got '{actual}' "
+                     f"in {namespace}/{deployment}")]
+
+
+@check
+def deployment_env_var_count(snapshot, namespace, deployment, env_name, expected_count):
+    names = _field(snapshot, namespace, 'deployment', deployment,
+                   '{.spec.template.spec.containers[0].env[*].name}').split()
+    actual_count = str(names.count(env_name))
+    if actual_count == expected_count:
+        return [('verify', f"Env var {env_name} appears {expected_count} time(s) in {namespace}/{deployment}")]
+    return [('fail', f"Env var {env_name} count: expected {expected_count}, got {actual_count} "
+                     f"in {namespace}/{deployment}")]
@@ -0,0 +1,96 @@
+"""
+k8s-assert.py - Check many assertions.sh assertions against one snapshot per namespace
+
+Usage:
+  k8s-assert.py <assertion> <arg>...          # one assertion
+  k8s-assert.py < assertions.txt              # one shell-quoted assertion per line
+  k8s-assert.py --file assertions.txt
+  k8s-assert.py --null                        # NUL-separated, as assert_all sends them
+  k8s-assert.py --manifests manifests/ ...     # against generated manifests, offline
+
+Assertions are the assert_* functions of assertions.sh, without the prefix
+and with the same arguments, e.g.
+
+  deployment_env_var dev example-app LOG_LEVEL DEBUG
+  configmap_entry stage example-app-config redis.url "redis://redis:6379"
+  pod_annotation_absent prod example-app prometheus.io/scrape
+  env_propagation deployment example-app '{.spec.replicas}' 2 dev stage prod
+
+Each namespace's Deployments, ConfigMaps, Services and Pods are fetched
+with one kubectl call (namespaces concurrently) and every assertion is
+evaluated in memory, printing what the shell function would print. The
+assertions the shell functions retry (those built on assert_field_equals)
+are retried every 2s up to 5 times (field_equals: its max_retries), each
+time fetching again only the namespaces and kinds they read.
+
+With --manifests DIR the assertions are answered from the YAML files
+below DIR (e.g. the output of generate-manifests.py --branches, or an
+environment branch's manifests/ with --default-namespace <env>) instead of
+the cluster: every file is parsed once (PyYAML), resources are looked up by
+(kind, namespace, name), and nothing is retried, so invalid manifests fail
+before anything is applied.
+
+Exit status: 0 if every assertion holds, 1 if one fails, 2 for an invalid
+assertion.
+"""
+
+import argparse
+import sys
+
+from .engine import RETRY_DELAY, Assertion, parse_assertions, read_null_separated, run
+from .manifests import manifest_snapshot
+
+# Same markers and colors as demo_verify/demo_fail/demo_info in demo-helpers.sh
+_MARKERS = {
+    'info': '\033[0;34mℹ\033[0m',
+    'verify': '\033[0;32m✓\033[0m',
+    'fail': '\033[0;31m✗\033[0m',
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description='Check assertions.sh assertions against namespace snapshots',
+        formatter_class=argparse.RawDescriptionHelpFormatter, epilog=__doc__)
+    parser.add_argument('assertion', nargs=argparse.REMAINDER,
+                        help='One assertion and its arguments (default: read assertions from stdin)')
+    parser.add_argument('--file', help='Read assertions from FILE (- for stdin)')
+    parser.add_argument('--null', action='store_true',
+                        help="Read '<word count>\\0<word>\\0...' records from stdin (see assert_all)")
+    parser.add_argument('--retry-delay', type=float, default=RETRY_DELAY, metavar='S',
+                        help=f'Seconds between retries (default {RETRY_DELAY:g})')
+    parser.add_argument('--manifests', metavar='DIR',
+                        help='Check the manifests below DIR instead of the cluster (no retries)')
+    parser.add_argument('--default-namespace', default='', metavar='NS',
+                        help='With --manifests: namespace of resources without metadata.namespace')
+    return parser
+
+
+def _read_assertions(args: argparse.Namespace) -> list[Assertion]:
+    if args.assertion:
+        return [Assertion(args.assertion[0], args.assertion[1:])]
+    if args.null:
+        return read_null_separated(sys.stdin.buffer.read())
+    if args.file and args.file != '-':
+        with open(args.file) as f:
+            return parse_assertions(f)
+    return parse_assertions(sys.stdin)
+
+
+def main():
+    args = build_parser().parse_args()
+    try:
+        assertions = _read_assertions(args)
+        if args.manifests:
+            ok = run(assertions, manifest_snapshot(args.manifests, args.default_namespace), retry=False)
+        else:
+            ok = run(assertions, retry_delay=args.retry_delay)
+    except (OSError, ValueError) as e:
+        print(f"  {_MARKERS['fail']} {e}", file=sys.stderr)
+        sys.exit(2)
+    except KeyboardInterrupt:
+        sys.exit(130)
+    for assertion in assertions:
+        for kind, message in assertion.lines:
+            print(f"  {_MARKERS[kind]} {message}", file=sys.stderr)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,128 @@
+"""Evaluate a list of assertions against namespace snapshots.
+
+run() finds the namespaces and kinds all assertions look at, loads them
+with one fetch per namespace (concurrently), and evaluates every assertion
+in memory. Failed assertions that the shell functions retry are retried
+every RETRY_DELAY seconds; before each round only the namespaces and kinds
+those assertions read are fetched again.
+"""
+
+import inspect
+import shlex
+import time
+
+from .checks import CHECKS, RETRIES, RETRY_WHILE
+from .snapshot import Snapshot
+
+# Seconds between attempts of a retried assertion, as in assert_field_equals
+RETRY_DELAY = 2
+
+
+class Assertion:
+    """One assertion: a check name (an assert_* function without the prefix) and its arguments."""
+
+    def __init__(self, name: str, args: list[str]):
+        name = name.removeprefix('assert_')
+        if name not in CHECKS:
+            raise ValueError(f"Unknown assertion: {name}")
+        self.name = name
+        self.args = list(args)
+        self.check = CHECKS[name]
+        try:
+            bound = inspect.signature(self.check).bind(None, *self.args)
+        except TypeError:
+            params = list(inspect.signature(self.check).parameters.values())[1:]
+            usage = ' '.join(f'[{p.name}]' if p.default is not p.empty else
+                             f'<{p.name}>...' if p.kind is p.VAR_POSITIONAL else f'<{p.name}>' for p in params)
+            raise ValueError(f"Usage: {name} {usage}") from None
+        self.attempts = int(bound.arguments.get('max_retries', RETRIES.get(name, 1)))
+        self.lines = []
+
+    @classmethod
+    def parse(cls, line: str) -> 'Assertion | None':
+        """Parse a shell-quoted line ('configmap_entry dev app-config KEY "a value"'); None if blank or a comment."""
+        if line.lstrip().startswith('#'):
+            return None
+        words = shlex.split(line)
+        return cls(words[0], words[1:]) if words else None
+
+    @property
+    def ok(self) -> bool:
+        return not any(kind == 'fail' for kind, _ in self.lines)
+
+    def retry(self, attempt: int) -> bool:
+        """Whether to evaluate again after attempt failed (see RETRIES, RETRY_WHILE)."""
+        if self.ok or self.attempts <= attempt:
+            return False
+        return RETRY_WHILE.get(self.name, lambda lines: True)(self.lines)
+
+    def evaluate(self, snapshot: Snapshot) -> bool:
+        self.lines = self.check(snapshot, *self.args)
+        return self.ok
+
+    def __str__(self):
+        return shlex.join([self.name, *self.args])
+
+
+def parse_assertions(lines) -> list[Assertion]:
+    """Assertions from shell-quoted lines (see Assertion.parse)."""
+    assertions = []
+    for number, line in enumerate(lines, 1):
+        try:
+            assertion = Assertion.parse(line)
+        except ValueError as e:
+            raise ValueError(f"line {number}: {e}") from None
+        if assertion:
+            assertions.append(assertion)
+    return assertions
+
+
+def read_null_separated(data: bytes) -> list[Assertion]:
+    """Assertions from NUL-terminated fields, each assertion as its word count then its words.
+
+    This is what `printf '%s\\0' "$#" "$@"` writes for each assertion in
+    assertions.sh, so any argument (quotes, '#', newlines) arrives as is.
+    """
+    fields = data.decode().split('\0')
+    if fields and fields[-1] == '':
+        fields.pop()
+    assertions = []
+    while fields:
+        count = int(fields[0])
+        words, fields = fields[1:count + 1], fields[count + 1:]
+        if len(words) < count or not words:
+            raise ValueError("truncated assertion list")
+        assertions.append(Assertion(words[0], words[1:]))
+    return assertions
+
+
+def run(assertions: list[Assertion], snapshot: Snapshot | None = None,
+        retry_delay: float = RETRY_DELAY, retry: bool = True) -> bool:
+    """Evaluate assertions (setting their .lines); True if all hold.
+
+    With retry=False every assertion is evaluated once, as for a snapshot
+    that cannot change (see manifests.manifest_snapshot).
+    """
+    snapshot = snapshot or Snapshot()
+    with snapshot.tracking(fetch=False) as wanted:
+        for assertion in assertions:
+            assertion.evaluate(snapshot)
+    snapshot.load(wanted)
+    if not retry:
+        return all([assertion.evaluate(snapshot) for assertion in assertions])
+
+    pending, attempt = assertions, 1
+    while pending:
+        reads = {}
+        for assertion in pending:
+            with snapshot.tracking() as touched:
+                assertion.evaluate(snapshot)
+            if assertion.retry(attempt):
+                for namespace, kinds in touched.items():
+                    reads.setdefault(namespace, set()).update(kinds)
+        pending = [a for a in pending if a.retry(attempt)]
+        if pending:
+            time.sleep(retry_delay)
+            snapshot.refresh(reads)
+            attempt += 1
+    return all(assertion.ok for assertion in assertions)
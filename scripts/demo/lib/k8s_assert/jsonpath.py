@@ -0,0 +1,142 @@
+"""The subset of kubectl's JSONPath templates the assertions use.
+
+Supported: {.a.b}, escaped dots ({.metadata.annotations.prometheus\\.io/port}),
+['key'] and ["key"], [N], [*] and .*, and filters such as
+[?(@.name=="DEBUG")] (== or != against a quoted string or a number, or
+[?(@.field)] for presence). render() prints results like
+`kubectl get -o jsonpath=...`: strings as-is, other values as JSON, several
+results separated by spaces, missing fields as nothing.
+"""
+
+import json
+import re
+
+_FILTER = re.compile(r"""@((?:\.[\w./-]+)+)\s*(?:(==|!=)\s*(?:'([^']*)'|"([^"]*)"|(-?[\d.]+)|(true|false)))?""")
+
+
+def _closing(text: str, start: int) -> int:
+    """Index of the ']' closing the '[' at start, skipping quoted strings."""
+    quote = None
+    for i in range(start + 1, len(text)):
+        char = text[i]
+        if quote:
+            quote = None if char == quote else quote
+        elif char in '\'"':
+            quote = char
+        elif char == ']':
+            return i
+    raise ValueError(f"unclosed '[' in JSONPath: {text}")
+
+
+def _parse_filter(condition: str) -> tuple:
+    match = _FILTER.fullmatch(condition.strip())
+    if not match:
+        raise ValueError(f"unsupported JSONPath filter: ?({condition})")
+    path, op, single, double, number, boolean = match.groups()
+    if number is not None:
+        value = float(number) if '.' in number else int(number)
+    elif boolean is not None:
+        value = boolean == 'true'
+    else:
+        value = single if single is not None else double
+    return path.split('.')[1:], op, value
+
+
+def parse(expression: str) -> list[tuple]:
+    """Parse a JSONPath expression (without braces) into steps."""
+    steps = []
+    i = 0
+    while i < len(expression):
+        char = expression[i]
+        if char == '.':
+            i += 1
+            if expression.startswith('*', i):
+                steps.append(('all',))
+                i += 1
+                continue
+            name = []
+            while i < len(expression) and expression[i] not in '.[':
+                if expression[i] == '\\' and i + 1 < len(expression):
+                    i += 1
+                name.append(expression[i])
+                i += 1
+            if name:
+                steps.append(('field', ''.join(name)))
+        elif char == '[':
+            end = _closing(expression, i)
+            inner = expression[i + 1:end].strip()
+            i = end + 1
+            if inner == '*':
+                steps.append(('all',))
+            elif inner[:1] in ('"', "'") and inner[-1:] == inner[:1]:
+                steps.append(('field', inner[1:-1]))
+            elif inner.startswith('?(') and inner.endswith(')'):
+                steps.append(('filter', *_parse_filter(inner[2:-1])))
+            elif re.fullmatch(r'-?\d+', inner):
+                steps.append(('index', int(inner)))
+            else:
+                raise ValueError(f"unsupported JSONPath subscript: [{inner}]")
+        elif char.isspace():
+            i += 1
+        else:
+            raise ValueError(f"unexpected {char!r} in JSONPath: {expression}")
+    return steps
+
+
+def _lookup(value, path: list[str]):
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return _MISSING
+        value = value[key]
+    return value
+
+
+_MISSING = object()
+
+
+def _matches(item, path: list[str], op: str | None, expected) -> bool:
+    value = _lookup(item, path)
+    if op is None:
+        return value is not _MISSING
+    if value is _MISSING:
+        return False
+    return (value == expected) == (op == '==')
+
+
+def evaluate(value, steps: list[tuple]) -> list:
+    """The values steps select from value (a kubectl object)."""
+    results = [value]
+    for step in steps:
+        selected = []
+        for current in results:
+            if step[0] == 'field':
+                if isinstance(current, dict) and step[1] in current:
+                    selected.append(current[step[1]])
+            elif step[0] == 'index':
+                if isinstance(current, list) and -len(current) <= step[1] < len(current):
+                    selected.append(current[step[1]])
+            elif step[0] == 'all':
+                if isinstance(current, dict):
+                    selected.extend(current.values())
+                elif isinstance(current, list):
+                    selected.extend(current)
+            elif isinstance(current, list):
+                selected.extend(item for item in current if _matches(item, *step[1:]))
+        results = selected
+    return results
+
+
+def _text(value) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, separators=(',', ':'))
+
+
+def render(value, template: str) -> str:
+    """Print value through a kubectl JSONPath template such as '{.spec.replicas}'."""
+    output = []
+    for literal, expression in re.findall(r'([^{]*)(?:\{((?:[^{}\'"]|\'[^\']*\'|"[^"]*")*)\})?', template):
+        output.append(literal)
+        if expression:
+            output.append(' '.join(_text(result) for result in evaluate(value, parse(expression))))
+    return ''.join(output)
@@ -0,0 +1,81 @@
+"""Offline snapshots: assertions answered from generated manifests instead of the cluster.
+
+ManifestIndex reads every manifests/<app>/<app>.yaml (or <env>/<app>/<app>.yaml
+from generate-manifests.py --branches) once and indexes the resources by
+(kind, namespace, name); manifest_snapshot() wraps it in a Snapshot, so the
+same assertions run before anything is deployed. Reading the files needs
+PyYAML.
+"""
+
+from pathlib import Path
+
+from .snapshot import Snapshot, kind_of
+
+
+def load_documents(text: str, source: str = '<string>') -> list:
+    """Parse YAML documents with PyYAML (its C loader when built with libyaml)."""
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError(f"{source}: reading manifests requires PyYAML (pip install pyyaml)") from None
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    try:
+        return list(yaml.load_all(text, Loader=loader))
+    except yaml.YAMLError as e:
+        raise ValueError(f"{source}: {e}") from None
+
+
+class ManifestIndex:
+    """The resources of a manifest directory by (kind, namespace, name), see kind_of.
+
+    Every *.yaml/*.yml file below manifest_dir is read once (items of a
+    'kind: List' are indexed on their own). Resources without
+    metadata.namespace are filed under default_namespace.
+    """
+
+    def __init__(self, manifest_dir: str | Path, default_namespace: str = ''):
+        self.manifest_dir = Path(manifest_dir)
+        if not self.manifest_dir.is_dir():
+            raise ValueError(f"Manifest directory not found: {manifest_dir}")
+        self.resources = {}
+        self.namespaces = {}  # namespace -> kind -> resources
+        self.files = 0
+        for path in sorted(self.manifest_dir.rglob('*')):
+            if path.suffix not in ('.yaml', '.yml') or not path.is_file():
+                continue
+            self.files += 1
+            for document in load_documents(path.read_text(), str(path)):
+                items = document.get('items') if isinstance(document, dict) and document.get('kind') == 'List' \
+                    else [document]
+                for item in items or []:
+                    if isinstance(item, dict) and isinstance(item.get('kind'), str):
+                        self.add(item, default_namespace)
+
+    def add(self, resource: dict, default_namespace: str = ''):
+        metadata = resource.get('metadata') or {}
+        kind = kind_of(resource['kind'])
+        namespace = metadata.get('namespace') or default_namespace
+        self.resources[kind, namespace, metadata.get('name')] = resource
+        self.namespaces.setdefault(namespace, {}).setdefault(kind, []).append(resource)
+
+    def get(self, namespace: str, resource: str, name: str) -> dict | None:
+        return self.resources.get((kind_of(resource), namespace, name))
+
+    def fetch(self, namespace: str, kinds: list[str]) -> dict[str, list[dict]]:
+        """kind -> resources of namespace, like snapshot.kubectl_fetch.
+
+        A kind kind_of does not know (say 'rollouts') also matches its
+        singular, which is what the manifests' 'kind: Rollout' is filed as.
+        """
+        by_kind = self.namespaces.get(namespace, {})
+        objects = {}
+        for kind in kinds:
+            singulars = (kind, kind.removesuffix('s'), kind.removesuffix('es'),
+                         kind[:-3] + 'y' if kind.endswith('ies') else kind)
+            objects[kind] = next((by_kind[name] for name in singulars if name in by_kind), [])
+        return objects
+
+
+def manifest_snapshot(manifest_dir: str | Path, default_namespace: str = '') -> Snapshot:
+    """A Snapshot of the manifests in manifest_dir: lookups never reach the cluster."""
+    return Snapshot(ManifestIndex(manifest_dir, default_namespace).fetch, max_workers=1)
@@ -0,0 +1,152 @@
+"""Namespace snapshots: the objects assertions look at, fetched in one go.
+
+A Snapshot fetches each namespace's Deployments, ConfigMaps, Services and
+Pods with a single `kubectl get ... -o json` (namespaces concurrently) and
+answers every lookup from memory. Other kinds are fetched when an assertion
+first asks for them; refresh() fetches namespaces again for a retry.
+"""
+
+import concurrent.futures
+import contextlib
+import json
+import subprocess
+
+# Kinds every namespace snapshot includes
+DEFAULT_KINDS = ('Deployment', 'ConfigMap', 'Service', 'Pod')
+
+# kubectl resource names (singular, plural, short) of common kinds
+_KINDS = {
+    'Deployment': ('deployment', 'deployments', 'deploy'),
+    'ConfigMap': ('configmap', 'configmaps', 'cm'),
+    'Service': ('service', 'services', 'svc'),
+    'Pod': ('pod', 'pods', 'po'),
+    'Secret': ('secret', 'secrets'),
+    'ServiceAccount': ('serviceaccount', 'serviceaccounts', 'sa'),
+    'StatefulSet': ('statefulset', 'statefulsets', 'sts'),
+    'DaemonSet': ('daemonset', 'daemonsets', 'ds'),
+    'ReplicaSet': ('replicaset', 'replicasets', 'rs'),
+    'Job': ('job', 'jobs'),
+    'CronJob': ('cronjob', 'cronjobs', 'cj'),
+    'Ingress': ('ingress', 'ingresses', 'ing'),
+    'PersistentVolumeClaim': ('persistentvolumeclaim', 'persistentvolumeclaims', 'pvc'),
+    'NetworkPolicy': ('networkpolicy', 'networkpolicies', 'netpol'),
+    'HorizontalPodAutoscaler': ('horizontalpodautoscaler', 'horizontalpodautoscalers', 'hpa'),
+}
+_RESOURCE_KINDS = {name: kind for kind, names in _KINDS.items() for name in (kind.lower(), *names)}
+
+
+def kind_of(resource: str) -> str:
+    """The Kind a kubectl resource name refers to ('deploy' -> 'Deployment').
+
+    Names of other kinds (custom resources) are returned lowercased; their
+    objects are stored under that name.
+    """
+    return _RESOURCE_KINDS.get(resource.lower(), resource.lower())
+
+
+def _kubectl_items(namespace: str, resources: str) -> list[dict] | None:
+    """Items of `kubectl get <resources> -n <namespace> -o json`, or None if it fails."""
+    try:
+        result = subprocess.run(['kubectl', 'get', resources, '-n', namespace, '-o', 'json'],
+                                capture_output=True, text=True)
+    except FileNotFoundError:
+        raise ValueError("kubectl not found in PATH") from None
+    if result.returncode != 0:
+        return None
+    try:
+        return json.loads(result.stdout).get('items') or []
+    except ValueError:
+        return None
+
+
+def kubectl_fetch(namespace: str, kinds: list[str]) -> dict[str, list[dict]]:
+    """Fetch kinds (see kind_of) from a namespace: kind -> objects.
+
+    Known kinds come from one kubectl call; if it fails (e.g. one kind may
+    not be listed), each kind is fetched on its own and a kind that still
+    fails has no objects, as a failed `kubectl get` has no output.
+    """
+    known = [kind for kind in kinds if kind in _KINDS]
+    objects = {kind: [] for kind in kinds}
+    items = _kubectl_items(namespace, ','.join(_KINDS[kind][1] for kind in known)) if known else []
+    if items is None:
+        items = [item for kind in known for item in _kubectl_items(namespace, _KINDS[kind][1]) or []]
+    for item in items:
+        if item.get('kind') in objects:
+            objects[item['kind']].append(item)
+    for kind in kinds:
+        if kind not in _KINDS:
+            objects[kind] = _kubectl_items(namespace, kind) or []
+    return objects
+
+
+class Snapshot:
+    """Objects by (kind, namespace, name), fetched per namespace by fetch.
+
+    fetch(namespace, kinds) returns kind -> objects, like kubectl_fetch.
+    """
+
+    def __init__(self, fetch=kubectl_fetch, max_workers: int = 8):
+        self.fetch = fetch
+        self.max_workers = max_workers
+        self.objects = {}
+        self.loaded = {}  # namespace -> kinds fetched
+        self.fetches = 0
+        self._touched = None
+        self._fetching = True
+
+    def load(self, wanted: dict[str, set[str]]):
+        """Fetch the kinds wanted (namespace -> kinds) that are not loaded yet, namespaces concurrently.
+
+        A namespace fetched for the first time gets DEFAULT_KINDS too.
+        """
+        missing = {}
+        for namespace, kinds in wanted.items():
+            loaded = self.loaded.get(namespace)
+            kinds = set(kinds) | (set() if loaded is not None else set(DEFAULT_KINDS))
+            if kinds - (loaded or set()):
+                missing[namespace] = sorted(kinds - (loaded or set()))
+        if not missing:
+            return
+        with concurrent.futures.ThreadPoolExecutor(min(self.max_workers, len(missing))) as pool:
+            fetched = dict(zip(missing, pool.map(self.fetch, missing, missing.values())))
+        for namespace, objects in fetched.items():
+            self.fetches += 1
+            self.loaded.setdefault(namespace, set()).update(missing[namespace])
+            for kind, items in objects.items():
+                for item in items:
+                    self.objects[kind, namespace, (item.get('metadata') or {}).get('name')] = item
+
+    def refresh(self, wanted: dict[str, set[str]]):
+        """Fetch the kinds wanted again (namespace -> kinds), e.g. before retrying an assertion."""
+        stale = {namespace: set(kinds) for namespace, kinds in wanted.items()}
+        self.objects = {key: item for key, item in self.objects.items()
+                        if key[0] not in stale.get(key[1], ())}
+        for namespace, kinds in stale.items():
+            self.loaded[namespace] = self.loaded.get(namespace, set()) - kinds
+        self.load(stale)
+
+    def get(self, namespace: str, resource: str, name: str) -> dict | None:
+        """The object, or None if it does not exist; fetches its namespace/kind if needed."""
+        kind = kind_of(resource)
+        if self._touched is not None:
+            self._touched.setdefault(namespace, set()).add(kind)
+        if not self._fetching:
+            return None
+        if kind not in self.loaded.get(namespace, ()):
+            self.load({namespace: {kind}})
+        return self.objects.get((kind, namespace, name))
+
+    @contextlib.contextmanager
+    def tracking(self, fetch: bool = True):
+        """Collect the namespaces and kinds looked up in the block: yields namespace -> kinds.
+
+        With fetch=False lookups return None without fetching anything, to
+        find out what some assertions need and load it all at once.
+        """
+        previous = self._touched, self._fetching
+        self._touched, self._fetching = {}, fetch
+        try:
+            yield self._touched
+        finally:
+            self._touched, self._fetching = previous
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+"""
+pipeline-client.py - GitLab, Jenkins and ArgoCD operations for the demo scripts
+
+Command-line front end of the pipeline_client package (pipeline_client/cli.py);
+run 'pipeline-client.py --help' for the commands.
+"""
+
+from pipeline_client.cli import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+"""
+pipeline_client - GitLab, Jenkins and ArgoCD client for the demo scripts
+
+The library behind pipeline-client.py (see pipeline_client/cli.py for the
+commands pipeline-wait.sh uses):
+
+  import asyncio
+  from pipeline_client import Backoff, GitLab, HttpClient, Jenkins
+
+  async def promote(mr_iid):
+      async with HttpClient() as http:
+          gitlab = GitLab(http, gitlab_url, token, 'p2c/k8s-deployments')
+          await gitlab.wait_for_mr_pipeline(mr_iid, timeout=180, backoff=Backoff())
+          await gitlab.accept_mr(mr_iid)
+
+HttpClient keeps connections to each server open and shares them between
+concurrent requests; failures raise PipelineError. Given an events_url,
+GitLab and Jenkins waits wake on webhook events collected by an
+EventReceiver instead of polling.
+"""
+
+from .argocd import wait_for_sync, wait_for_syncs
+from .client import HttpClient, HttpError, PipelineError, Response, TransportError
+from .events import EventReceiver, EventWait
+from .gitlab import GitLab
+from .jenkins import Jenkins
+from .poll import Backoff, WaitTimeout, poll
+
+__all__ = [
+    'Backoff', 'EventReceiver', 'EventWait', 'GitLab', 'HttpClient', 'HttpError', 'Jenkins', 'PipelineError', 'Response', 'TransportError',
+    'WaitTimeout', 'poll', 'wait_for_sync', 'wait_for_syncs',
+]
@@ -0,0 +1,251 @@
+"""ArgoCD Application sync waits through kubectl (see pipeline-wait.sh).
+
+Waits follow the applications with one `kubectl get applications -w`
+stream and check each update as it arrives; if the watch cannot be opened
+they poll `kubectl get application` instead.
+"""
+
+import asyncio
+import codecs
+import json
+import time
+
+from .client import PipelineError
+from .poll import Backoff, WaitTimeout, poll, report
+
+# A revision change reported Synced+Healthy without a finished sync operation
+# (ArgoCD decided nothing needed applying) is accepted after this many seconds
+NOOP_SYNC_GRACE = 20
+
+# Pause after a sync is seen, for the synced resources to settle
+SETTLE_DELAY = 2
+
+
+async def kubectl(*args: str) -> bytes:
+    """Run kubectl and return its stdout; raises PipelineError if it fails."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            'kubectl', *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    except FileNotFoundError:
+        raise PipelineError("kubectl not found in PATH") from None
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise PipelineError(f"kubectl {args[0]} failed: {stderr.decode(errors='replace').strip()}")
+    return stdout
+
+
+async def get_application(app_name: str, namespace: str) -> dict:
+    return json.loads(await kubectl('get', 'application', app_name, '-n', namespace, '-o', 'json'))
+
+
+async def get_revision(app_name: str, namespace: str) -> str:
+    """The revision the application tracks ('' if it cannot be read)."""
+    try:
+        app = await get_application(app_name, namespace)
+    except (PipelineError, ValueError):
+        return ''
+    return app.get('status', {}).get('sync', {}).get('revision') or ''
+
+
+async def refresh(app_name: str, namespace: str):
+    """Ask ArgoCD to compare the application with git now instead of at its next poll."""
+    try:
+        await kubectl('annotate', 'application', app_name, '-n', namespace,
+                      'argocd.argoproj.io/refresh=normal', '--overwrite')
+    except PipelineError:
+        pass
+
+
+def sync_state(app: dict) -> dict:
+    """The fields of an Application a sync wait looks at."""
+    status = app.get('status', {})
+    operation = status.get('operationState') or {}
+    return {
+        'sync': status.get('sync', {}).get('status') or 'Unknown',
+        'health': status.get('health', {}).get('status') or 'Unknown',
+        'revision': status.get('sync', {}).get('revision') or '',
+        'synced_revision': (operation.get('syncResult') or {}).get('revision') or '',
+        'phase': operation.get('phase') or 'None',
+    }
+
+
+def sync_finished(state: dict, baseline: str, elapsed: float) -> str | None:
+    """How a wait started elapsed seconds ago is done with state (see wait_for_sync), or None."""
+    if (state['sync'], state['health']) != ('Synced', 'Healthy') or state['revision'] == baseline:
+        return None
+    if state['synced_revision'] == state['revision']:
+        return 'synced and healthy'
+    if state['phase'] in ('Succeeded', 'None') and elapsed >= NOOP_SYNC_GRACE:
+        return 'synced and healthy (no-op sync)'
+    return None
+
+
+def _report_state(app_name: str, state: dict, elapsed: float):
+    phase = '' if state['phase'] in ('Succeeded', 'None') else f" op={state['phase']}"
+    report('info', f"{app_name}: sync={state['sync']} health={state['health']} "
+                   f"rev={state['revision'][:7]}{phase} ({elapsed:.0f}s)")
+
+
+class ApplicationWatch:
+    """A `kubectl get applications -w -o json` stream for one namespace.
+
+    kubectl prints every application, then each one again whenever it
+    changes, as concatenated JSON documents; next() returns them one by one.
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self.process = None
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._buffer = ''
+
+    async def __aenter__(self):
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                'kubectl', 'get', 'applications', '-n', self.namespace, '-w', '-o', 'json',
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        except FileNotFoundError:
+            raise PipelineError("kubectl not found in PATH") from None
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self.process.returncode is None:
+            self.process.kill()
+        await self.process.wait()
+
+    def _decode(self) -> dict | None:
+        self._buffer = self._buffer.lstrip()
+        try:
+            app, end = json.JSONDecoder().raw_decode(self._buffer)
+        except ValueError:
+            return None
+        self._buffer = self._buffer[end:]
+        return app
+
+    async def next(self, timeout: float) -> dict | None:
+        """The next application update, or None if none arrives within timeout seconds.
+
+        Raises PipelineError once kubectl exits; the API server closes
+        watches after a while, so a long wait may need a new watch.
+        """
+        deadline = time.monotonic() + timeout
+        while (app := self._decode()) is None:
+            try:
+                chunk = await asyncio.wait_for(self.process.stdout.read(65536),
+                                               max(0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                return None
+            if not chunk:
+                stderr = (await self.process.stderr.read()).decode(errors='replace').strip()
+                await self.process.wait()
+                raise PipelineError(f"kubectl watch ended: {stderr or f'exit {self.process.returncode}'}")
+            self._buffer += self._decoder.decode(chunk)
+        return app
+
+
+async def _watch_syncs(app_names: list[str], namespace: str, baselines: dict, start: float,
+                       timeout: float, results: dict):
+    """Wait for app_names with one watch, adding each finished app's state to results.
+
+    A watch the API server closes is reopened; raises PipelineError if one
+    ends before reporting anything, and WaitTimeout.
+    """
+    states, shown = {}, {}
+    while len(results) < len(app_names):
+        async with ApplicationWatch(namespace) as watch:
+            received = False
+            while len(results) < len(app_names):
+                elapsed = time.monotonic() - start
+                if elapsed >= timeout:
+                    pending = ', '.join(app for app in app_names if app not in results)
+                    raise WaitTimeout(f"Timeout waiting for ArgoCD sync of {pending} ({timeout:g}s)")
+                # Wake up when the no-op grace period ends even without an update
+                wake = NOOP_SYNC_GRACE - elapsed if elapsed < NOOP_SYNC_GRACE else timeout - elapsed
+                try:
+                    app = await watch.next(min(wake, timeout - elapsed))
+                except PipelineError:
+                    if not received:
+                        raise
+                    break
+                if app is not None:
+                    received = True
+                    name = (app.get('metadata') or {}).get('name')
+                    if name in app_names and name not in results:
+                        states[name] = sync_state(app)
+
+                elapsed = time.monotonic() - start
+                for name, state in states.items():
+                    if name in results:
+                        continue
+                    if done := sync_finished(state, baselines[name], elapsed):
+                        report('verify', f"{name} {done}")
+                        results[name] = state
+                    elif shown.get(name) != state:
+                        _report_state(name, state, elapsed)
+                        shown[name] = state
+
+
+async def _poll_sync(app_name: str, namespace: str, baseline: str, start: float, timeout: float,
+                     backoff: Backoff) -> dict:
+    offset = time.monotonic() - start
+
+    async def check(elapsed):
+        try:
+            state = sync_state(await get_application(app_name, namespace))
+        except (PipelineError, ValueError):
+            state = sync_state({})
+        if done := sync_finished(state, baseline, elapsed + offset):
+            report('verify', f"{app_name} {done}")
+            return state
+        _report_state(app_name, state, elapsed + offset)
+        return None
+
+    return await poll(check, timeout - offset, backoff, f'ArgoCD sync of {app_name}')
+
+
+async def wait_for_syncs(app_names: list[str], namespace: str, baselines: dict, timeout: float,
+                         backoff: Backoff) -> dict:
+    """Wait for several applications at once (see wait_for_sync): app -> state.
+
+    One watch serves all of them; if it cannot be opened, each application
+    is polled with backoff. Raises the first PipelineError once every wait
+    has ended.
+    """
+    missing = [app for app in app_names if baselines.get(app) is None]
+    revisions = await asyncio.gather(*(get_revision(app, namespace) for app in missing))
+    baselines = {**baselines, **dict(zip(missing, revisions))}
+    for app in app_names:
+        report('action', f"Waiting for ArgoCD sync: {app} (timeout {timeout:g}s)...")
+    await asyncio.gather(*(refresh(app, namespace) for app in app_names))
+
+    start = time.monotonic()
+    results = {}
+    try:
+        await _watch_syncs(app_names, namespace, baselines, start, timeout, results)
+    except WaitTimeout:
+        raise
+    except PipelineError as e:
+        report('warn', f"ArgoCD watch unavailable, polling instead: {e}")
+        pending = [app for app in app_names if app not in results]
+        polled = await asyncio.gather(
+            *(_poll_sync(app, namespace, baselines[app], start, timeout, backoff) for app in pending),
+            return_exceptions=True)
+        for result in polled:
+            if isinstance(result, BaseException):
+                raise result
+        results.update(zip(pending, polled))
+    await asyncio.sleep(SETTLE_DELAY)
+    return {app: results[app] for app in app_names}
+
+
+async def wait_for_sync(app_name: str, namespace: str, baseline: str | None, timeout: float,
+                        backoff: Backoff) -> dict:
+    """Wait until the application tracks a revision other than baseline, synced and healthy.
+
+    The sync must also be finished: the last sync operation applied the
+    tracked revision or, after NOOP_SYNC_GRACE seconds with no operation
+    running, ArgoCD found nothing to apply. baseline defaults to the
+    current revision. Returns the final sync_state.
+    """
+    states = await wait_for_syncs([app_name], namespace, {app_name: baseline}, timeout, backoff)
+    return states[app_name]
@@ -0,0 +1,283 @@
+"""
+pipeline-client.py - GitLab, Jenkins and ArgoCD operations for the demo scripts
+
+One process per operation instead of curl + jq per request: a wait polls
+over pooled keep-alive connections (one TLS handshake per server), decodes
+each response once, and fans independent requests out concurrently.
+pipeline-wait.sh calls it from its helper functions.
+
+Usage:
+  pipeline-client.py mr create <source> <target> <title> [--description TEXT]   # prints the IID
+  pipeline-client.py mr get <iid>...                 # MR JSON (one line per MR when several)
+  pipeline-client.py mr changes <iid>                # MR changes JSON
+  pipeline-client.py mr wait-pipeline <iid> [--timeout S]
+  pipeline-client.py mr accept <iid>
+  pipeline-client.py mr diff-contains <iid> <file-regex> <text>
+  pipeline-client.py mr trigger-commit <iid>
+  pipeline-client.py mr wait-promotion <env> [--since ISO-8601] [--timeout S]   # prints the IID
+  pipeline-client.py commit statuses <sha>
+  pipeline-client.py file get <branch> <path>        # raw content; exit 1 if missing
+  pipeline-client.py file commit <branch> <path> <message> [--from PATH|-]
+  pipeline-client.py jenkins scan [<job>]
+  pipeline-client.py jenkins build-number <branch>... [--job JOB]
+  pipeline-client.py jenkins wait-build <branch> [--baseline N] [--timeout S]
+  pipeline-client.py argocd wait-sync <app>[=<rev>]... [--baseline REV] [--timeout S]
+  pipeline-client.py events serve [--host H] [--port N]      # webhook receiver (runs until killed)
+  pipeline-client.py events subscribe <receiver-url>         # add a GitLab webhook, print its id
+  pipeline-client.py events unsubscribe <hook-id>
+
+Progress is printed to stderr like the demo_* helpers; failures are printed
+the same way and exit with status 1.
+
+Configuration (environment, as loaded by pipeline-wait.sh):
+  GITLAB_URL_EXTERNAL, GITLAB_TOKEN, DEPLOYMENTS_REPO_PATH (p2c/k8s-deployments)
+  JENKINS_URL_EXTERNAL, JENKINS_USER, JENKINS_TOKEN, DEPLOYMENTS_REPO_NAME (k8s-deployments)
+  ARGOCD_NAMESPACE (argocd)
+  MR_PIPELINE_TIMEOUT, JENKINS_BUILD_TIMEOUT, JENKINS_BUILD_START_TIMEOUT, ARGOCD_SYNC_TIMEOUT
+
+Polling:
+  Waits poll after 2s, then back off by 1.5x up to 10s, each delay randomized
+  by +-20% (--poll-interval, --max-poll-interval, --backoff or
+  $PIPELINE_POLL_INTERVAL, $PIPELINE_POLL_MAX_INTERVAL, $PIPELINE_POLL_BACKOFF).
+  Unreachable servers and HTTP 5xx answers are retried until the timeout.
+
+Webhook events (instead of polling):
+  'events serve' receives GitLab webhooks on POST /gitlab (pipeline and merge
+  request events; 'events subscribe' registers one for the project) and
+  Jenkins Notification plugin POSTs on /jenkins. With $PIPELINE_EVENTS_URL
+  pointing at it, mr wait-pipeline, mr wait-promotion and jenkins wait-build
+  re-check the moment a matching event arrives, and otherwise only every
+  $PIPELINE_EVENTS_FALLBACK_INTERVAL seconds (default 30). Without a reachable
+  receiver they poll as above. POSTs must carry $PIPELINE_EVENTS_SECRET when it
+  is set (GitLab: the webhook token; Jenkins: ?token=<secret> in the URL).
+
+ArgoCD waits:
+  argocd wait-sync follows all its applications with one
+  `kubectl get applications -w -o json` stream and returns as soon as each has
+  synced a revision other than its baseline (app=<rev>, else --baseline, else
+  the current one). If the watch cannot be opened, it polls as above.
+
+Testing:
+  Every URL may be plain http://, so the client can be pointed at a local
+  stand-in server by setting the *_URL_EXTERNAL variables.
+  check-pipeline-client.py runs such a server (asyncio, on 127.0.0.1) and
+  checks connection pooling, the Jenkins crumb and session cookie, re-sending
+  on stale pooled connections (never a POST the server answered), and 5xx
+  retries with backoff; it needs neither GitLab nor Jenkins.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from .argocd import wait_for_syncs
+from .client import HttpClient, PipelineError
+from .events import EventReceiver, events_url, subscribe_gitlab, unsubscribe_gitlab
+from .gitlab import GitLab
+from .jenkins import Jenkins
+from .poll import Backoff, report
+
+
+def _env_timeout(name: str, default: float) -> float:
+    return float(os.environ.get(name) or default)
+
+
+def _require(*names: str) -> list[str]:
+    missing = [name for name in names if not os.environ.get(name)]
+    if missing:
+        raise PipelineError(f"{', '.join(missing)} not set")
+    return [os.environ[name] for name in names]
+
+
+def _gitlab(http: HttpClient) -> GitLab:
+    url, token = _require('GITLAB_URL_EXTERNAL', 'GITLAB_TOKEN')
+    return GitLab(http, url, token, os.environ.get('DEPLOYMENTS_REPO_PATH') or 'p2c/k8s-deployments',
+                  events_url())
+
+
+def _jenkins(http: HttpClient) -> Jenkins:
+    url, user, token = _require('JENKINS_URL_EXTERNAL', 'JENKINS_USER', 'JENKINS_TOKEN')
+    return Jenkins(http, url, user, token, events_url())
+
+
+def _job_name(args) -> str:
+    return getattr(args, 'job', None) or os.environ.get('DEPLOYMENTS_REPO_NAME') or 'k8s-deployments'
+
+
+def _print_json_responses(responses: list):
+    if len(responses) == 1:
+        sys.stdout.write(responses[0].text)
+        return
+    for response in responses:
+        print(json.dumps(response.json()))
+
+
+async def run(args: argparse.Namespace, http: HttpClient) -> int:
+    """Run one parsed command; returns the exit status."""
+    backoff = Backoff(args.poll_interval, args.max_poll_interval, args.backoff)
+    command = (args.group, args.action)
+
+    if command == ('mr', 'create'):
+        mr = await _gitlab(http).create_mr(args.source, args.target, args.title, args.description)
+        print(mr['iid'])
+    elif command == ('mr', 'get'):
+        gitlab = _gitlab(http)
+        _print_json_responses(await asyncio.gather(*(gitlab.get_mr(iid) for iid in args.iids)))
+    elif command == ('mr', 'changes'):
+        _print_json_responses([await _gitlab(http).mr_changes(args.iid)])
+    elif command == ('mr', 'wait-pipeline'):
+        gitlab, jenkins = _gitlab(http), _jenkins(http)
+        timeout = args.timeout or _env_timeout('MR_PIPELINE_TIMEOUT', 180)
+        report('action', f"Waiting for Jenkins CI on MR !{args.iid} (timeout {timeout:g}s)...")
+        await jenkins.trigger_scan(_job_name(args))
+        await gitlab.wait_for_mr_pipeline(args.iid, timeout, backoff)
+    elif command == ('mr', 'accept'):
+        await _gitlab(http).accept_mr(args.iid)
+    elif command == ('mr', 'diff-contains'):
+        return 0 if await _gitlab(http).mr_diff_contains(args.iid, args.pattern, args.expected) else 1
+    elif command == ('mr', 'trigger-commit'):
+        await _gitlab(http).trigger_mr_commit(args.iid, time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()))
+        await asyncio.sleep(3)  # give GitLab time to fire the push webhook
+    elif command == ('mr', 'wait-promotion'):
+        since = args.since or time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        mr = await _gitlab(http).wait_for_promotion_mr(args.env, since, args.timeout, backoff)
+        print(mr['iid'])
+    elif command == ('commit', 'statuses'):
+        _print_json_responses([await _gitlab(http).commit_statuses(args.sha)])
+    elif command == ('file', 'get'):
+        content = await _gitlab(http).get_file(args.branch, args.path)
+        if content is None:
+            return 1
+        sys.stdout.buffer.write(content)
+    elif command == ('file', 'commit'):
+        content = sys.stdin.read() if args.source == '-' else open(args.source).read()
+        await _gitlab(http).commit_file(args.branch, args.path, content, args.message)
+    elif command == ('jenkins', 'scan'):
+        status = await _jenkins(http).trigger_scan(_job_name(args))
+        if status in (200, 201, 302):
+            print(status)
+        await asyncio.sleep(args.settle)
+    elif command == ('jenkins', 'build-number'):
+        jenkins = _jenkins(http)
+        for number in await asyncio.gather(*(jenkins.build_number(b, _job_name(args)) for b in args.branches)):
+            print(number)
+    elif command == ('jenkins', 'wait-build'):
+        timeout = args.timeout or _env_timeout('JENKINS_BUILD_TIMEOUT', 120)
+        start_timeout = _env_timeout('JENKINS_BUILD_START_TIMEOUT', 60)
+        await _jenkins(http).wait_for_build(args.branch, _job_name(args), args.baseline, timeout,
+                                            start_timeout, backoff)
+    elif command == ('argocd', 'wait-sync'):
+        timeout = args.timeout or _env_timeout('ARGOCD_SYNC_TIMEOUT', 120)
+        namespace = args.namespace or os.environ.get('ARGOCD_NAMESPACE') or 'argocd'
+        apps = dict(app.partition('=')[::2] for app in args.apps)
+        baselines = {app: baseline or args.baseline for app, baseline in apps.items()}
+        await wait_for_syncs(list(apps), namespace, baselines, timeout, backoff)
+    elif command == ('events', 'serve'):
+        await EventReceiver(os.environ.get('PIPELINE_EVENTS_SECRET')).serve(args.host, args.port)
+    elif command == ('events', 'subscribe'):
+        print(await subscribe_gitlab(_gitlab(http), args.url, os.environ.get('PIPELINE_EVENTS_SECRET')))
+    elif command == ('events', 'unsubscribe'):
+        await unsubscribe_gitlab(_gitlab(http), args.hook_id)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description='GitLab, Jenkins and ArgoCD operations for the demo scripts',
+        formatter_class=argparse.RawDescriptionHelpFormatter, epilog=__doc__)
+    parser.add_argument('--poll-interval', type=float, metavar='S', help='First poll delay (default 2)')
+    parser.add_argument('--max-poll-interval', type=float, metavar='S', help='Longest poll delay (default 10)')
+    parser.add_argument('--backoff', type=float, metavar='FACTOR', help='Poll delay growth (default 1.5)')
+    parser.add_argument('--max-connections', type=int, default=4, metavar='N',
+                        help='Open connections per server (default 4)')
+    parser.add_argument('--request-timeout', type=float, default=30, metavar='S',
+                        help='Timeout of each request (default 30)')
+    parser.add_argument('--verify-tls', action='store_true', help='Verify TLS certificates (default: no, like curl -k)')
+    groups = parser.add_subparsers(dest='group', required=True)
+
+    mr = groups.add_parser('mr', help='GitLab merge requests').add_subparsers(dest='action', required=True)
+    create = mr.add_parser('create', help='Open an MR and print its IID')
+    create.add_argument('source')
+    create.add_argument('target')
+    create.add_argument('title')
+    create.add_argument('--description', default='Automated MR from demo script')
+    mr.add_parser('get', help='Print MR JSON').add_argument('iids', nargs='+', metavar='iid')
+    mr.add_parser('changes', help='Print MR changes JSON').add_argument('iid')
+    wait_pipeline = mr.add_parser('wait-pipeline', help="Wait for Jenkins CI on the MR's head pipeline")
+    wait_pipeline.add_argument('iid')
+    wait_pipeline.add_argument('--timeout', type=float, metavar='S')
+    wait_pipeline.add_argument('--job', help='Jenkins job to scan (default $DEPLOYMENTS_REPO_NAME)')
+    mr.add_parser('accept', help='Merge the MR once GitLab allows it').add_argument('iid')
+    diff_contains = mr.add_parser('diff-contains', help="Check the MR's diff of matching files for text")
+    diff_contains.add_argument('iid')
+    diff_contains.add_argument('pattern', help='Regular expression matched against changed file paths')
+    diff_contains.add_argument('expected')
+    mr.add_parser('trigger-commit', help="Commit .mr-trigger to the MR's branch to start Jenkins").add_argument('iid')
+    wait_promotion = mr.add_parser('wait-promotion', help='Wait for the promotion MR Jenkins opens; print its IID')
+    wait_promotion.add_argument('env')
+    wait_promotion.add_argument('--since', metavar='ISO-8601', help='Only MRs created after (default: now)')
+    wait_promotion.add_argument('--timeout', type=float, default=180, metavar='S')
+
+    commit = groups.add_parser('commit', help='GitLab commits').add_subparsers(dest='action', required=True)
+    commit.add_parser('statuses', help='Print commit statuses JSON').add_argument('sha')
+
+    files = groups.add_parser('file', help='GitLab repository files').add_subparsers(dest='action', required=True)
+    get_file = files.add_parser('get', help="Print a file's content on a branch")
+    get_file.add_argument('branch')
+    get_file.add_argument('path')
+    commit_file = files.add_parser('commit', help='Commit a file to a branch (created or updated)')
+    commit_file.add_argument('branch')
+    commit_file.add_argument('path')
+    commit_file.add_argument('message')
+    commit_file.add_argument('--from', dest='source', default='-', metavar='PATH',
+                             help="File with the new content ('-', the default, reads stdin)")
+
+    jenkins = groups.add_parser('jenkins', help='Jenkins jobs').add_subparsers(dest='action', required=True)
+    scan = jenkins.add_parser('scan', help='Trigger a multibranch scan')
+    scan.add_argument('job', nargs='?')
+    scan.add_argument('--settle', type=float, default=3, metavar='S',
+                      help='Seconds to wait afterwards for the scan to start (default 3)')
+    build_number = jenkins.add_parser('build-number', help="Print branches' last build numbers (0 if none)")
+    build_number.add_argument('branches', nargs='+', metavar='branch')
+    build_number.add_argument('--job')
+    wait_build = jenkins.add_parser('wait-build', help='Wait for a new build of a branch to finish')
+    wait_build.add_argument('branch')
+    wait_build.add_argument('--baseline', type=int, help='Wait for a build newer than this (default: the last one)')
+    wait_build.add_argument('--timeout', type=float, metavar='S')
+    wait_build.add_argument('--job')
+
+    argocd = groups.add_parser('argocd', help='ArgoCD applications').add_subparsers(dest='action', required=True)
+    wait_sync = argocd.add_parser('wait-sync', help='Wait for applications to sync a new revision')
+    wait_sync.add_argument('apps', nargs='+', metavar='app[=rev]', help="Application, optionally with its baseline")
+    wait_sync.add_argument('--baseline', help='Revision to move away from (default: the current one)')
+    wait_sync.add_argument('--timeout', type=float, metavar='S')
+    wait_sync.add_argument('--namespace', help='Default $ARGOCD_NAMESPACE or argocd')
+
+    events = groups.add_parser('events', help='Webhook receiver').add_subparsers(dest='action', required=True)
+    serve = events.add_parser('serve', help='Receive GitLab/Jenkins webhooks for waits (see $PIPELINE_EVENTS_URL)')
+    serve.add_argument('--host', default='0.0.0.0', help='Address to listen on (default 0.0.0.0)')
+    serve.add_argument('--port', type=int, default=8765, help='Port to listen on (default 8765)')
+    events.add_parser('subscribe', help="Send the project's pipeline and MR events to a receiver").add_argument(
+        'url', help='Receiver URL as reachable from GitLab')
+    events.add_parser('unsubscribe', help='Remove a webhook added by subscribe').add_argument('hook_id')
+    return parser
+
+
+async def _main(args: argparse.Namespace) -> int:
+    async with HttpClient(args.max_connections, args.request_timeout, args.verify_tls) as http:
+        return await run(args, http)
+
+
+def main():
+    args = build_parser().parse_args()
+    try:
+        status = asyncio.run(_main(args))
+    except (PipelineError, OSError) as e:
+        report('fail', str(e))
+        status = 1
+    except KeyboardInterrupt:
+        status = 130
+    sys.exit(status)
@@ -0,0 +1,275 @@
+"""Pooled keep-alive HTTP/1.1 client on asyncio streams (standard library only)."""
+
+import asyncio
+import base64
+import json
+import ssl
+from urllib.parse import urlencode, urlsplit
+
+
+class PipelineError(Exception):
+    """A request or wait failed; the message is shown to the user as is."""
+
+
+class TransportError(PipelineError):
+    """The server could not be reached or did not answer in time."""
+
+
+class HttpError(PipelineError):
+    """The server answered with an error status."""
+
+    def __init__(self, response: 'Response'):
+        super().__init__(f"HTTP {response.status} from {response.url}: {response.error_message()}")
+        self.response = response
+
+
+class Response:
+    """A complete response; the body is decoded as JSON at most once (json())."""
+
+    def __init__(self, url: str, status: int, headers: dict, cookies: list, body: bytes):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.cookies = cookies
+        self.body = body
+        self._json = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(errors='replace')
+
+    def json(self):
+        """Return the decoded JSON body (None when the body is not JSON)."""
+        if self._json is None and self.body:
+            try:
+                self._json = json.loads(self.body)
+            except ValueError:
+                self._json = None
+        return self._json
+
+    def raise_for_status(self) -> 'Response':
+        if not self.ok:
+            raise HttpError(self)
+        return self
+
+    def error_message(self) -> str:
+        """GitLab/Jenkins error text: 'message' or 'error' from a JSON body, else the status."""
+        data = self.json()
+        if isinstance(data, dict):
+            message = data.get('message') or data.get('error')
+            if message:
+                return message if isinstance(message, str) else json.dumps(message)
+        return 'Unknown error' if self.ok else f'status {self.status}'
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+        self.answered = False  # response bytes were read for the current request
+
+    def usable(self) -> bool:
+        return not self.reader.at_eof() and not self.writer.is_closing()
+
+    def close(self):
+        self.writer.close()
+
+
+# Methods safe to send twice (not PUT: GitLab merges a merge request on PUT)
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'DELETE'})
+
+
+class HttpClient:
+    """HTTP client keeping connections open between requests.
+
+    Connections are pooled per (scheme, host, port): at most max_connections
+    are open to one origin, idle ones are reused for the next request (TLS is
+    negotiated once per connection, not per request), and requests beyond
+    the limit wait for a free connection, so gather() fans out safely.
+    A request that fails on a reused connection (closed by the server while
+    idle) is sent again on a new one only if no response bytes arrived or
+    the method is in IDEMPOTENT_METHODS; a POST that fails mid-response
+    raises TransportError instead of being sent twice.
+    Cookies set by a server are sent back to it (Jenkins ties its CSRF crumb
+    to the session). TLS certificates are not verified unless verify_tls,
+    like 'curl -k'.
+    """
+
+    def __init__(self, max_connections: int = 4, timeout: float = 30.0, verify_tls: bool = False):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.ssl_context = ssl.create_default_context()
+        if not verify_tls:
+            self.ssl_context.check_hostname = False
+            self.ssl_context.verify_mode = ssl.CERT_NONE
+        self._idle = {}
+        self._slots = {}
+        self._cookies = {}
+        self.stats = {'requests': 0, 'connections': 0}
+
+    async def __aenter__(self) -> 'HttpClient':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close every idle connection."""
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+        self._idle.clear()
+
+    async def get(self, url: str, **kwargs) -> Response:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> Response:
+        return await self.request('POST', url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> Response:
+        return await self.request('PUT', url, **kwargs)
+
+    async def request(self, method: str, url: str, headers: dict | None = None, params: dict | None = None,
+                      json_body=None, auth: tuple[str, str] | None = None,
+                      timeout: float | None = None) -> Response:
+        """Send one request and return the complete response (any status).
+
+        Raises TransportError if the server cannot be reached or does not
+        answer within timeout (default: the client's).
+        """
+        timeout = timeout or self.timeout
+        if params:
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise PipelineError(f"Invalid URL: {url}")
+        origin = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+
+        request_headers = {'Host': parts.netloc, 'User-Agent': 'pipeline-client', 'Accept': 'application/json',
+                           'Connection': 'keep-alive'}
+        body = b''
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            request_headers['Content-Type'] = 'application/json'
+        if body or method in ('POST', 'PUT', 'PATCH'):
+            request_headers['Content-Length'] = str(len(body))
+        if auth:
+            token = base64.b64encode(f'{auth[0]}:{auth[1]}'.encode()).decode()
+            request_headers['Authorization'] = f'Basic {token}'
+        cookies = self._cookies.get(origin)
+        if cookies:
+            request_headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in cookies.items())
+        request_headers.update(headers or {})
+
+        target = parts.path or '/'
+        if parts.query:
+            target += f'?{parts.query}'
+        head = f'{method} {target} HTTP/1.1\r\n'
+        head += ''.join(f'{name}: {value}\r\n' for name, value in request_headers.items())
+        payload = head.encode('latin-1') + b'\r\n' + body
+
+        try:
+            response = await asyncio.wait_for(self._send(origin, url, method, payload), timeout)
+        except asyncio.TimeoutError:
+            raise TransportError(f"Timeout after {timeout:g}s: {method} {url}") from None
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            raise TransportError(f"{method} {url} failed: {e or type(e).__name__}") from None
+
+        for cookie in response.cookies:
+            name, _, value = cookie.split(';', 1)[0].partition('=')
+            self._cookies.setdefault(origin, {})[name.strip()] = value.strip()
+        return response
+
+    async def _send(self, origin: tuple, url: str, method: str, payload: bytes) -> Response:
+        slots = self._slots.setdefault(origin, asyncio.Semaphore(self.max_connections))
+        async with slots:
+            for attempt in range(2):
+                connection = await self._connection(origin, reuse=attempt == 0)
+                connection.answered = False
+                try:
+                    connection.writer.write(payload)
+                    await connection.writer.drain()
+                    response, keep_alive = await self._read_response(connection, url, method)
+                    break
+                except (OSError, asyncio.IncompleteReadError):
+                    connection.close()
+                    # A reused connection may have been closed by the server
+                    # while idle; retry once on a new one, but only if the
+                    # server cannot have acted on the request already: it
+                    # never answered or the method is idempotent
+                    if not connection.reused or (connection.answered and method not in IDEMPOTENT_METHODS):
+                        raise
+                except BaseException:
+                    connection.close()
+                    raise
+            self.stats['requests'] += 1
+            if keep_alive:
+                self._idle.setdefault(origin, []).append(connection)
+            else:
+                connection.close()
+            return response
+
+    async def _connection(self, origin: tuple, reuse: bool = True) -> _Connection:
+        idle = self._idle.get(origin, [])
+        while reuse and idle:
+            connection = idle.pop()
+            if connection.usable():
+                connection.reused = True
+                return connection
+            connection.close()
+        scheme, host, port = origin
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=self.ssl_context if scheme == 'https' else None,
+            server_hostname=host if scheme == 'https' else None)
+        self.stats['connections'] += 1
+        return _Connection(reader, writer)
+
+    async def _read_response(self, connection: _Connection, url: str, method: str) -> tuple[Response, bool]:
+        reader = connection.reader
+        status_line = await reader.readline()
+        if not status_line:
+            raise asyncio.IncompleteReadError(b'', None)
+        connection.answered = True
+        version, status, *_ = status_line.decode('latin-1').split(' ', 2)
+        status = int(status)
+
+        headers, cookies = {}, []
+        while True:
+            line = (await reader.readline()).decode('latin-1').rstrip('\r\n')
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            name, value = name.strip().lower(), value.strip()
+            if name == 'set-cookie':
+                cookies.append(value)
+            headers[name] = value
+
+        keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            body = b''
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = await self._read_chunked(reader)
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return Response(url, status, headers, cookies, body), keep_alive
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';', 1)[0].strip(), 16)
+            if size == 0:
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        while (await reader.readline()).strip():
+            pass  # trailers
+        return b''.join(chunks)
@@ -0,0 +1,224 @@
+"""Webhook receiver for GitLab and Jenkins events, and event-driven wake-ups for waits.
+
+EventReceiver is a small HTTP server: GitLab project webhooks (pipeline,
+merge request, push) POST to /gitlab, the Jenkins Notification plugin POSTs
+to /jenkins. Events are normalized, kept in a bounded buffer with sequence
+numbers, and served to waiters through a long-poll GET /events?since=N.
+
+EventWait is the waiter side used by poll(): instead of sleeping between
+checks it blocks on /events until an event matching its predicate arrives,
+then the wait re-checks the API at once. When no event comes, it re-checks
+after a slow fallback interval, so a missing or misconfigured webhook only
+makes waits slower, never wrong.
+"""
+
+import asyncio
+import collections
+import json
+import os
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from .client import HttpClient, PipelineError
+from .poll import report
+
+# Seconds between checks when no event arrives ($PIPELINE_EVENTS_FALLBACK_INTERVAL)
+FALLBACK_INTERVAL = float(os.environ.get('PIPELINE_EVENTS_FALLBACK_INTERVAL', 30))
+
+# Longest a GET /events request is held open
+MAX_LONG_POLL = 60.0
+
+
+def gitlab_event(payload: dict) -> dict:
+    """Normalize a GitLab webhook payload: kind, project, ref, mr, status, sha."""
+    attributes = payload.get('object_attributes') or {}
+    kind = payload.get('object_kind') or payload.get('event_name') or 'unknown'
+    event = {
+        'source': 'gitlab',
+        'kind': kind,
+        'project': (payload.get('project') or {}).get('path_with_namespace', ''),
+    }
+    if kind == 'merge_request':
+        event.update(mr=attributes.get('iid'), ref=attributes.get('source_branch'),
+                     target=attributes.get('target_branch'), status=attributes.get('merge_status'),
+                     state=attributes.get('state'), action=attributes.get('action'),
+                     sha=(attributes.get('last_commit') or {}).get('id'))
+    elif kind == 'pipeline':
+        event.update(mr=(payload.get('merge_request') or {}).get('iid'), ref=attributes.get('ref'),
+                     status=attributes.get('status'), sha=attributes.get('sha'))
+    else:
+        ref = payload.get('ref') or attributes.get('ref') or ''
+        event.update(ref=ref.removeprefix('refs/heads/'), sha=payload.get('checkout_sha') or payload.get('after'))
+    return event
+
+
+def jenkins_event(payload: dict) -> dict:
+    """Normalize a Jenkins Notification plugin payload: job_url, branch, number, phase, status."""
+    build = payload.get('build') or {}
+    branch = (build.get('scm') or {}).get('branch') or payload.get('name') or ''
+    return {
+        'source': 'jenkins',
+        'kind': 'build',
+        'job_url': payload.get('url', ''),
+        'branch': branch.removeprefix('origin/'),
+        'number': build.get('number'),
+        'phase': build.get('phase'),
+        'status': build.get('status'),
+    }
+
+
+class EventReceiver:
+    """HTTP server collecting webhook events for waiters (see the module docstring).
+
+    With a secret, POSTs must carry it: GitLab sends it as X-Gitlab-Token,
+    Jenkins as ?token=... in the notification URL.
+    """
+
+    def __init__(self, secret: str | None = None, buffer_size: int = 1000):
+        self.secret = secret
+        self.events = collections.deque(maxlen=buffer_size)
+        self.next_seq = 1
+        self._changed = asyncio.Condition()
+
+    async def add(self, event: dict) -> dict:
+        event = {'seq': self.next_seq, 'received': time.time(), **event}
+        self.next_seq += 1
+        self.events.append(event)
+        async with self._changed:
+            self._changed.notify_all()
+        return event
+
+    def matching(self, since: int, filters: dict) -> list:
+        return [event for event in self.events
+                if event['seq'] >= since and all(str(event.get(k)) == v for k, v in filters.items())]
+
+    async def wait(self, since: int, filters: dict, timeout: float) -> list:
+        """Events with seq >= since matching filters, waiting up to timeout for one to arrive."""
+        deadline = time.monotonic() + timeout
+        async with self._changed:
+            while not (found := self.matching(since, filters)):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self._changed.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+        return found
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self._handle, host, port)
+        report('info', f"Receiving webhook events on {host}:{port} (POST /gitlab, /jenkins; GET /events)")
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            headers = {}
+            while (line := (await reader.readline()).decode('latin-1').strip()):
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get('content-length') or 0))
+            if len(request_line) < 2:
+                raise ValueError(request_line)
+            status, response = await self._route(request_line[0], request_line[1], headers, body)
+        except (OSError, ValueError, asyncio.IncompleteReadError):
+            status, response = 400, {'error': 'bad request'}
+        try:
+            data = json.dumps(response).encode()
+            writer.write(f'HTTP/1.1 {status} {"OK" if status < 400 else "Error"}\r\n'
+                         f'Content-Type: application/json\r\nContent-Length: {len(data)}\r\n'
+                         'Connection: close\r\n\r\n'.encode() + data)
+            await writer.drain()
+        except OSError:
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, target: str, headers: dict, body: bytes) -> tuple[int, dict]:
+        parts = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        if method == 'POST' and parts.path in ('/gitlab', '/jenkins'):
+            token = headers.get('x-gitlab-token') if parts.path == '/gitlab' else query.get('token')
+            if self.secret and token != self.secret:
+                return 403, {'error': 'invalid token'}
+            payload = json.loads(body or b'{}')
+            if not isinstance(payload, dict):
+                return 400, {'error': 'expected a JSON object'}
+            event = gitlab_event(payload) if parts.path == '/gitlab' else jenkins_event(payload)
+            return 200, {'seq': (await self.add(event))['seq']}
+
+        if method == 'GET' and parts.path == '/events':
+            since = int(query.pop('since', self.next_seq))
+            timeout = min(float(query.pop('timeout', 0)), MAX_LONG_POLL)
+            events = await self.wait(since, query, timeout)
+            return 200, {'events': events, 'next': max([since] + [e['seq'] + 1 for e in events])}
+
+        if method == 'GET' and parts.path == '/health':
+            return 200, {'ok': True, 'next': self.next_seq}
+        return 404, {'error': 'not found'}
+
+
+class EventWait:
+    """Wake-ups for one wait: events from a receiver matching predicate.
+
+    filters (field -> value) are applied by the receiver, predicate(event)
+    by the waiter. start() must be called before the wait's first check, so
+    an event arriving between that check and the first wait() is not lost.
+    """
+
+    def __init__(self, http: HttpClient, url: str, filters: dict, predicate,
+                 fallback_interval: float = FALLBACK_INTERVAL):
+        self.http = http
+        self.url = url.rstrip('/')
+        self.filters = filters
+        self.predicate = predicate
+        self.fallback_interval = fallback_interval
+        self.cursor = None
+
+    async def _events(self, timeout: float) -> dict:
+        params = {**self.filters, 'timeout': f'{timeout:.3f}'}
+        if self.cursor is not None:
+            params['since'] = self.cursor
+        # The receiver holds the request for up to timeout seconds
+        response = await self.http.get(f'{self.url}/events', params=params,
+                                       timeout=max(self.http.timeout, timeout + 10))
+        return response.raise_for_status().json() or {}
+
+    async def start(self):
+        self.cursor = (await self._events(0)).get('next')
+
+    async def wait(self, timeout: float) -> dict | None:
+        """Return the first matching event within timeout seconds, or None."""
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            result = await self._events(min(remaining, MAX_LONG_POLL))
+            self.cursor = result.get('next', self.cursor)
+            for event in result.get('events', []):
+                if self.predicate(event):
+                    return event
+        return None
+
+
+def events_url() -> str | None:
+    """The local receiver waits use ($PIPELINE_EVENTS_URL), or None to poll."""
+    return os.environ.get('PIPELINE_EVENTS_URL') or None
+
+
+async def subscribe_gitlab(gitlab, receiver_url: str, secret: str | None) -> int:
+    """Register a project webhook sending pipeline and MR events to receiver_url; returns its id."""
+    hook = {'url': f"{receiver_url.rstrip('/')}/gitlab", 'pipeline_events': True, 'merge_requests_events': True,
+            'push_events': False, 'enable_ssl_verification': False}
+    if secret:
+        hook['token'] = secret
+    response = await gitlab.request('POST', '/hooks', json_body=hook)
+    data = response.raise_for_status().json() or {}
+    if 'id' not in data:
+        raise PipelineError(f"Could not create webhook: {response.error_message()}")
+    return data['id']
+
+
+async def unsubscribe_gitlab(gitlab, hook_id: int):
+    (await gitlab.request('DELETE', f'/hooks/{hook_id}')).raise_for_status()
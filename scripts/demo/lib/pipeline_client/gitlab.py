@@ -0,0 +1,233 @@
+"""GitLab merge request, file and commit operations (see pipeline-wait.sh)."""
+
+import asyncio
+import re
+from urllib.parse import quote
+
+from .client import HttpClient, PipelineError, Response
+from .events import EventWait
+from .poll import Backoff, WaitTimeout, poll, report
+
+
+class GitLab:
+    """GitLab API v4 client for one project (e.g. 'p2c/k8s-deployments').
+
+    With events_url (an EventReceiver subscribed to the project's webhooks),
+    waits re-check as soon as a matching event arrives instead of polling.
+    """
+
+    def __init__(self, http: HttpClient, url: str, token: str, project: str, events_url: str | None = None):
+        self.http = http
+        self.url = url.rstrip('/')
+        self.token = token
+        self.project = project
+        self.events_url = events_url
+
+    def _events(self, predicate, **filters) -> EventWait | None:
+        if not self.events_url:
+            return None
+        return EventWait(self.http, self.events_url, {'source': 'gitlab', 'project': self.project, **filters},
+                         predicate)
+
+    async def request(self, method: str, path: str, **kwargs) -> Response:
+        """Send a request to the project's API (path below /projects/<project>)."""
+        url = f"{self.url}/api/v4/projects/{quote(self.project, safe='')}{path}"
+        return await self.http.request(method, url, headers={'PRIVATE-TOKEN': self.token}, **kwargs)
+
+    async def create_mr(self, source_branch: str, target_branch: str, title: str,
+                        description: str = 'Automated MR from demo script') -> dict:
+        """Open a merge request and return it; raises PipelineError if GitLab refuses."""
+        report('action', f"Creating MR: {source_branch} → {target_branch}")
+        response = await self.request('POST', '/merge_requests', json_body={
+            'source_branch': source_branch, 'target_branch': target_branch,
+            'title': title, 'description': description,
+        })
+        mr = response.json()
+        if not isinstance(mr, dict) or not mr.get('iid'):
+            raise PipelineError(f"Failed to create MR: {response.error_message()}")
+        report('verify', f"Created MR !{mr['iid']}")
+        return mr
+
+    async def get_mr(self, mr_iid: int) -> Response:
+        return await self.request('GET', f'/merge_requests/{mr_iid}')
+
+    async def mr_changes(self, mr_iid: int) -> Response:
+        return await self.request('GET', f'/merge_requests/{mr_iid}/changes')
+
+    async def commit_statuses(self, commit_sha: str) -> Response:
+        return await self.request('GET', f'/repository/commits/{commit_sha}/statuses')
+
+    async def wait_for_mr_pipeline(self, mr_iid: int, timeout: float, backoff: Backoff) -> str:
+        """Wait for the MR's head pipeline (Jenkins commit statuses) to finish.
+
+        Returns 'success'; raises PipelineError if it failed or on timeout.
+        Uses head_pipeline from the MR rather than the statuses of one commit,
+        so commits Jenkins pushes to the branch meanwhile are followed.
+        """
+        source_branches = set()
+
+        async def check(elapsed):
+            mr = (await self.get_mr(mr_iid)).raise_for_status().json() or {}
+            source_branches.add(mr.get('source_branch'))
+            status = (mr.get('head_pipeline') or {}).get('status') or ''
+            if status == 'success':
+                return status
+            if status == 'failed':
+                raise PipelineError("Jenkins CI failed")
+            if status in ('running', 'pending', 'created'):
+                report('info', f"Pipeline: {status} ({elapsed:.0f}s)")
+            else:
+                report('info', f"Waiting for pipeline... ({elapsed:.0f}s)")
+            return None
+
+        # Pipeline events of the source branch (Jenkins commit statuses) or of the MR
+        events = self._events(lambda event: str(event.get('mr')) == str(mr_iid) or (
+            event['kind'] == 'pipeline' and event.get('ref') in source_branches))
+        status = await poll(check, timeout, backoff, 'Jenkins CI', events)
+        report('verify', "Jenkins CI passed")
+        return status
+
+    async def accept_mr(self, mr_iid: int, merge_wait_timeout: float = 30) -> dict:
+        """Merge an MR once GitLab has finished checking it; returns the merged MR.
+
+        GitLab reports merge_status 'checking' for a while after a pipeline
+        passes; after merge_wait_timeout the merge is attempted anyway.
+        """
+        async def check(elapsed):
+            mr = (await self.get_mr(mr_iid)).json() or {}
+            merge_status = mr.get('merge_status', 'unknown')
+            if merge_status == 'cannot_be_merged':
+                conflicts = str(mr.get('has_conflicts', False)).lower()
+                raise PipelineError(f"MR !{mr_iid} cannot be merged (conflicts: {conflicts})")
+            return merge_status if merge_status == 'can_be_merged' else None
+
+        try:
+            await poll(check, merge_wait_timeout, Backoff(interval=1, max_interval=2), 'merge eligibility')
+        except WaitTimeout:
+            report('warn', "Timeout waiting for merge eligibility, attempting merge anyway...")
+
+        report('action', f"Merging MR !{mr_iid}...")
+        response = await self.request('PUT', f'/merge_requests/{mr_iid}/merge')
+        mr = response.json() or {}
+        state = mr.get('state') or mr.get('message') or 'unknown'
+        if state != 'merged':
+            raise PipelineError(f"Failed to merge MR: {state}")
+        report('verify', f"MR !{mr_iid} merged")
+        return mr
+
+    async def mr_diff_contains(self, mr_iid: int, file_pattern: str, expected: str) -> bool:
+        """Whether a changed file matching file_pattern (a regex) has expected in its diff."""
+        report('action', f"Verifying MR !{mr_iid} contains expected changes...")
+        changes = (await self.mr_changes(mr_iid)).json() or {}
+        pattern = re.compile(file_pattern)
+        diffs = [change.get('diff', '') for change in changes.get('changes', [])
+                 if pattern.search(change.get('new_path', ''))]
+        if expected in '\n'.join(diffs):
+            report('verify', f"MR diff contains '{expected}' in files matching '{file_pattern}'")
+            return True
+        report('fail', f"MR diff does not contain '{expected}' in files matching '{file_pattern}'")
+        return False
+
+    async def file_exists(self, branch: str, file_path: str) -> bool:
+        response = await self.request('GET', f"/repository/files/{quote(file_path, safe='')}",
+                                      params={'ref': branch})
+        data = response.json()
+        return isinstance(data, dict) and 'file_name' in data
+
+    async def get_file(self, branch: str, file_path: str) -> bytes | None:
+        """Return a file's raw content on branch, or None if it does not exist."""
+        response = await self.request('GET', f"/repository/files/{quote(file_path, safe='')}/raw",
+                                      params={'ref': branch})
+        return response.body if response.status == 200 else None
+
+    async def commit_files(self, branch: str, files: dict, message: str) -> dict:
+        """Commit files (path -> content) to branch in one commit, creating or updating each.
+
+        The existence checks run concurrently. Returns the commit; raises
+        PipelineError if GitLab refuses it.
+        """
+        exists = await asyncio.gather(*(self.file_exists(branch, path) for path in files))
+        actions = [{'action': 'update' if found else 'create', 'file_path': path, 'content': content}
+                   for (path, content), found in zip(files.items(), exists)]
+        response = await self.request('POST', '/repository/commits', json_body={
+            'branch': branch, 'commit_message': message, 'actions': actions,
+        })
+        commit = response.json()
+        if not isinstance(commit, dict) or 'id' not in commit:
+            raise PipelineError(response.error_message())
+        return commit
+
+    async def commit_file(self, branch: str, file_path: str, content: str, message: str) -> dict:
+        """Commit one file to branch (see commit_files) and report it like commit_file_to_branch."""
+        report('action', f"Committing {file_path} to branch {branch}...")
+        try:
+            commit = await self.commit_files(branch, {file_path: content}, message)
+        except PipelineError as e:
+            raise PipelineError(f"Failed to commit {file_path}: {e}") from None
+        report('verify', f"Committed {file_path} to {branch} (commit: {commit.get('short_id')})")
+        return commit
+
+    async def trigger_mr_commit(self, mr_iid: int, timestamp: str) -> dict:
+        """Commit a new .mr-trigger to the MR's source branch so its push webhook starts Jenkins.
+
+        Jenkins only gets the MR context from push webhooks, not from GitLab
+        pipeline triggers.
+        """
+        mr = (await self.get_mr(mr_iid)).json() or {}
+        source_branch, target_branch = mr.get('source_branch'), mr.get('target_branch', '')
+        if not source_branch:
+            raise PipelineError(f"Could not get source branch for MR !{mr_iid}")
+
+        report('action', f"Triggering fresh Jenkins build for MR !{mr_iid} → {target_branch}...")
+        message = f"chore: trigger pipeline for {target_branch} MR [jenkins-ci]"
+        try:
+            commit = await self.commit_files(source_branch, {'.mr-trigger': f'{target_branch}-{timestamp}'}, message)
+        except PipelineError as e:
+            raise PipelineError(f"Could not create trigger commit: {e}") from None
+        report('info', f"Created trigger commit {commit.get('short_id')}")
+        return commit
+
+    async def open_mrs(self, target_branch: str, created_after: str | None = None) -> list:
+        params = {'state': 'opened', 'target_branch': target_branch}
+        if created_after:
+            params['created_after'] = created_after
+        mrs = (await self.request('GET', '/merge_requests', params=params)).raise_for_status().json()
+        return mrs if isinstance(mrs, list) else []
+
+    async def wait_for_promotion_mr(self, target_env: str, created_after: str, timeout: float,
+                                    backoff: Backoff) -> dict:
+        """Wait for the promotion MR Jenkins opens after a merge (branch promote-<env>-*).
+
+        created_after (ISO 8601) should be captured before the merge that
+        triggers the promotion. Returns the MR; on timeout the open MRs
+        targeting the environment are listed and PipelineError is raised.
+        """
+        prefix = f'promote-{target_env}-'
+        report('action', f"Waiting for auto-created promotion MR to {target_env} (timeout {timeout:g}s)...")
+        report('info', f"Looking for MR with branch: {prefix}* created after {created_after}")
+
+        async def check(elapsed):
+            for mr in await self.open_mrs(target_env, created_after):
+                if mr.get('source_branch', '').startswith(prefix):
+                    return mr
+            report('info', f"Waiting for promotion MR... ({elapsed:.0f}s elapsed)")
+            return None
+
+        try:
+            events = self._events(lambda event: str(event.get('ref')).startswith(prefix),
+                                  kind='merge_request', target=target_env)
+            mr = await poll(check, timeout, backoff, f'promotion MR to {target_env}', events)
+        except WaitTimeout:
+            report('info', f"Open MRs targeting {target_env}:")
+            try:
+                mrs = await self.open_mrs(target_env)
+            except PipelineError:
+                mrs = []
+            for open_mr in mrs:
+                report('info', f"  !{open_mr.get('iid')}: {open_mr.get('source_branch')} "
+                               f"(created: {open_mr.get('created_at')})")
+            if not mrs:
+                report('info', "  (none)")
+            raise
+        report('verify', f"Found promotion MR !{mr['iid']} (branch: {mr['source_branch']})")
+        return mr
@@ -0,0 +1,111 @@
+"""Jenkins branch scans and build waits (see pipeline-wait.sh)."""
+
+from urllib.parse import quote
+
+from .client import HttpClient, PipelineError, Response
+from .events import EventWait
+from .poll import Backoff, poll, report
+
+
+class Jenkins:
+    """Jenkins client for the multibranch pipeline jobs of the demo.
+
+    With events_url (an EventReceiver getting Jenkins notifications or the
+    GitLab pipeline events of Jenkins' commit statuses), build waits re-check
+    as soon as an event for the branch arrives instead of polling.
+    """
+
+    def __init__(self, http: HttpClient, url: str, user: str, token: str, events_url: str | None = None):
+        self.http = http
+        self.url = url.rstrip('/')
+        self.auth = (user, token)
+        self.events_url = events_url
+
+    def _build_events(self, branch: str, job_name: str) -> EventWait | None:
+        if not self.events_url:
+            return None
+        job_url = f'{self.job_path(job_name, branch)}/'
+
+        def predicate(event):
+            if event['source'] == 'jenkins':
+                return event.get('branch') == branch or job_url in event.get('job_url', '')
+            return event['kind'] == 'pipeline' and event.get('ref') == branch
+
+        return EventWait(self.http, self.events_url, {}, predicate)
+
+    async def request(self, method: str, path: str, **kwargs) -> Response:
+        return await self.http.request(method, f'{self.url}/{path}', auth=self.auth, **kwargs)
+
+    @staticmethod
+    def job_path(job_name: str, branch: str | None = None) -> str:
+        path = f"job/{quote(job_name, safe='')}"
+        return f"{path}/job/{quote(branch, safe='')}" if branch else path
+
+    async def trigger_scan(self, job_name: str) -> int:
+        """Start a multibranch scan so Jenkins discovers new branches; returns the HTTP status.
+
+        The CSRF crumb is requested first on the same session (cookies are
+        kept by the HttpClient). Jenkins answers 302 when the scan is queued.
+        """
+        report('action', f"Triggering Jenkins branch scan for {job_name}...")
+        headers = {}
+        try:
+            crumb = (await self.request('GET', 'crumbIssuer/api/json')).json() or {}
+            if crumb.get('crumbRequestField') and crumb.get('crumb'):
+                headers[crumb['crumbRequestField']] = crumb['crumb']
+        except PipelineError:
+            pass
+        try:
+            status = (await self.request('POST', f'{self.job_path(job_name)}/build?delay=0sec',
+                                         headers=headers)).status
+        except PipelineError:
+            status = 0
+        if status not in (200, 201, 302):
+            report('info', f"Jenkins scan trigger returned HTTP {status or '000'} (may still work)")
+        return status
+
+    async def build_number(self, branch: str, job_name: str) -> int:
+        """Number of the branch's last build (0 if it has none or Jenkins cannot be reached)."""
+        try:
+            response = await self.request('GET', f'{self.job_path(job_name, branch)}/lastBuild/api/json')
+        except PipelineError:
+            return 0
+        build = response.json()
+        return int(build.get('number') or 0) if isinstance(build, dict) else 0
+
+    async def wait_for_build(self, branch: str, job_name: str, baseline: int | None, timeout: float,
+                             start_timeout: float, backoff: Backoff) -> dict:
+        """Wait for a build newer than baseline to start and finish; returns its build JSON.
+
+        baseline defaults to the last build number after the scan is
+        triggered. Raises PipelineError if the build fails (NOT_BUILT counts
+        as success) or on timeout.
+        """
+        await self.trigger_scan(job_name)
+        if baseline is None:
+            baseline = await self.build_number(branch, job_name)
+        report('action', f"Waiting for Jenkins build on {branch} (baseline #{baseline}, timeout {timeout:g}s)...")
+
+        async def started(elapsed):
+            current = await self.build_number(branch, job_name)
+            return current if current > baseline else None
+
+        number = await poll(started, start_timeout, backoff, 'build to start',
+                            self._build_events(branch, job_name))
+        report('info', f"Build #{number} started")
+        build_path = f'{self.job_path(job_name, branch)}/{number}/api/json'
+
+        async def finished(elapsed):
+            build = (await self.request('GET', build_path)).json() or {}
+            if build.get('building') is False:
+                return build
+            report('info', f"Build #{number} running... ({elapsed:.0f}s elapsed)")
+            return None
+
+        build = await poll(finished, timeout, backoff, 'build to complete',
+                           self._build_events(branch, job_name))
+        result = build.get('result') or 'null'
+        if result not in ('SUCCESS', 'NOT_BUILT'):
+            raise PipelineError(f"Build #{number} {result}")
+        report('verify', f"Build #{number} completed successfully")
+        return build
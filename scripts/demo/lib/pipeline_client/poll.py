@@ -0,0 +1,97 @@
+"""Polling with jittered backoff, and demo-style progress output."""
+
+import asyncio
+import os
+import random
+import sys
+import time
+
+from .client import HttpError, PipelineError, TransportError
+
+# Same markers and colors as demo_action/demo_info/... in demo-helpers.sh
+_MARKERS = {
+    'action': '\033[0;32m→\033[0m',
+    'info': '\033[0;34mℹ\033[0m',
+    'verify': '\033[0;32m✓\033[0m',
+    'fail': '\033[0;31m✗\033[0m',
+    'warn': '\033[1;33m⚠\033[0m',
+}
+
+
+def report(kind: str, message: str):
+    """Print a progress line to stderr like the demo_<kind> shell helpers."""
+    print(f"  {_MARKERS[kind]} {message}", file=sys.stderr, flush=True)
+
+
+class WaitTimeout(PipelineError):
+    """A wait ran out of time."""
+
+
+class Backoff:
+    """Poll delays: interval, growing by factor up to max_interval, each randomized by +-jitter.
+
+    The defaults come from $PIPELINE_POLL_INTERVAL, $PIPELINE_POLL_MAX_INTERVAL
+    and $PIPELINE_POLL_BACKOFF: start at 2s and grow 1.5x up to 10s, so fast
+    events are seen quickly and slow ones are not polled harder than the
+    shell loops did (every 10s). Jitter keeps concurrent waiters apart.
+    """
+
+    def __init__(self, interval: float | None = None, max_interval: float | None = None,
+                 factor: float | None = None, jitter: float = 0.2):
+        self.interval = interval if interval is not None else float(os.environ.get('PIPELINE_POLL_INTERVAL', 2))
+        self.max_interval = max(self.interval, max_interval if max_interval is not None
+                                else float(os.environ.get('PIPELINE_POLL_MAX_INTERVAL', 10)))
+        self.factor = factor if factor is not None else float(os.environ.get('PIPELINE_POLL_BACKOFF', 1.5))
+        self.jitter = jitter
+
+    def delays(self):
+        """Yield successive delays in seconds."""
+        delay = self.interval
+        while True:
+            yield delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            delay = min(delay * self.factor, self.max_interval)
+
+
+async def poll(check, timeout: float, backoff: Backoff, what: str, events=None):
+    """Call check(elapsed) until it returns something other than None.
+
+    check is an async function of the seconds elapsed since polling started.
+    Transient failures (server unreachable or slow, HTTP 5xx) are reported
+    and retried like a not-yet-ready result; other errors end the wait.
+    Raises PipelineError after timeout seconds, naming what was awaited.
+
+    With events (an EventWait), check runs again as soon as a matching
+    webhook event arrives, or after the events' fallback interval; if the
+    receiver cannot be reached, polling falls back to backoff.
+    """
+    if events is not None:
+        try:
+            await events.start()
+        except PipelineError as e:
+            report('warn', f"Event receiver unavailable, polling instead: {e}")
+            events = None
+
+    start = time.monotonic()
+    for delay in backoff.delays():
+        elapsed = time.monotonic() - start
+        try:
+            result = await check(elapsed)
+        except (HttpError, TransportError) as e:
+            if isinstance(e, HttpError) and e.response.status < 500:
+                raise
+            report('warn', f"{e} ({elapsed:.0f}s)")
+            result = None
+        if result is not None:
+            return result
+        remaining = timeout - (time.monotonic() - start)
+        if remaining <= 0:
+            break
+        if events is not None:
+            try:
+                await events.wait(min(events.fallback_interval, remaining))
+                continue
+            except PipelineError as e:
+                report('warn', f"Event receiver unavailable, polling instead: {e}")
+                events = None
+        await asyncio.sleep(min(delay, remaining))
+    raise WaitTimeout(f"Timeout waiting for {what} ({timeout:g}s)")
@@ -13,6 +13,11 @@
 # Arguments:
 #   config-file    Path to cluster configuration file (e.g., config/clusters/alpha.env)
 #
+# Environment:
+#   PIPELINE_EVENTS_ADVERTISE_URL  URL GitLab reaches this machine at (e.g.
+#                  http://10.0.0.5:8765); when set, one webhook receiver serves
+#                  every demo's waits (see start_pipeline_events)
+#
 # Exit codes:
 #   0 - All tests passed
 #   1 - One or more tests failed
@@ -169,6 +174,21 @@ run_reset() {
     return 0
 }
 
+# Start the webhook receiver for the whole run; the demos' pipeline waits
+# find it through the exported PIPELINE_EVENTS_URL and fall back to polling
+# without it. The EXIT trap removes the GitLab webhook again.
+start_events_receiver() {
+    source "$SCRIPT_DIR/lib/demo-helpers.sh"
+    source "$SCRIPT_DIR/lib/pipeline-wait.sh"
+
+    if ! load_pipeline_credentials; then
+        demo_warn "Not receiving pipeline events; waits will poll"
+        return 0
+    fi
+    trap stop_pipeline_events EXIT
+    start_pipeline_events
+}
+
 run_demo() {
     local id="$1"
     local script="$2"
@@ -326,6 +346,17 @@ main() {
     echo "  Reset between tests: $([[ "$SKIP_RESET" == "true" ]] && echo "no" || echo "yes")"
     echo ""
 
+    # Preflight: the demo tooling's own checks (HTTP client, cue-edit.py startup budget)
+    if ! python3 "$SCRIPT_DIR/lib/check-pipeline-client.py" ||
+        ! python3 "$SCRIPT_DIR/lib/cue-edit-bench.py" --startup --iterations 10; then
+        echo -e "${RED}[ERROR]${NC} Preflight checks failed"
+        exit 1
+    fi
+
+    if [[ -n "${PIPELINE_EVENTS_ADVERTISE_URL:-}" ]]; then
+        start_events_receiver
+    fi
+
     TOTAL_START_TIME=$(date +%s)
 
     # Track whether to reset example-app on next reset